@@ -44,6 +44,11 @@ import {
     copyToClipboard, cutToClipboard, pasteFromClipboard,
     copyStyle, pasteStyle
 } from "./utils/object-context-actions";
+import { pickBuffer } from "./utils/pick-buffer";
+import { renderQuality } from "./utils/render-quality";
+import { slidePrerender } from "./utils/slide-prerender";
+import { pointerInput } from "./utils/input-scheduler";
+import { perfMonitor } from "./utils/performance-monitor";
 
 interface ElementOptions {
     strokeColor?: string;
@@ -607,6 +612,18 @@ export const YappyAPI = {
     // Template
     loadTemplate(templateData: any) { loadTemplate(templateData); },
 
+    // Performance
+    setPickingEnabled(enabled: boolean) { pickBuffer.setEnabled(enabled); },
+    isPickingEnabled() { return pickBuffer.isEnabled(); },
+    setDraftRenderingEnabled(enabled: boolean) { renderQuality.setEnabled(enabled); },
+    isDraftRenderingEnabled() { return renderQuality.isEnabled(); },
+    getColdStartMetrics() { return perfMonitor.getColdStart(); },
+    setSlidePrerenderEnabled(enabled: boolean) { slidePrerender.setEnabled(enabled); },
+    isSlidePrerenderEnabled() { return slidePrerender.isEnabled(); },
+    setPointerCoalescingEnabled(enabled: boolean) { pointerInput.setEnabled(enabled); },
+    getPointerInputStats() { return pointerInput.getStats(); },
+    resetPointerInputStats() { pointerInput.resetStats(); },
+
     // Animation
     animateElement,
     animateElements,
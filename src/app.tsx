@@ -35,7 +35,7 @@ import Menu, {
 import ZoomControls from './components/zoom-controls';
 import { initAPI } from './api';
 import { Settings } from 'lucide-solid';
-import { registerShapes } from './shapes/register-shapes';
+import { registerShapes, preloadShapes } from './shapes/register-shapes';
 import { addSlide } from './store/app-store';
 import pkg from '../package.json';
 
@@ -45,6 +45,7 @@ const App: Component = () => {
   onMount(() => {
     console.log('App: Registering shapes...');
     registerShapes();
+    preloadShapes();
     initAPI();
 
     const handleKeyDown = async (e: KeyboardEvent) => {
@@ -1,13 +1,15 @@
-import { type Component, onMount, createEffect, onCleanup, createSignal, Show, untrack } from "solid-js";
+import { type Component, onMount, createEffect, onCleanup, createSignal, Show, untrack, on } from "solid-js";
 import { calculateAllAnimatedStates } from "../utils/animation-utils";
 import { projectMasterPosition } from "../utils/slide-utils";
 import { animationEngine } from "../utils/animation/animation-engine";
+import { applyAnimationOverlay } from "../utils/animation/animation-overlay";
 import rough from 'roughjs'; // Hand-drawn style
 import { store, updateElement, setActiveLayer, zoomToFitSlide, isLayerLocked } from "../store/app-store";
 import { normalizePoints } from "../utils/render-element";
 import type { DrawingElement } from "../types";
 import ContextMenu from "./context-menu";
 import { setImageLoadCallback } from "../utils/image-cache";
+import { shapeRegistry } from "../shapes/shape-registry";
 import type { SnappingGuide } from "../utils/object-snapping";
 import type { SpacingGuide } from "../utils/spacing";
 import { createPointerState } from "../utils/pointer-state";
@@ -38,10 +40,17 @@ import { commitText as commitTextHandler, handleDoubleClick as handleDoubleClick
 import { handleDragOver, handleDrop as handleDropHandler, handleWheel, type CanvasEventContext } from "../utils/tool-handlers/canvas-event-handlers";
 import { showToast } from "./toast";
 import { perfMonitor } from "../utils/performance-monitor";
+import { pickBuffer } from "../utils/pick-buffer";
+import { renderQuality } from "../utils/render-quality";
+import { wetInk, WET_INK_TOOLS } from "../utils/wet-ink";
+import { slideMembership } from "../utils/slide-membership";
+import { pointerInput, type PointerFrame } from "../utils/input-scheduler";
+import { slidePrerender } from "../utils/slide-prerender";
+import { slideTransitionManager } from "../utils/animation/slide-transition-manager";
 import { fitShapeToText } from "../utils/text-utils";
 import { effectiveTime } from "../utils/animation/animation-engine";
 import RecordingOverlay from "./recording-overlay";
-import { setupRecording } from "../utils/recording-manager";
+import { setupRecording, exportProgress } from "../utils/recording-manager";
 export { requestRecording, setRequestRecording } from "../utils/recording-manager";
 import ScrollBackButton from "./scroll-back-button";
 import TextEditingOverlay from "./text-editing-overlay";
@@ -116,11 +125,13 @@ const Canvas: Component = () => {
     let rcInstance: ReturnType<typeof rough.canvas> | null = null;
 
     // Recording & thumbnail capture (effects created within this component's reactive scope)
-    const { handleStopRecording } = setupRecording(() => canvasRef);
+    const { handleStopRecording } = setupRecording(() => canvasRef, renderOfflineFrame);
 
 
     // Pointer handler shared mutable state
     const pState = createPointerState();
+    // Wheel/pinch input since the last frame (draft rendering)
+    let wheelPending = false;
 
     // Text Editing State
     const [editingId, setEditingId] = createSignal<string | null>(null);
@@ -143,6 +154,12 @@ const Canvas: Component = () => {
 
     const flushPenPoints = () => {
         if (!pState.currentId || pState.penPointsBuffer.length === 0) return;
+        // Live strokes only touch the wet-ink overlay; the store sees them at pointer-up
+        if (wetInk.isActive()) {
+            wetInk.append(pState.penPointsBuffer, store.viewState);
+            pState.penPointsBuffer = [];
+            return;
+        }
         const el = store.elements.find(e => e.id === pState.currentId);
         if (el && el.points) {
             const existingPoints = el.points as number[];
@@ -157,15 +174,35 @@ const Canvas: Component = () => {
         }
     };
 
+    /**
+     * Write the finished wet-ink stroke into the store (single update)
+     */
+    const commitPenStroke = () => {
+        flushPenPoints();
+        if (!pState.currentId || !wetInk.isActive()) return;
+        const points = wetInk.end();
+        updateElement(pState.currentId, { points }, false);
+    };
+
+    const beginPenStroke = () => {
+        const el = pState.currentId ? store.elements.find(e => e.id === pState.currentId) : undefined;
+        if (!el || !el.points || !canvasRef) return;
+        const rect = canvasRef.getBoundingClientRect();
+        wetInk.setOffset(rect.left, rect.top);
+        wetInk.begin(el, store.viewState, store.theme === 'dark');
+    };
+
     const handleResize = () => {
         if (canvasRef) {
             canvasRef.width = window.innerWidth;
             canvasRef.height = window.innerHeight;
+            wetInk.resize(window.innerWidth, window.innerHeight);
 
             // In presentation mode, ensure the slide is re-fitted to the new window size
             // (especially important after entering fullscreen)
             if (store.appMode === 'presentation') {
                 zoomToFitSlide();
+                slidePrerender.schedule(store.activeSlideIndex);
                 // Sometimes browsers need a tiny extra moment for layout to settle 
                 // after fullscreen or URL bar shifts
                 setTimeout(zoomToFitSlide, 50);
@@ -175,6 +212,12 @@ const Canvas: Component = () => {
         }
     };
 
+    // Presentation: rasterize the neighbouring slides while idle
+    createEffect(on(() => [store.appMode, store.docType, store.activeSlideIndex] as const, ([mode, docType, index]) => {
+        if (mode === 'presentation' && docType === 'slides') slidePrerender.schedule(index);
+        else slidePrerender.clear();
+    }));
+
     // Cursor Management
     const [cursor, setCursor] = createSignal<string>('default');
 
@@ -183,8 +226,23 @@ const Canvas: Component = () => {
     const [contextMenuPos, setContextMenuPos] = createSignal({ x: 0, y: 0 });
 
     function draw() {
-        if (!canvasRef) return;
-        const ctx = canvasRef.getContext("2d");
+        if (canvasRef) renderScene(canvasRef, true);
+    }
+
+    /**
+     * Render a frame for offline video export into an OffscreenCanvas
+     * (content only - no selection, anchors, laser or pick-buffer recording)
+     */
+    function renderOfflineFrame(target: OffscreenCanvas) {
+        renderScene(target, false);
+    }
+
+    let offlineRc: { target: OffscreenCanvas; rc: ReturnType<typeof rough.canvas> } | null = null;
+
+    function renderScene(target: HTMLCanvasElement | OffscreenCanvas, interactive: boolean) {
+        // The canvas renderers only read width/height from the canvas
+        const canvas = target as HTMLCanvasElement;
+        const ctx = canvas.getContext("2d");
         if (!ctx) return;
 
         const startTime = performance.now();
@@ -193,64 +251,108 @@ const Canvas: Component = () => {
 
         const { scale, panX, panY } = store.viewState;
         const isDarkMode = store.theme === 'dark';
-        if (!rcInstance) rcInstance = rough.canvas(canvasRef);
-        const rc = rcInstance;
+        let rc: ReturnType<typeof rough.canvas>;
+        if (interactive) {
+            if (!rcInstance) rcInstance = rough.canvas(canvas);
+            rc = rcInstance;
+        } else {
+            if (offlineRc?.target !== target) offlineRc = { target: target as OffscreenCanvas, rc: rough.canvas(canvas) };
+            rc = offlineRc.rc;
+        }
         const shouldAnimate = store.appMode === 'presentation' || store.isPreviewing;
 
+        // Running element animations write to a transient overlay instead of the store
+        const elements = applyAnimationOverlay(store.elements);
+
         // 1. Compute viewport & animated states
-        const vp = computeViewportBounds(canvasRef, scale, panX, panY);
-        const elementsToAnimate = cullElementsForAnimation(store.elements, store.slides, store.layers, store.docType, store.activeSlideIndex, vp);
+        const vp = computeViewportBounds(canvas, scale, panX, panY);
+        slideMembership.sync(store.elements, store.slides, store.layers);
+        if (interactive && store.appMode === 'presentation' && store.docType === 'slides' && !slideTransitionManager.transitioning) {
+            // Edits and committed builds may have outdated the neighbour bitmaps
+            slidePrerender.refresh(store.activeSlideIndex);
+        }
+        const elementsToAnimate = cullElementsForAnimation(elements, store.slides, store.layers, store.docType, store.activeSlideIndex, vp);
         const animatedStates = calculateAllAnimatedStates(elementsToAnimate, currentTime, shouldAnimate);
 
         // 2. Clear canvas & decay laser
         ctx.setTransform(1, 0, 0, 1, 0, 0);
-        ctx.clearRect(0, 0, canvasRef.width, canvasRef.height);
-        decayLaserTrail(pState.laserTrailData, LASER_DECAY_MS);
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        if (interactive) decayLaserTrail(pState.laserTrailData, LASER_DECAY_MS);
 
         // 3. Render backgrounds & grids
-        renderWorkspaceBackground(ctx, canvasRef, isDarkMode);
+        renderWorkspaceBackground(ctx, canvas, isDarkMode);
         renderSlideBoundaries(ctx, rc, store.slides, store.docType, store.activeSlideIndex, scale, panX, panY, isDarkMode);
-        renderCanvasTexture(ctx, canvasRef, store.canvasTexture, scale, panX, panY, isDarkMode);
+        renderCanvasTexture(ctx, canvas, store.canvasTexture, scale, panX, panY, isDarkMode);
 
         // 4. Enter world-space for elements
         ctx.save();
         ctx.translate(panX, panY);
         ctx.scale(scale, scale);
 
-        renderGrid(ctx, canvasRef, store.gridSettings, scale, panX, panY, isDarkMode);
+        renderGrid(ctx, canvas, store.gridSettings, scale, panX, panY, isDarkMode);
+
+        // Slide transitions composite the pre-rendered slide; only content not
+        // baked into it is drawn live. A full live frame follows the transition.
+        const slideBitmap = interactive && store.appMode === 'presentation' && slideTransitionManager.transitioning
+            ? slidePrerender.get(store.activeSlideIndex)
+            : null;
+        if (slideBitmap) {
+            ctx.drawImage(slideBitmap.canvas, slideBitmap.x, slideBitmap.y, slideBitmap.width, slideBitmap.height);
+        }
 
-        // 5. Render layers & elements
+        // 5. Render layers & elements (recording silhouettes for ID-buffer picking)
+        if (interactive) {
+            pickBuffer.beginFrame(canvas.width, canvas.height, scale, panX, panY, store.elements);
+            // Draft silhouettes while the user moves the view or a selection
+            if (store.appMode === 'presentation' || slideTransitionManager.transitioning) {
+                renderQuality.beginFrame(null);
+            } else {
+                const panning = pState.isDragging && store.selectedTool === 'pan';
+                const dragging = !panning && (pState.isDragging || !!pState.draggingHandle);
+                renderQuality.beginFrame({ panning, zooming: wheelPending, dragged: dragging ? store.selection : null });
+            }
+            wheelPending = false;
+        }
         const totalRendered = renderLayersAndElements(ctx, rc, {
-            elements: store.elements, layers: store.layers, slides: store.slides,
+            elements: slideBitmap ? elements.filter(el => !slideBitmap.baked.has(el.id)) : elements,
+            layers: store.layers, slides: store.slides,
             docType: store.docType, activeSlideIndex: store.activeSlideIndex,
-            selection: store.selection, selectedTool: store.selectedTool,
+            selection: interactive ? store.selection : [], selectedTool: store.selectedTool,
             activeLayerId: store.activeLayerId,
             animatedStates, viewportBounds: vp, scale, isDarkMode,
-            currentDrawingId: pState.currentId,
-            hoveredConnector: pState.hoveredConnector,
-            editingId: editingId(),
-            canInteractWithElement,
+            currentDrawingId: interactive ? pState.currentId : null,
+            hoveredConnector: interactive ? pState.hoveredConnector : null,
+            editingId: interactive ? editingId() : null,
+            canInteractWithElement: interactive ? canInteractWithElement : () => false,
+            qualityFor: interactive ? renderQuality.qualityFor : undefined,
+            skipLayerBackgrounds: slideBitmap?.bakedLayers,
         });
 
         // 6. Overlays
-        renderSelectionOverlays(ctx, {
-            elements: store.elements, selection: store.selection, scale,
-            selectionBox: selectionBox(), suggestedBinding: suggestedBinding(),
-            snappingGuides: snappingGuides(), spacingGuides: spacingGuides(),
-        });
+        if (interactive) {
+            renderSelectionOverlays(ctx, {
+                elements, selection: store.selection, scale,
+                selectionBox: selectionBox(), suggestedBinding: suggestedBinding(),
+                snappingGuides: snappingGuides(), spacingGuides: spacingGuides(),
+            });
 
-        renderConnectionAnchors(ctx, {
-            elements: store.elements, selectedTool: store.selectedTool,
-            currentDrawingId: pState.currentId, isDrawing: pState.isDrawing,
-            activeLayerId: store.activeLayerId, scale,
-            canInteractWithElement,
-        });
+            renderConnectionAnchors(ctx, {
+                elements, selectedTool: store.selectedTool,
+                currentDrawingId: pState.currentId, isDrawing: pState.isDrawing,
+                activeLayerId: store.activeLayerId, scale,
+                canInteractWithElement,
+            });
 
-        renderLaserTrail(ctx, pState.laserTrailData, scale, LASER_DECAY_MS);
+            renderLaserTrail(ctx, pState.laserTrailData, scale, LASER_DECAY_MS);
+        }
 
         ctx.restore();
 
-        perfMonitor.measureFrame(performance.now() - startTime, store.elements.length, totalRendered);
+        if (interactive) {
+            perfMonitor.markFirstFrame();
+            renderQuality.endFrame(draw);
+            perfMonitor.measureFrame(performance.now() - startTime, elements.length, totalRendered);
+        }
     }
 
     createEffect(() => {
@@ -429,7 +531,7 @@ const Canvas: Component = () => {
 
     const pHelpers: import("../utils/pointer-helpers").PointerHelpers = {
         getWorldCoordinates, canInteractWithElement, checkBinding,
-        refreshLinePoints, refreshBoundLine, flushPenPoints,
+        refreshLinePoints, refreshBoundLine, flushPenPoints, commitPenStroke,
         applyMasterProjection, normalizePencil, commitText,
         draw, setCursor
     };
@@ -443,6 +545,7 @@ const Canvas: Component = () => {
     };
 
     const handlePointerDown = (e: PointerEvent) => {
+        pointerInput.flush();
         if (presentationOnDown(e, pState, pHelpers)) return;
         (e.currentTarget as Element).setPointerCapture(e.pointerId);
         const { x, y } = getWorldCoordinates(e.clientX, e.clientY);
@@ -479,14 +582,34 @@ const Canvas: Component = () => {
         if (store.selectedTool === 'polyline' || pState.isPolylineBuilding) { polylineOnDown(x, y, pState, pHelpers); return; }
 
         drawOnDown(x, y, pState, pHelpers);
+        if (WET_INK_TOOLS.includes(store.selectedTool)) beginPenStroke();
+    };
+
+    const handleCanvasWheel = (e: WheelEvent) => {
+        wheelPending = true;
+        handleWheel(e);
     };
 
-    const handlePointerMove = (e: PointerEvent) => {
-        if (presentationOnMove(e, pState)) return;
+    // Pointer moves are coalesced to one tool update per frame (see input-scheduler)
+    const handlePointerMove = (e: PointerEvent) => pointerInput.push(e);
+
+    let drawRequested = false;
+    const requestDraw = () => { drawRequested = true; };
+
+    pointerInput.setHandler((frame) => {
+        drawRequested = false;
+        processPointerMove(frame);
+        // Already inside an animation frame: draw now rather than one frame later
+        if (drawRequested) draw();
+    });
+
+    const processPointerMove = (frame: PointerFrame) => {
+        const e = frame.event;
+        if (presentationOnMove(e, pState, frame.movementX, frame.movementY)) return;
         let { x, y } = getWorldCoordinates(e.clientX, e.clientY);
         // console.log('Move', { tool: store.selectedTool, isDragging: pState.isDragging, selection: store.selection.length });
 
-        if (store.selectedTool === 'pan') { panOnMove(e, pState, pHelpers); return; }
+        if (store.selectedTool === 'pan') { panOnMove(e, pState, pHelpers, frame.movementX, frame.movementY); return; }
 
         if (store.selectedTool === 'selection' && !pState.draggingFromConnector) {
             selectionOnMove(e, x, y, pState, pHelpers, pSignals, SNAPPING_THROTTLE_MS);
@@ -495,24 +618,31 @@ const Canvas: Component = () => {
 
 
         if (store.selectedTool === 'laser') {
-            laserOnMove(e, pState, pHelpers, LASER_THROTTLE_MS, LASER_MAX_POINTS);
+            laserOnMove(e, pState, pHelpers, LASER_THROTTLE_MS, LASER_MAX_POINTS, frame.samples);
         }
 
         if (pState.isPolylineBuilding) {
             polylineOnMove(x, y, pState, pHelpers, pSignals);
-            requestAnimationFrame(draw);
+            requestDraw();
             return;
         }
 
         if (!pState.isDrawing || !pState.currentId) {
             if (pState.isDrawing && store.selectedTool === 'eraser') {
-                eraserOnMove(x, y, pHelpers);
+                const path = frame.samples.map(sample => getWorldCoordinates(sample.clientX, sample.clientY));
+                path.push({ x, y });
+                eraserOnMove(path, pHelpers);
             }
             return;
         }
 
         if (store.selectedTool === 'fineliner' || store.selectedTool === 'marker' || store.selectedTool === 'inkbrush' || store.selectedTool === 'ink') {
-            penOnMove(e, pState, pHelpers, PEN_UPDATE_THROTTLE_MS);
+            penOnMove(e, pState, pHelpers, PEN_UPDATE_THROTTLE_MS, frame.samples);
+            // Wet ink draws itself - no scene redraw until the stroke is committed
+            if (wetInk.isActive()) {
+                handleAutoScroll(e, pState);
+                return;
+            }
         } else {
             drawOnMove(x, y, pState, pHelpers, pSignals);
         }
@@ -521,11 +651,12 @@ const Canvas: Component = () => {
         handleAutoScroll(e, pState);
 
         if (pState.isDrawing || pState.isDragging) {
-            requestAnimationFrame(draw);
+            requestDraw();
         }
     };
 
     const handlePointerUp = (e: PointerEvent) => {
+        pointerInput.flush();
         (e.currentTarget as Element).releasePointerCapture(e.pointerId);
 
         if (presentationOnUp(pState)) return;
@@ -552,6 +683,7 @@ const Canvas: Component = () => {
     };
 
     const handleDoubleClick = (e: MouseEvent) => {
+        pointerInput.flush();
         if (pState.isPolylineBuilding) {
             polylineFinalize(pState, pHelpers, pSignals);
             requestAnimationFrame(draw);
@@ -565,6 +697,14 @@ const Canvas: Component = () => {
         setImageLoadCallback(() => {
             draw();
         });
+        // ...and when a lazily loaded renderer family arrives
+        const removeLoadListener = shapeRegistry.addLoadListener(() => {
+            draw();
+        });
+        // ...and once a slide transition ends, replacing the composited bitmap
+        slideTransitionManager.setEndCallback(() => {
+            draw();
+        });
 
         // Polyline keyboard shortcuts (Escape to finish, Backspace to undo last point)
         const handlePolylineKeys = (e: KeyboardEvent) => {
@@ -590,6 +730,10 @@ const Canvas: Component = () => {
             window.removeEventListener('keydown', handlePolylineKeys, true);
             window.removeEventListener("resize", handleResize);
             document.removeEventListener("fullscreenchange", handleResize);
+            wetInk.attach(null);
+            pointerInput.setHandler(null);
+            slideTransitionManager.setEndCallback(null);
+            removeLoadListener();
         });
     });
 
@@ -600,7 +744,7 @@ const Canvas: Component = () => {
         <>
             <canvas
                 ref={canvasRef}
-                onWheel={handleWheel}
+                onWheel={handleCanvasWheel}
                 onPointerDown={handlePointerDown}
                 onPointerMove={handlePointerMove}
                 onPointerUp={handlePointerUp}
@@ -615,6 +759,12 @@ const Canvas: Component = () => {
                 style={{ display: "block", "touch-action": "none", cursor: cursor(), "user-select": "none" }}
             />
 
+            {/* Wet-ink overlay for the pen stroke in progress */}
+            <canvas
+                ref={(el) => wetInk.attach(el)}
+                style={{ position: "fixed", top: 0, left: 0, "pointer-events": "none", "z-index": 1 }}
+            />
+
             {/* Global Texture Overlay */}
             <Show when={store.canvasTexture !== 'none' && store.canvasTexture !== 'grid' && store.canvasTexture !== 'graph'}>
                 <div
@@ -661,7 +811,7 @@ const Canvas: Component = () => {
 
             {/* Recording Overlay */}
             <Show when={store.isRecording}>
-                <RecordingOverlay onStop={handleStopRecording} />
+                <RecordingOverlay onStop={handleStopRecording} progress={exportProgress()} />
             </Show>
 
             {/* Path Editor Overlay */}
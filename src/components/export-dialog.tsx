@@ -1,7 +1,7 @@
 import { type Component, createSignal, Show, createEffect, onCleanup } from "solid-js";
 import { X } from "lucide-solid";
 import { store } from "../store/app-store";
-import { exportToPng, exportToSvg, exportToPdf, exportToPptx } from "../utils/export";
+import { exportToPng, exportToSvg, exportToPdf, exportToPptx, preloadExportBackends } from "../utils/export";
 import { setRequestRecording } from "./canvas";
 import "./export-dialog.css";
 
@@ -15,6 +15,14 @@ const ExportDialog: Component<ExportDialogProps> = (props) => {
     const [scale, setScale] = createSignal<number>(2);
     const [hasBackground, setHasBackground] = createSignal(true);
     const [onlySelected, setOnlySelected] = createSignal(store.selection.length > 0);
+    const [offlineVideo, setOfflineVideo] = createSignal(false);
+    const [videoDuration, setVideoDuration] = createSignal(10);
+    const [svgPrecision, setSvgPrecision] = createSignal(2);
+
+    // Fetch the PDF/PPTX backends while the user picks options
+    createEffect(() => {
+        if (props.isOpen) preloadExportBackends();
+    });
 
     // Auto-update onlySelected when dialog opens or selection changes
     createEffect(() => {
@@ -43,11 +51,13 @@ const ExportDialog: Component<ExportDialogProps> = (props) => {
         if (format() === 'png') {
             exportToPng(scale(), hasBackground(), onlySelected());
         } else if (format() === 'svg') {
-            exportToSvg(onlySelected());
+            exportToSvg(onlySelected(), { precision: svgPrecision() });
         } else if (format() === 'pdf') {
             exportToPdf(scale(), hasBackground(), onlySelected());
         } else if (format() === 'pptx') {
             exportToPptx(scale(), hasBackground(), onlySelected());
+        } else if (format() === 'webm' && offlineVideo()) {
+            setRequestRecording({ start: true, format: 'webm', offline: { duration: videoDuration() * 1000 } });
         } else if (format() === 'webm' || format() === 'mp4') {
             const videoFormat = format() as 'webm' | 'mp4';
             setRequestRecording({ start: true, format: videoFormat });
@@ -110,6 +120,39 @@ const ExportDialog: Component<ExportDialogProps> = (props) => {
                             </label>
                         </div>
 
+                        <Show when={format() === 'webm'}>
+                            <div class="option-group">
+                                <label class="checkbox-label">
+                                    <input type="checkbox" checked={offlineVideo()} onChange={(e) => setOfflineVideo(e.currentTarget.checked)} />
+                                    Render Offline (frame-exact, faster than real time)
+                                </label>
+                            </div>
+
+                            <Show when={offlineVideo()}>
+                                <div class="option-group">
+                                    <label>Duration (seconds)</label>
+                                    <input
+                                        type="number"
+                                        min="1"
+                                        max="600"
+                                        value={videoDuration()}
+                                        onInput={(e) => setVideoDuration(Math.max(1, Number(e.currentTarget.value) || 1))}
+                                    />
+                                </div>
+                            </Show>
+                        </Show>
+
+                        <Show when={format() === 'svg'}>
+                            <div class="option-group">
+                                <label>Coordinate Precision</label>
+                                <div class="scale-group">
+                                    <button class={`scale-btn ${svgPrecision() === 0 ? 'active' : ''}`} onClick={() => setSvgPrecision(0)}>1</button>
+                                    <button class={`scale-btn ${svgPrecision() === 1 ? 'active' : ''}`} onClick={() => setSvgPrecision(1)}>0.1</button>
+                                    <button class={`scale-btn ${svgPrecision() === 2 ? 'active' : ''}`} onClick={() => setSvgPrecision(2)}>0.01</button>
+                                </div>
+                            </div>
+                        </Show>
+
                         <Show when={format() === 'png' || format() === 'pdf' || format() === 'pptx'}>
                             <div class="option-group">
                                 <label>Scale</label>
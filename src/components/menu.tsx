@@ -1,4 +1,5 @@
 import { type Component, createSignal, onMount, onCleanup, Show, lazy, Suspense, createEffect } from "solid-js";
+import { unwrap } from "solid-js/store";
 import { showToast } from "./toast";
 import { storage } from "../storage/file-system-storage";
 import {
@@ -250,12 +251,13 @@ const Menu: Component = () => {
                     updatedAt: new Date().toISOString(),
                     docType: store.docType
                 },
-                elements: JSON.parse(JSON.stringify(store.elements)),
-                layers: JSON.parse(JSON.stringify(store.layers)),
-                slides: JSON.parse(JSON.stringify(store.slides)),
-                globalSettings: JSON.parse(JSON.stringify(store.globalSettings)),
-                gridSettings: JSON.parse(JSON.stringify(store.gridSettings)),
-                states: JSON.parse(JSON.stringify(store.states))
+                // exportToHtml serializes its snapshot before the first await
+                elements: unwrap(store.elements),
+                layers: unwrap(store.layers),
+                slides: unwrap(store.slides),
+                globalSettings: unwrap(store.globalSettings),
+                gridSettings: unwrap(store.gridSettings),
+                states: unwrap(store.states)
             };
 
             await exportToHtml(slideDoc, drawingId());
@@ -1,7 +1,8 @@
-import { createEffect, onCleanup, onMount } from 'solid-js';
+import { createEffect, createSignal, onCleanup, onMount } from 'solid-js';
 import { store, setViewState, toggleMinimap } from '../store/app-store';
 import { X } from 'lucide-solid';
 import { renderElement, normalizePoints } from '../utils/render-element';
+import { shapeRegistry } from '../shapes/shape-registry';
 import rough from 'roughjs';
 import type { RoughCanvas } from 'roughjs/bin/canvas';
 
@@ -19,6 +20,10 @@ export const Minimap = (props: MinimapProps) => {
     const MINIMAP_HEIGHT = 150;
     const PADDING = 10;
 
+    // Bumped when a lazily loaded renderer family arrives, so its shapes get drawn
+    const [rendererRevision, setRendererRevision] = createSignal(shapeRegistry.revision);
+    onCleanup(shapeRegistry.addLoadListener(() => setRendererRevision(shapeRegistry.revision)));
+
     // Calculate bounding box of all elements
     const getContentBounds = () => {
         if (store.elements.length === 0) {
@@ -226,6 +231,7 @@ export const Minimap = (props: MinimapProps) => {
             store.viewState.panX; store.viewState.panY; store.viewState.scale;
             store.theme;
             store.layers.forEach(l => { l.visible; l.opacity; });
+            rendererRevision();
         };
 
         track();
@@ -1,10 +1,13 @@
-import { createSignal, onMount, Show } from "solid-js";
+import { createSignal, createEffect, on, onMount, Show } from "solid-js";
 import type { Component } from "solid-js";
 import Canvas from "./canvas";
 import { loadDocument, setStore, store } from "../store/app-store";
-import { registerShapes } from "../shapes/register-shapes";
+import { registerShapes, preloadShapes } from "../shapes/register-shapes";
 import { PresentationControls } from "./presentation-controls";
 import type { SlideDocument } from "../types/slide-types";
+import type { DrawingElement } from "../types";
+import type { PresentationChunks, SlideChunk } from "../utils/presentation-chunks";
+import { getImage } from "../utils/image-cache";
 import { showToast } from "./toast";
 import Toast from "./toast";
 import "./player-app.css";
@@ -13,21 +16,78 @@ import "./player-app.css";
 declare global {
     interface Window {
         __PRESENTATION_DATA__: SlideDocument;
+        __PRESENTATION_CHUNKS__?: PresentationChunks;
     }
 }
 
+const scheduleIdle = (task: () => void) => {
+    if ('requestIdleCallback' in window) {
+        (window as any).requestIdleCallback(task, { timeout: 500 });
+    } else {
+        setTimeout(task, 50);
+    }
+};
+
+/**
+ * Incremental loader for chunked exports: slide chunks are merged into the
+ * store on demand, keeping the document's original paint order.
+ */
+const createChunkLoader = (chunks: PresentationChunks) => {
+    const paintOrder = new Map<string, number>();
+    const loaded = new Set<number>();
+
+    const withOrder = (chunk: SlideChunk) => {
+        chunk.elements.forEach((el, i) => paintOrder.set(el.id, chunk.order[i]));
+        return chunk.elements;
+    };
+    const byPaintOrder = (a: DrawingElement, b: DrawingElement) =>
+        (paintOrder.get(a.id) ?? 0) - (paintOrder.get(b.id) ?? 0);
+
+    /** Shell plus the first slide - everything needed for the first frame */
+    const initialDocument = (): SlideDocument => {
+        const elements = [...withOrder({ order: chunks.order, elements: chunks.document.elements })];
+        if (chunks.slideCount > 0) {
+            loaded.add(0);
+            elements.push(...withOrder(chunks.load(0)));
+        }
+        return { ...chunks.document, elements: elements.sort(byPaintOrder) };
+    };
+
+    const ensure = (index: number) => {
+        if (index < 0 || index >= chunks.slideCount || loaded.has(index)) return;
+        loaded.add(index);
+        const incoming = withOrder(chunks.load(index));
+        if (incoming.length === 0) return;
+
+        // Same orphan fix as the initial load
+        const layerIds = new Set(store.layers.map(l => l.id));
+        const fixed = incoming.map(el => layerIds.has(el.layerId) ? el : { ...el, layerId: store.activeLayerId });
+        // Start decoding images before the slide is shown
+        for (const el of fixed) if (el.dataURL) getImage(el.dataURL);
+
+        setStore("elements", (elements) => [...elements, ...fixed].sort(byPaintOrder));
+    };
+
+    return { initialDocument, ensure };
+};
+
 const PlayerApp: Component = () => {
     const [isReady, setIsReady] = createSignal(false);
 
     onMount(() => {
         // Ensure shapes are registered for rendering
         registerShapes();
+        preloadShapes();
+
+        // Chunked exports: start with the shell and slide 1, the rest streams in
+        const chunks = window.__PRESENTATION_CHUNKS__;
+        const loader = chunks ? createChunkLoader(chunks) : null;
 
         // Load data from injected global variable
-        if (window.__PRESENTATION_DATA__) {
+        if (loader || window.__PRESENTATION_DATA__) {
             try {
                 // Initialize store with document data
-                loadDocument(window.__PRESENTATION_DATA__);
+                loadDocument(loader ? loader.initialDocument() : window.__PRESENTATION_DATA__);
 
                 // Force presentation mode settings
                 setStore("appMode", "presentation");
@@ -71,6 +131,17 @@ const PlayerApp: Component = () => {
                     setStore("layers", (_l) => true, { visible: true, opacity: 1 });
                 }
 
+                if (loader) {
+                    // Load the active slide now, prefetch its neighbours when idle
+                    createEffect(on(() => store.activeSlideIndex, (index) => {
+                        loader.ensure(index);
+                        scheduleIdle(() => {
+                            loader.ensure(index + 1);
+                            loader.ensure(index - 1);
+                        });
+                    }));
+                }
+
                 setIsReady(true);
             } catch (e) {
                 console.error("Failed to load presentation data:", e);
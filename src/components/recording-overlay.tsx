@@ -4,6 +4,8 @@ import "./recording-overlay.css";
 
 interface Props {
     onStop: () => void;
+    /** Offline export progress (0-1); the overlay shows progress and a cancel button */
+    progress?: number | null;
 }
 
 const RecordingOverlay: Component<Props> = (props) => {
@@ -22,18 +24,20 @@ const RecordingOverlay: Component<Props> = (props) => {
         return `${m}:${s.toString().padStart(2, '0')}`;
     };
 
+    const isExporting = () => props.progress !== undefined && props.progress !== null;
+
     return (
         <div class="recording-overlay">
             <div class="recording-indicator">
                 <div class="pulse-dot"></div>
-                <span class="recording-text">REC</span>
+                <span class="recording-text">{isExporting() ? 'EXPORT' : 'REC'}</span>
             </div>
             <div class="recording-timer">
-                {formatTime(duration())}
+                {isExporting() ? `${Math.round(props.progress! * 100)}%` : formatTime(duration())}
             </div>
             <button class="stop-btn" onClick={props.onStop}>
                 <Square size={16} fill="white" strokeWidth={0} />
-                <span>Stop</span>
+                <span>{isExporting() ? 'Cancel' : 'Stop'}</span>
             </button>
         </div>
     );
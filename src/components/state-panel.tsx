@@ -1,6 +1,7 @@
 import { type Component, For, createSignal, Show, onMount, onCleanup } from 'solid-js';
 import { store, addDisplayState, updateDisplayState, deleteDisplayState, applyDisplayState, toggleStatePanel } from '../store/app-store';
 import { Camera, RefreshCw, Trash2, Play, X, RotateCcw, PlayCircle } from 'lucide-solid';
+import { resolveDisplayState } from '../utils/animation/display-states';
 import "./state-panel.css";
 
 export const StatePanel: Component = () => {
@@ -132,7 +133,7 @@ export const StatePanel: Component = () => {
                             <div class={`state-item ${store.activeStateId === state.id ? 'active' : ''}`}>
                                 <div class="state-info" onClick={() => applyDisplayState(state.id)}>
                                     <span class="state-name">{state.name}</span>
-                                    <span class="state-count">{Object.keys(state.overrides).length} elements</span>
+                                    <span class="state-count">{Object.keys(resolveDisplayState(state, store.states)).length} elements</span>
                                 </div>
                                 <div class="state-controls">
                                     <button class="icon-btn" onClick={() => applyDisplayState(state.id)} title="Morph to State">
@@ -3,6 +3,7 @@ import { type Component, Show, createEffect, onCleanup, createSignal, For } from
 import { store } from '../store/app-store';
 import rough from 'roughjs';
 import { renderElement } from '../utils/render-element';
+import { shapeRegistry } from '../shapes/shape-registry';
 import type { DrawingElement, Point } from '../types';
 
 export const WelcomeScreen: Component = () => {
@@ -25,9 +26,14 @@ export const WelcomeScreen: Component = () => {
         onCleanup(() => window.removeEventListener('resize', handler));
     });
 
+    // Redraw the hint arrows if their renderer family arrives after the first draw
+    const [rendererRevision, setRendererRevision] = createSignal(shapeRegistry.revision);
+    onCleanup(shapeRegistry.addLoadListener(() => setRendererRevision(shapeRegistry.revision)));
+
     createEffect(() => {
         const canvas = canvasEl();
         if (!canvas || !isVisible()) return;
+        rendererRevision();
 
         const ctx = canvas.getContext('2d');
         if (!ctx) return;
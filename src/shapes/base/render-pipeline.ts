@@ -1,8 +1,11 @@
 import type { Options } from "roughjs/bin/core";
 import type { DrawingElement } from "../../types";
-import { getShapeGeometry } from "../../utils/shape-geometry";
+import { getShapeGeometry, getGeometryPath2D } from "../../utils/shape-geometry";
 import { getFontString, measureContainerText } from "../../utils/text-utils";
-import type { RenderContext } from "./types";
+import type { RenderContext, RenderQuality } from "./types";
+
+// Text smaller than this on screen is skipped in draft frames
+const DRAFT_MIN_TEXT_PX = 6;
 
 export class RenderPipeline {
     static adjustColor(color: string, _isDarkMode: boolean) {
@@ -60,7 +63,7 @@ export class RenderPipeline {
      * Applies standard transformations (opacity, blend mode, rotation) to the context.
      * Returns the center coordinates (cx, cy) for further use.
      */
-    static applyTransformations(ctx: CanvasRenderingContext2D, el: DrawingElement, layerOpacity: number): { cx: number; cy: number } {
+    static applyTransformations(ctx: CanvasRenderingContext2D, el: DrawingElement, layerOpacity: number, quality: RenderQuality = 'full'): { cx: number; cy: number } {
         ctx.save();
         ctx.globalAlpha = ((el.opacity ?? 100) / 100) * layerOpacity;
 
@@ -71,8 +74,8 @@ export class RenderPipeline {
                 : el.blendMode as GlobalCompositeOperation;
         }
 
-        // Apply Drop Shadow
-        if (el.shadowEnabled) {
+        // Apply Drop Shadow (skipped in draft - blurred shadows are the most expensive thing we draw)
+        if (el.shadowEnabled && quality === 'full') {
             ctx.shadowColor = el.shadowColor || 'rgba(0,0,0,0.3)';
             ctx.shadowBlur = el.shadowBlur || 10;
             ctx.shadowOffsetX = el.shadowOffsetX || 5;
@@ -102,6 +105,13 @@ export class RenderPipeline {
         ctx.restore();
     }
 
+    /**
+     * True when text of the given size would be too small to read in a draft frame.
+     */
+    static isDraftTextHidden(context: RenderContext, fontSize: number): boolean {
+        return context.quality === 'draft' && fontSize * (context.scale ?? 1) < DRAFT_MIN_TEXT_PX;
+    }
+
     /**
      * Applies stroke properties (color, width, dash) to the context.
      */
@@ -270,7 +280,7 @@ export class RenderPipeline {
                 if (geo.isClosed !== false) ctx.closePath();
             }
         } else if (geo.type === 'path') {
-            ctx.fill(new Path2D(geo.path));
+            ctx.fill(getGeometryPath2D(geo));
         } else if (geo.type === 'multi') {
             geo.shapes.forEach((s: any) => this.renderGeometry(ctx, s));
         }
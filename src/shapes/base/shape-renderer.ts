@@ -8,7 +8,7 @@ export abstract class ShapeRenderer {
      * Handles universal transformations and delegates to specialized methods.
      */
     render(context: RenderContext) {
-        const { ctx, element, layerOpacity } = context;
+        const { ctx, element, layerOpacity, quality } = context;
 
         // MORPH ANIMATION SUPPORT: If element has custom points, render them directly
         if (element.points && element.points.length > 0) {
@@ -17,12 +17,15 @@ export abstract class ShapeRenderer {
         }
 
         // 1. Apply universal transformations (rotation, opacity, shadow)
-        const { cx, cy } = RenderPipeline.applyTransformations(ctx, element, layerOpacity);
+        const { cx, cy } = RenderPipeline.applyTransformations(ctx, element, layerOpacity, quality);
 
         // 2. Check for draw-in/draw-out animation
         const dp = element.drawProgress;
         if (dp !== undefined && dp >= 0 && dp < 100) {
             this.renderDrawProgress(context, cx, cy);
+        } else if (quality === 'draft') {
+            // Cheap silhouette while the view is moving; refined once input settles
+            this.renderDraft(context, cx, cy);
         } else {
             // Normal render path
             // 2b. Apply complex fills (gradients, dots) using ShapeGeometry
@@ -120,6 +123,37 @@ export abstract class ShapeRenderer {
         }
     }
 
+    /**
+     * Renders a cheap stand-in for the shape during pan/zoom/drag: the outline
+     * from definePath with a flat fill and a plain stroke. No hachure, gradients
+     * or RoughJS; text is drawn only while it is still legible.
+     */
+    protected renderDraft(context: RenderContext, cx: number, cy: number) {
+        const { ctx, element: el, isDarkMode } = context;
+
+        ctx.beginPath();
+        this.definePath(ctx, el);
+
+        const fill = el.backgroundColor;
+        if (fill && fill !== 'transparent' && fill !== 'none') {
+            ctx.save();
+            // Patterned fills only cover part of the shape - approximate with a lighter tint
+            if (el.fillStyle !== 'solid') ctx.globalAlpha *= 0.4;
+            ctx.fillStyle = RenderPipeline.adjustColor(fill, isDarkMode);
+            ctx.fill();
+            ctx.restore();
+        }
+
+        if (el.strokeWidth > 0 && el.strokeColor !== 'transparent') {
+            RenderPipeline.applyStrokeStyle(ctx, el, isDarkMode);
+            ctx.stroke();
+        }
+
+        if (!RenderPipeline.isDraftTextHidden(context, el.fontSize || 20)) {
+            RenderPipeline.renderText(context, cx, cy);
+        }
+    }
+
     /**
      * Estimates the total path length for the shape's outline.
      * Used by drawIn animation to calculate lineDash parameters.
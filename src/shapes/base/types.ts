@@ -7,6 +7,12 @@ export interface RenderContext {
     element: DrawingElement;
     isDarkMode: boolean;
     layerOpacity: number;
+    /** 'draft' while the view is being panned/zoomed or elements dragged */
+    quality?: RenderQuality;
+    /** Current zoom, used to drop detail that would be sub-pixel in draft */
+    scale?: number;
 }
 
 export type RenderStyle = 'architectural' | 'sketch';
+
+export type RenderQuality = 'full' | 'draft';
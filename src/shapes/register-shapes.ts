@@ -7,23 +7,15 @@ import { ImageRenderer } from "./renderers/image-renderer";
 import { StickyNoteRenderer } from "./renderers/sticky-note-renderer";
 import { PolygonRenderer } from "./renderers/polygon-renderer";
 import { FlowchartRenderer } from "./renderers/flowchart-renderer";
-import { SketchnoteRenderer } from "./renderers/sketchnote-renderer";
-import { InfraRenderer } from "./renderers/infra-renderer";
-import { ContainerRenderer } from "./renderers/container-renderer";
 import { PathRenderer } from "./renderers/path-renderer";
-import { WireframeRenderer } from "./renderers/wireframe-renderer";
 import { ConnectorRenderer } from "./renderers/connector-renderer";
 import { FreehandRenderer } from "./renderers/freehand-renderer";
 import { SpecialtyShapeRenderer } from "./renderers/specialty-shape-renderer";
-import { UmlClassRenderer } from "./renderers/uml-class-renderer";
-import { UmlGeneralRenderer } from "./renderers/uml-general-renderer";
-import { UmlStateRenderer } from "./renderers/uml-state-renderer";
-import { PeopleRenderer } from "./renderers/people-renderer";
-import { StatusRenderer } from "./renderers/status-renderer";
-import { CloudInfraRenderer } from "./renderers/cloud-infra-renderer";
-import { DataMetricsRenderer } from "./renderers/data-metrics-renderer";
-import { ConnectionRelRenderer } from "./renderers/connection-rel-renderer";
 
+/**
+ * Register renderers. Core shapes are bundled with the app; the larger
+ * specialty families are split into their own chunks and loaded on first use.
+ */
 export function registerShapes() {
     console.log('Registering all shapes including specialty...');
     shapeRegistry.register('rectangle', new RectangleRenderer());
@@ -44,25 +36,21 @@ export function registerShapes() {
     const flowchartTypes = ['database', 'document', 'predefinedProcess', 'internalStorage'] as const;
     flowchartTypes.forEach(type => shapeRegistry.register(type, flowchartRenderer));
 
-    const sketchnoteRenderer = new SketchnoteRenderer();
     const sketchnoteTypes = ['starPerson', 'lightbulb', 'signpost', 'burstBlob', 'scroll', 'wavyDivider', 'doubleBanner', 'trophy', 'clock', 'gear', 'target', 'rocket', 'flag', 'key', 'magnifyingGlass', 'book', 'megaphone', 'eye', 'thoughtBubble'] as const;
-    sketchnoteTypes.forEach(type => shapeRegistry.register(type, sketchnoteRenderer));
+    shapeRegistry.registerLazy(sketchnoteTypes, () => import("./renderers/sketchnote-renderer").then(m => new m.SketchnoteRenderer()));
 
-    const infraRenderer = new InfraRenderer();
     const infraTypes = ['server', 'loadBalancer', 'firewall', 'user', 'messageQueue', 'lambda', 'router'] as const;
-    infraTypes.forEach(type => shapeRegistry.register(type, infraRenderer));
+    shapeRegistry.registerLazy(infraTypes, () => import("./renderers/infra-renderer").then(m => new m.InfraRenderer()));
 
-    const containerRenderer = new ContainerRenderer();
     const containerTypes = ['browserWindow', 'mobilePhone'] as const;
-    containerTypes.forEach(type => shapeRegistry.register(type, containerRenderer));
+    shapeRegistry.registerLazy(containerTypes, () => import("./renderers/container-renderer").then(m => new m.ContainerRenderer()));
 
     const pathRenderer = new PathRenderer();
     const pathTypes = ['organicBranch'] as const;
     pathTypes.forEach(type => shapeRegistry.register(type, pathRenderer));
 
-    const wireframeRenderer = new WireframeRenderer();
     const wireframeTypes = ['browser', 'ghostButton', 'inputField'] as const;
-    wireframeTypes.forEach(type => shapeRegistry.register(type, wireframeRenderer));
+    shapeRegistry.registerLazy(wireframeTypes, () => import("./renderers/wireframe-renderer").then(m => new m.WireframeRenderer()));
 
     const connectorRenderer = new ConnectorRenderer();
     shapeRegistry.register('line', connectorRenderer);
@@ -85,33 +73,38 @@ export function registerShapes() {
     ] as const;
     specialtyTypes.forEach(type => shapeRegistry.register(type, specialtyRenderer));
 
-    const umlClassRenderer = new UmlClassRenderer();
-    shapeRegistry.register('umlClass', umlClassRenderer);
+    shapeRegistry.registerLazy(['umlClass'], () => import("./renderers/uml-class-renderer").then(m => new m.UmlClassRenderer()));
 
-    const umlStateRenderer = new UmlStateRenderer();
-    shapeRegistry.register('umlState', umlStateRenderer);
+    shapeRegistry.registerLazy(['umlState'], () => import("./renderers/uml-state-renderer").then(m => new m.UmlStateRenderer()));
 
-    const umlGeneralRenderer = new UmlGeneralRenderer();
     const umlTypes = ['umlInterface', 'umlActor', 'umlUseCase', 'umlNote', 'umlPackage', 'umlComponent', 'umlLifeline', 'umlFragment'] as const;
-    umlTypes.forEach(type => shapeRegistry.register(type, umlGeneralRenderer));
+    shapeRegistry.registerLazy(umlTypes, () => import("./renderers/uml-general-renderer").then(m => new m.UmlGeneralRenderer()));
 
-    const peopleRenderer = new PeopleRenderer();
     const peopleTypes = ['stickFigure', 'sittingPerson', 'presentingPerson', 'handPointRight', 'thumbsUp', 'faceHappy', 'faceSad', 'faceConfused'] as const;
-    peopleTypes.forEach(type => shapeRegistry.register(type, peopleRenderer));
+    shapeRegistry.registerLazy(peopleTypes, () => import("./renderers/people-renderer").then(m => new m.PeopleRenderer()));
 
-    const statusRenderer = new StatusRenderer();
     const statusTypes = ['checkbox', 'checkboxChecked', 'numberedBadge', 'questionMark', 'exclamationMark', 'tag', 'pin', 'stamp'] as const;
-    statusTypes.forEach(type => shapeRegistry.register(type, statusRenderer));
+    shapeRegistry.registerLazy(statusTypes, () => import("./renderers/status-renderer").then(m => new m.StatusRenderer()));
 
-    const cloudInfraRenderer = new CloudInfraRenderer();
     const cloudInfraTypes = ['kubernetes', 'container', 'apiGateway', 'cdn', 'storageBlob', 'eventBus', 'microservice', 'shield'] as const;
-    cloudInfraTypes.forEach(type => shapeRegistry.register(type, cloudInfraRenderer));
+    shapeRegistry.registerLazy(cloudInfraTypes, () => import("./renderers/cloud-infra-renderer").then(m => new m.CloudInfraRenderer()));
 
-    const dataMetricsRenderer = new DataMetricsRenderer();
     const dataMetricsTypes = ['barChart', 'pieChart', 'trendUp', 'trendDown', 'funnel', 'gauge', 'table'] as const;
-    dataMetricsTypes.forEach(type => shapeRegistry.register(type, dataMetricsRenderer));
+    shapeRegistry.registerLazy(dataMetricsTypes, () => import("./renderers/data-metrics-renderer").then(m => new m.DataMetricsRenderer()));
 
-    const connectionRelRenderer = new ConnectionRelRenderer();
     const connectionRelTypes = ['puzzlePiece', 'chainLink', 'bridge', 'magnet', 'scale', 'seedling', 'tree', 'mountain'] as const;
-    connectionRelTypes.forEach(type => shapeRegistry.register(type, connectionRelRenderer));
+    shapeRegistry.registerLazy(connectionRelTypes, () => import("./renderers/connection-rel-renderer").then(m => new m.ConnectionRelRenderer()));
+}
+
+/**
+ * Fetch the lazily registered renderer families once the app is idle, so
+ * they are ready before the user reaches for one
+ */
+export function preloadShapes() {
+    const preload = () => { shapeRegistry.preloadAll(); };
+    if ('requestIdleCallback' in window) {
+        (window as any).requestIdleCallback(preload, { timeout: 3000 });
+    } else {
+        setTimeout(preload, 1000);
+    }
 }
@@ -9,10 +9,10 @@ export class FreehandRenderer extends ShapeRenderer {
      * Freehand elements use points for their base geometry, not as a morph target.
      */
     render(context: RenderContext) {
-        const { ctx, element, layerOpacity } = context;
+        const { ctx, element, layerOpacity, quality } = context;
 
         // Apply universal transformations
-        const { cx, cy } = RenderPipeline.applyTransformations(ctx, element, layerOpacity);
+        const { cx, cy } = RenderPipeline.applyTransformations(ctx, element, layerOpacity, quality);
 
         // Standard freehand render path
         if (element.renderStyle === 'architectural') {
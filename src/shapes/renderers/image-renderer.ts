@@ -11,6 +11,11 @@ export class ImageRenderer extends ShapeRenderer {
         this.renderCommon(context);
     }
 
+    protected renderDraft(context: RenderContext, _cx: number, _cy: number): void {
+        // A cached bitmap blit is already cheap
+        this.renderCommon(context);
+    }
+
     private renderCommon(context: RenderContext): void {
         const { ctx, element: el } = context;
         if (!el.dataURL) return;
@@ -10,10 +10,10 @@ export class PathRenderer extends ShapeRenderer {
      * tapered, curved branches instead of simple straight lines.
      */
     render(context: RenderContext) {
-        const { ctx, element, layerOpacity } = context;
+        const { ctx, element, layerOpacity, quality } = context;
 
         // 1. Apply universal transformations (rotation, opacity, shadow)
-        const { cx, cy } = RenderPipeline.applyTransformations(ctx, element, layerOpacity);
+        const { cx, cy } = RenderPipeline.applyTransformations(ctx, element, layerOpacity, quality);
 
         // 2. Check for draw-in/draw-out animation
         const dp = element.drawProgress;
@@ -22,7 +22,8 @@ export class PathRenderer extends ShapeRenderer {
         } else {
             // Normal render path - no complex fills for paths
             // 3. Delegate to specialized rendering methods based on style
-            if (element.renderStyle === 'architectural') {
+            // Draft frames use the clean path instead of RoughJS
+            if (element.renderStyle === 'architectural' || quality === 'draft') {
                 this.renderArchitectural(context, cx, cy);
             } else {
                 this.renderSketch(context, cx, cy);
@@ -11,6 +11,11 @@ export class TextRenderer extends ShapeRenderer {
         this.renderCommon(context);
     }
 
+    protected renderDraft(context: RenderContext, _cx: number, _cy: number): void {
+        if (RenderPipeline.isDraftTextHidden(context, context.element.fontSize || 20)) return;
+        this.renderCommon(context);
+    }
+
     private renderCommon(context: RenderContext): void {
         const { ctx, element: el, isDarkMode } = context;
         if (!el.text) return;
@@ -1,15 +1,102 @@
 import type { ElementType } from "../types";
 import type { ShapeRenderer } from "./base/shape-renderer";
 
+type RendererLoader = () => Promise<ShapeRenderer>;
+
+interface LazyFamily {
+    types: readonly ElementType[];
+    load: RendererLoader;
+    promise: Promise<void> | null;
+    /** The last load failed; retried by the next `preloadAll` */
+    failed: boolean;
+}
+
 class ShapeRegistry {
     private renderers = new Map<ElementType, ShapeRenderer>();
+    private lazyFamilies = new Map<ElementType, LazyFamily>();
+    private loadListeners = new Set<() => void>();
+    private loads = 0;
 
     register(type: ElementType, renderer: ShapeRenderer) {
         this.renderers.set(type, renderer);
     }
 
+    /**
+     * Register a renderer family whose module is loaded on first use of any
+     * of its types (or by `preloadAll`). One renderer instance serves all types.
+     */
+    registerLazy(types: readonly ElementType[], load: RendererLoader) {
+        const family: LazyFamily = { types, load, promise: null, failed: false };
+        types.forEach(type => this.lazyFamilies.set(type, family));
+    }
+
     getRenderer(type: ElementType): ShapeRenderer | undefined {
-        return this.renderers.get(type);
+        const renderer = this.renderers.get(type);
+        if (renderer) return renderer;
+        const family = this.lazyFamilies.get(type);
+        if (family && !family.failed) this.loadFamily(family);
+        return undefined;
+    }
+
+    /**
+     * True while a type's renderer module is still being fetched
+     */
+    isPending(type: ElementType): boolean {
+        const family = this.lazyFamilies.get(type);
+        return !this.renderers.has(type) && !!family && !family.failed;
+    }
+
+    /**
+     * True when a type's renderer module failed to load (already reported)
+     */
+    hasFailed(type: ElementType): boolean {
+        return !this.renderers.has(type) && !!this.lazyFamilies.get(type)?.failed;
+    }
+
+    /**
+     * Incremented whenever a lazily loaded family becomes available - a cache
+     * key for anything rendered without it
+     */
+    get revision(): number {
+        return this.loads;
+    }
+
+    /**
+     * Called whenever a lazily loaded family becomes available (to redraw).
+     * Returns a function that removes the listener.
+     */
+    addLoadListener(listener: () => void): () => void {
+        this.loadListeners.add(listener);
+        return () => { this.loadListeners.delete(listener); };
+    }
+
+    /**
+     * Load every remaining family - scheduled at idle time after startup.
+     * Families whose load failed are retried.
+     */
+    preloadAll(): Promise<void> {
+        const families = new Set(this.lazyFamilies.values());
+        return Promise.all(Array.from(families, family => this.loadFamily(family))).then(() => undefined);
+    }
+
+    private loadFamily(family: LazyFamily): Promise<void> {
+        if (!family.promise) {
+            family.failed = false;
+            family.promise = family.load().then(renderer => {
+                family.types.forEach(type => {
+                    this.renderers.set(type, renderer);
+                    this.lazyFamilies.delete(type);
+                });
+                this.loads++;
+                this.loadListeners.forEach(listener => listener());
+            }).catch(e => {
+                console.error(`Failed to load renderer for ${family.types.join(', ')}`, e);
+                // Not pending any more (no retry per frame); preloadAll tries again
+                family.failed = true;
+                family.promise = null;
+            });
+        }
+        return family.promise;
     }
 }
 
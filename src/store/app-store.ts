@@ -1,15 +1,19 @@
 import { batch } from "solid-js";
-import { createStore } from "solid-js/store";
+import { createStore, unwrap } from "solid-js/store";
 import type { DrawingElement, ViewState, ElementType, Layer, GridSettings, AppMode } from "../types";
 import { createDefaultSlide, createSlideDocument, DEFAULT_SLIDE_TRANSITION } from '../types/slide-types';
 import type { Slide, GlobalSettings, SlideTransition } from '../types/slide-types';
 import type { ElementAnimation, DisplayState } from "../types/motion-types";
 import { showToast } from "../components/toast";
-import { MindmapLayoutEngine, type LayoutDirection } from "../utils/mindmap-layout";
+import { MindmapLayoutEngine, mindmapLayoutEngine, type LayoutDirection } from "../utils/mindmap-layout";
 import { animationEngine } from "../utils/animation/animation-engine";
+import { hasAnimationOverlay, clearOverlayValues } from "../utils/animation/animation-overlay";
+import { bumpElementVersion, bumpElementVersions, bumpAllElementVersions } from "../utils/element-version";
+import { captureElementStates, rebuildDisplayStates, markDisplayStateApplied, planDisplayStateChange } from "../utils/animation/display-states";
 import { slideTransitionManager } from "../utils/animation/slide-transition-manager";
 import { slideBuildManager } from '../utils/animation/slide-build-manager';
 import { generateId } from "../utils/id-generator"; // New Import
+import { slideMembership } from "../utils/slide-membership";
 
 interface AppState {
     // Current Active Slide properties (for performance and compatibility)
@@ -245,6 +249,7 @@ export const undo = () => {
     const previousState = undoStack.pop();
     if (previousState) {
         setStore("elements", previousState.elements);
+        bumpAllElementVersions();
         setStore("layers", previousState.layers);
         setStore("selection", []); // Clear selection to avoid stale IDs
     }
@@ -268,6 +273,7 @@ export const redo = () => {
     const nextState = redoStack.pop();
     if (nextState) {
         setStore("elements", nextState.elements);
+        bumpAllElementVersions();
         setStore("layers", nextState.layers);
         setStore("selection", []); // Clear selection to avoid stale IDs
     }
@@ -282,6 +288,27 @@ export const addElement = (element: DrawingElement) => {
     setStore("elements", (els) => [...els, element]);
 };
 
+// Apply per-element updates in a single store write
+const applyElementUpdates = (updates: Map<string, Partial<DrawingElement>>) => {
+    if (updates.size === 0) return;
+    setStore("elements", els => els.map(el => {
+        const update = updates.get(el.id);
+        return update ? { ...el, ...update } : el;
+    }));
+    bumpElementVersions([...updates.keys()]);
+};
+
+// Re-run the last auto layout of the mindmap a node was just added to (if it
+// has one). Only the ancestor path of the new node is re-measured; see layoutIncremental.
+const relayoutMindmapBranch = (nodeId: string, parentId: string) => {
+    const rootId = mindmapLayoutEngine.findLaidOutRoot(parentId, store.elements)
+        ?? mindmapLayoutEngine.findRoot(nodeId, store.elements);
+    const direction = mindmapLayoutEngine.getLayoutDirection(rootId);
+    if (!direction) return;
+    const updates = mindmapLayoutEngine.layoutIncremental(rootId, direction, store.elements, [nodeId]);
+    if (updates) applyElementUpdates(updates);
+};
+
 export const addChildNode = (parentId: string) => {
     const parent = store.elements.find(e => e.id === parentId);
     if (!parent) return;
@@ -349,13 +376,17 @@ export const addChildNode = (parentId: string) => {
     };
 
     const connectorId = connector.id;
-    setStore("elements", els => [...els, newElement, connector]);
+    batch(() => {
+        setStore("elements", els => [...els, newElement, connector]);
 
-    // Movement sync: Add connector to boundElements of both nodes
-    setStore("elements", e => e.id === parentId, "boundElements", b => [...(b || []), { id: connectorId, type: 'arrow' as const }]);
-    setStore("elements", e => e.id === newId, "boundElements", b => [...(b || []), { id: connectorId, type: 'arrow' as const }]);
+        // Movement sync: Add connector to boundElements of both nodes
+        setStore("elements", e => e.id === parentId, "boundElements", b => [...(b || []), { id: connectorId, type: 'arrow' as const }]);
+        setStore("elements", e => e.id === newId, "boundElements", b => [...(b || []), { id: connectorId, type: 'arrow' as const }]);
+        bumpElementVersion(parentId);
 
-    setStore("selection", [newId]);
+        relayoutMindmapBranch(newId, parentId);
+        setStore("selection", [newId]);
+    });
     return newId;
 };
 
@@ -429,13 +460,17 @@ export const addSiblingNode = (siblingId: string) => {
     };
 
     const connectorId = connector.id;
-    setStore("elements", els => [...els, newElement, connector]);
+    batch(() => {
+        setStore("elements", els => [...els, newElement, connector]);
 
-    // Movement sync: Add connector to boundElements of both nodes
-    setStore("elements", e => e.id === parentId, "boundElements", b => [...(b || []), { id: connectorId, type: 'arrow' as const }]);
-    setStore("elements", e => e.id === newId, "boundElements", b => [...(b || []), { id: connectorId, type: 'arrow' as const }]);
+        // Movement sync: Add connector to boundElements of both nodes
+        setStore("elements", e => e.id === parentId, "boundElements", b => [...(b || []), { id: connectorId, type: 'arrow' as const }]);
+        setStore("elements", e => e.id === newId, "boundElements", b => [...(b || []), { id: connectorId, type: 'arrow' as const }]);
+        bumpElementVersion(parentId);
 
-    setStore("selection", [newId]);
+        relayoutMindmapBranch(newId, parentId);
+        setStore("selection", [newId]);
+    });
     return newId;
 };
 
@@ -446,6 +481,7 @@ export const toggleCollapseSelection = () => {
         el => store.selection.includes(el.id),
         el => ({ isCollapsed: !el.isCollapsed })
     );
+    bumpElementVersions(store.selection);
 };
 
 export const setShowCanvasProperties = (visible: boolean) => {
@@ -490,7 +526,10 @@ export const updateGlobalTickerState = () => {
 
 export const updateElement = (id: string, updates: Partial<DrawingElement>, recordHistory = false) => {
     if (recordHistory) pushToHistory();
+    // A direct write supersedes any in-flight animated value for the same props
+    if (hasAnimationOverlay()) clearOverlayValues(id, Object.keys(updates));
     setStore("elements", (el) => el.id === id, updates);
+    bumpElementVersion(id);
     if ('flowAnimation' in updates) {
         updateGlobalTickerState();
     }
@@ -504,6 +543,7 @@ export const updateAnimation = (elementId: string, animationId: string, updates:
         (anim: ElementAnimation) => anim.id === animationId,
         updates
     );
+    bumpElementVersion(elementId);
 };
 
 export const reorderAnimation = (elementId: string, animationId: string, direction: 'up' | 'down', recordHistory = true) => {
@@ -523,6 +563,7 @@ export const reorderAnimation = (elementId: string, animationId: string, directi
     animations.splice(newIndex, 0, removed);
 
     setStore("elements", (e) => e.id === elementId, "animations", animations);
+    bumpElementVersion(elementId);
 };
 
 export const moveSelectedElements = (dx: number, dy: number, recordHistory = false) => {
@@ -533,6 +574,7 @@ export const moveSelectedElements = (dx: number, dy: number, recordHistory = fal
         x: el.x + dx,
         y: el.y + dy
     }));
+    bumpElementVersions(store.selection);
 };
 
 export const setViewState = (updates: Partial<ViewState>) => {
@@ -770,15 +812,12 @@ export const duplicateSlide = (index: number) => {
     saveActiveSlide();
 
     const sourceSlide = store.slides[index];
-    const { x: sX, y: sY } = sourceSlide.spatialPosition;
-    const { width: sW, height: sH } = sourceSlide.dimensions;
-
-    // 1. Identify source elements (center logic)
-    const sourceElements = store.elements.filter(el => {
-        const cx = el.x + (el.width || 0) / 2;
-        const cy = el.y + (el.height || 0) / 2;
-        return cx >= sX && cx <= sX + sW && cy >= sY && cy <= sY + sH;
-    });
+    const { x: sX } = sourceSlide.spatialPosition;
+
+    // 1. Identify source elements (center logic, from the membership index;
+    // master-layer elements already appear on every slide and are not copied)
+    slideMembership.sync(store.elements, store.slides, store.layers);
+    const sourceElements = slideMembership.membersOf(sourceSlide.id).map(i => store.elements[i]);
 
     // 2. Setup new slide position (to the right of all)
     const lastSlide = store.slides.reduce((prev, current) => {
@@ -1008,9 +1047,12 @@ export const loadDocument = (doc: any) => {
         });
 
         setStore("elements", JSON.parse(JSON.stringify(elements)));
+        bumpAllElementVersions();
         setStore("slides", JSON.parse(JSON.stringify(slides)));
         setStore("layers", JSON.parse(JSON.stringify(layers)));
-        setStore("states", JSON.parse(JSON.stringify(states)));
+        // Legacy documents store full snapshots per state; re-encode as deltas
+        setStore("states", rebuildDisplayStates(JSON.parse(JSON.stringify(states))));
+        markDisplayStateApplied(undefined);
         setStore("gridSettings", JSON.parse(JSON.stringify(gridSettings)));
 
         setStore("globalSettings", doc.globalSettings || initialState.globalSettings);
@@ -1063,26 +1105,14 @@ export const toggleStatePanel = (visible?: boolean) => {
 
 export const addDisplayState = (name: string) => {
     const id = crypto.randomUUID();
-    const overrides: Record<string, Partial<any>> = {};
-
-    // Capture current values for all elements
-    store.elements.forEach(el => {
-        overrides[el.id] = {
-            x: el.x,
-            y: el.y,
-            width: el.width,
-            height: el.height,
-            opacity: el.opacity,
-            angle: el.angle,
-            backgroundColor: el.backgroundColor,
-            strokeColor: el.strokeColor,
-            text: el.text
-        };
-    });
 
-    const newState: DisplayState = { id, name, overrides: overrides as any };
-    setStore("states", (prev) => [...prev, newState]);
+    // Capture current values for all elements; stored as a delta against the base state
+    const newState: DisplayState = { id, name, overrides: {} };
+    setStore("states", rebuildDisplayStates([...unwrap(store.states), newState], {
+        [id]: captureElementStates(store.elements)
+    }));
     setStore("activeStateId", id);
+    markDisplayStateApplied(id);
     showToast(`State "${name}" captured`, 'success');
 };
 
@@ -1090,29 +1120,18 @@ export const updateDisplayState = (id: string) => {
     const stateIndex = store.states.findIndex(s => s.id === id);
     if (stateIndex === -1) return;
 
-    const overrides: Record<string, Partial<any>> = {};
-    store.elements.forEach(el => {
-        overrides[el.id] = {
-            x: el.x,
-            y: el.y,
-            width: el.width,
-            height: el.height,
-            opacity: el.opacity,
-            angle: el.angle,
-            backgroundColor: el.backgroundColor,
-            strokeColor: el.strokeColor,
-            text: el.text
-        };
-    });
-
-    setStore("states", stateIndex, "overrides", overrides as any);
+    setStore("states", rebuildDisplayStates(unwrap(store.states), {
+        [id]: captureElementStates(store.elements)
+    }));
+    if (store.activeStateId === id) markDisplayStateApplied(id);
     showToast(`State updated`, 'success');
 };
 
 export const deleteDisplayState = (id: string) => {
-    setStore("states", (prev) => prev.filter(s => s.id !== id));
+    setStore("states", rebuildDisplayStates(unwrap(store.states), undefined, id));
     if (store.activeStateId === id) {
         setStore("activeStateId", undefined);
+        markDisplayStateApplied(undefined);
     }
     showToast(`State deleted`, 'info');
 };
@@ -1121,18 +1140,22 @@ export const applyDisplayState = async (id: string, animate: boolean = true) =>
     const targetState = store.states.find(s => s.id === id);
     if (!targetState) return;
 
+    const fromStateId = store.activeStateId;
     setStore("activeStateId", id);
 
     if (animate) {
         const { MorphAnimator } = await import("../utils/animation/morph-animator");
-        MorphAnimator.morphTo(targetState);
+        MorphAnimator.morphTo(targetState, 800, fromStateId);
     } else {
-        // Immediate apply
+        // Immediate apply - only the properties that differ
+        const changes = planDisplayStateChange(targetState, fromStateId, store.states, store.elements);
         batch(() => {
-            Object.entries(targetState.overrides).forEach(([elId, targetProps]) => {
+            Object.entries(changes).forEach(([elId, targetProps]) => {
                 updateElement(elId, targetProps, false);
             });
         });
+        // After the writes, so they don't count as edits to the applied state
+        markDisplayStateApplied(id);
     }
 };
 
@@ -1223,6 +1246,7 @@ export const groupSelected = () => {
             return [...currentIds, groupId];
         }
     );
+    bumpElementVersions(store.selection);
 };
 
 export const ungroupSelected = () => {
@@ -1241,6 +1265,9 @@ export const ungroupSelected = () => {
     pushToHistory();
 
     // 2. Remove these IDs from ALL elements that have them as outermost
+    const ungrouped = store.elements
+        .filter(el => el.groupIds && el.groupIds.length > 0 && outerGroupIds.has(el.groupIds[el.groupIds.length - 1]))
+        .map(el => el.id);
     setStore("elements",
         (el) => {
             if (!el.groupIds || el.groupIds.length === 0) return false;
@@ -1253,6 +1280,7 @@ export const ungroupSelected = () => {
             return ids.slice(0, -1);
         }
     );
+    bumpElementVersions(ungrouped);
 };
 
 export const moveElementZIndex = (id: string, direction: 'front' | 'back' | 'forward' | 'backward') => {
@@ -1422,11 +1450,14 @@ export const deleteLayer = (id: string) => {
             // Move all elements from this layer to the first remaining layer
             const remainingLayer = store.layers.find(l => l.id !== id);
             if (remainingLayer) {
+                const moved: string[] = [];
                 store.elements.forEach((el, idx) => {
                     if (el.layerId === id) {
                         setStore('elements', idx, 'layerId', remainingLayer.id);
+                        moved.push(el.id);
                     }
                 });
+                bumpElementVersions(moved);
             }
         }
     } else {
@@ -1546,11 +1577,13 @@ export const mergeLayerDown = (id: string) => {
     pushToHistory();
 
     // Move elements
+    const moved = store.elements.filter(el => el.layerId === sourceLayer.id).map(el => el.id);
     setStore('elements',
         (el) => el.layerId === sourceLayer.id,
         'layerId',
         targetLayer.id
     );
+    bumpElementVersions(moved);
 
     // Remove source layer
     setStore('layers', (ls) => ls.filter(l => l.id !== sourceLayer.id));
@@ -1569,11 +1602,13 @@ export const flattenLayers = () => {
     const bottomLayer = store.layers[0];
 
     // Move all elements from all other layers to bottom layer
+    const moved = store.elements.filter(el => el.layerId !== bottomLayer.id).map(el => el.id);
     setStore('elements',
         (el) => el.layerId !== bottomLayer.id,
         'layerId',
         bottomLayer.id
     );
+    bumpElementVersions(moved);
 
     // Remove all layers except bottom
     setStore('layers', [bottomLayer]);
@@ -1629,6 +1664,7 @@ export const moveElementsToLayer = (elementIds: string[], targetLayerId: string)
             setStore('elements', idx, 'layerId', targetLayerId);
         }
     });
+    bumpElementVersions(elementIds);
 };
 
 //Grid Control Functions
@@ -1881,6 +1917,7 @@ export const alignSelectedElements = (type: AlignmentType) => {
                 return update ? { ...el, ...update } : el;
             }
         );
+        bumpElementVersions(updates.map(u => u.id));
     }
 };
 
@@ -1901,6 +1938,7 @@ export const cycleStrokeStyle = () => {
         const next = styles[(styles.indexOf(current) + 1) % styles.length];
         return { strokeStyle: next };
     });
+    bumpElementVersions(store.selection);
 };
 
 export const cycleFillStyle = () => {
@@ -1920,6 +1958,7 @@ export const cycleFillStyle = () => {
         const next = styles[(styles.indexOf(current) + 1) % styles.length];
         return { fillStyle: next };
     });
+    bumpElementVersions(store.selection);
 };
 
 export const distributeSelectedElements = (type: DistributionType) => {
@@ -1934,6 +1973,7 @@ export const distributeSelectedElements = (type: DistributionType) => {
                 return update ? { ...el, ...update } : el;
             }
         );
+        bumpElementVersions(updates.map(u => u.id));
     }
 };
 
@@ -1981,32 +2021,15 @@ export const clearParent = (id: string) => {
     updateElement(id, { parentId: null }, true);
 };
 export const reorderMindmap = (rootId: string, direction: LayoutDirection) => {
-    const engine = new MindmapLayoutEngine();
-    const tree = engine.buildTree(rootId, store.elements);
-    if (!tree) return;
+    if (!store.elements.some(e => e.id === rootId)) return;
 
     pushToHistory();
 
-    if (direction.startsWith('horizontal')) {
-        engine.layoutHorizontal(tree, direction === 'horizontal-right' ? 'right' : 'left');
-    } else if (direction.startsWith('vertical')) {
-        engine.layoutVertical(tree, direction === 'vertical-down' ? 'down' : 'up');
-    } else if (direction === 'radial') {
-        engine.layoutRadial(tree);
-    }
-
-    const updates = engine.getUpdates(tree, store.elements);
-
-    // Batch update elements
-    const newElements = store.elements.map(el => {
-        const update = updates.get(el.id);
-        if (update) {
-            return { ...el, ...update };
-        }
-        return el;
-    });
+    // Incremental: subtrees unchanged since the last layout of this root are
+    // reused, and only nodes that moved are written (in one batch)
+    const updates = mindmapLayoutEngine.layoutIncremental(rootId, direction, store.elements);
+    if (updates) applyElementUpdates(updates);
 
-    setStore("elements", newElements);
     showToast(`Mindmap layout updated (${direction})`, 'success');
 };
 
@@ -2017,20 +2040,12 @@ export const applyMindmapStyling = (rootId: string) => {
 
     pushToHistory();
 
-    engine.applySemanticStyling(tree, store.elements);
+    engine.applySemanticStyling(tree);
 
     const updates = engine.getUpdates(tree, store.elements);
 
     // Batch update elements
-    const newElements = store.elements.map(el => {
-        const update = updates.get(el.id);
-        if (update) {
-            return { ...el, ...update };
-        }
-        return el;
-    });
-
-    setStore("elements", newElements);
+    applyElementUpdates(updates);
     showToast(`Semantic styling applied to branch`, 'success');
 };
 
@@ -2059,6 +2074,7 @@ export const renameElement = (oldId: string, newId: string) => {
 
     pushToHistory();
 
+    const renamed: string[] = [newId];
     setStore("elements", (els) => els.map(el => {
         // Update the element itself
         if (el.id === oldId) {
@@ -2079,11 +2095,13 @@ export const renameElement = (oldId: string, newId: string) => {
         }
 
         if (Object.keys(changes).length > 0) {
+            renamed.push(el.id);
             return { ...el, ...changes };
         }
 
         return el;
     }));
+    bumpElementVersions(renamed);
 
     // Update selection if selected
     if (store.selection.includes(oldId)) {
@@ -92,9 +92,22 @@ export interface DrawingElementState {
     text: string;
 }
 
+// Precompiled transition from one display state to the next (only what differs)
+export interface MorphPlan {
+    fromId: string;
+    move: Record<string, Partial<DrawingElementState>>;  // changed properties (beyond opacity)
+    fade: Record<string, Partial<DrawingElementState>>;  // opacity-only changes
+    enter: Record<string, Partial<DrawingElementState>>; // not captured in the source state
+}
+
 // 4. Diagram State (for "Magic Move" style transitions)
 export interface DisplayState {
     id: string;
     name: string; // "Loading", "Success", "Error"
-    overrides: Record<string, Partial<DrawingElementState>>; // map elementId -> properties
+    // map elementId -> properties; a full snapshot for the base state,
+    // only the properties that differ from the base for states with `baseId`
+    overrides: Record<string, Partial<DrawingElementState>>;
+    baseId?: string;
+    removed?: string[]; // base elements that did not exist when this state was captured
+    plan?: MorphPlan;   // transition from the previous state (the first state's is from the last)
 }
@@ -1,5 +1,6 @@
 import type { DrawingElement } from '../types';
 import { rotatePoint } from './geometry';
+import { getShapeOutline } from './shape-geometry';
 
 export interface Point {
     x: number;
@@ -132,14 +133,12 @@ export function getAnchorPoints(element: DrawingElement): AnchorPoint[] {
         }
     } else if (element.type === 'line' && element.curveType === 'elbow' && !element.startBinding && !element.endBinding
         && element.points && Array.isArray(element.points) && (element.points as any[]).length >= 2) {
-        // Polyline shape: compute actual bounding box from points for proper anchor positions
-        let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
-        for (const p of element.points as { x: number; y: number }[]) {
-            minX = Math.min(minX, element.x + p.x);
-            minY = Math.min(minY, element.y + p.y);
-            maxX = Math.max(maxX, element.x + p.x);
-            maxY = Math.max(maxY, element.y + p.y);
-        }
+        // Polyline shape: actual bounding box of the points (memoized outline bounds)
+        const bounds = getShapeOutline(element)!.bounds;
+        const minX = element.x + bounds.minX;
+        const minY = element.y + bounds.minY;
+        const maxX = element.x + bounds.maxX;
+        const maxY = element.y + bounds.maxY;
         const polyCx = (minX + maxX) / 2;
         const polyCy = (minY + maxY) / 2;
 
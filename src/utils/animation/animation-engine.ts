@@ -24,6 +24,63 @@ class AnimationEngine {
     private isRunning: boolean = false;
     private forceTicker: boolean = false;
     private lastTickTime: number = 0;
+    private manualClock: number | null = null;
+
+    /**
+     * Current engine time - the manual clock while frozen, wall clock otherwise
+     */
+    private now(): number {
+        return this.manualClock ?? performance.now();
+    }
+
+    /**
+     * Freeze the engine on a manual clock (offline export). The rAF loop stops
+     * and time only advances through step(), so every frame is deterministic.
+     */
+    freezeClock(): void {
+        if (this.manualClock !== null) return;
+        this.manualClock = performance.now();
+        this.lastTickTime = this.manualClock;
+        if (this.rafId !== null) {
+            cancelAnimationFrame(this.rafId);
+            this.rafId = null;
+        }
+    }
+
+    /**
+     * Advance a frozen clock by `deltaMs` and run one tick synchronously
+     */
+    step(deltaMs: number): void {
+        if (this.manualClock === null) return;
+        this.manualClock += deltaMs;
+        if (this.isRunning) {
+            this.tick(this.manualClock);
+        } else {
+            this.lastTickTime = this.manualClock;
+        }
+    }
+
+    /**
+     * Return to wall-clock time. Animation start times are rebased so that
+     * running animations continue from where the manual clock left them.
+     */
+    releaseClock(): void {
+        if (this.manualClock === null) return;
+        const offset = performance.now() - this.manualClock;
+        this.manualClock = null;
+        for (const animation of this.animations.values()) {
+            animation.startTime += offset;
+            if (animation.pauseTime !== null) animation.pauseTime += offset;
+        }
+        this.lastTickTime = 0;
+        if (this.isRunning) {
+            this.rafId = requestAnimationFrame(this.tick);
+        }
+    }
+
+    get isClockFrozen(): boolean {
+        return this.manualClock !== null;
+    }
 
     /**
      * Start/Stop the global ticker even when no animations are running
@@ -54,6 +111,7 @@ class AnimationEngine {
             onUpdate,
             onComplete: config.onComplete,
             onStart: config.onStart,
+            onStop: config.onStop,
             loop: config.loop ?? false,
             loopCount: config.loopCount ?? Infinity,
             currentLoop: 0,
@@ -75,11 +133,11 @@ class AnimationEngine {
         if (animation.state === 'paused' && animation.pauseTime !== null) {
             // Resume from pause
             const pausedDuration = animation.pauseTime - animation.startTime;
-            animation.startTime = performance.now() - pausedDuration;
+            animation.startTime = this.now() - pausedDuration;
             animation.pauseTime = null;
         } else {
             // Fresh start
-            animation.startTime = performance.now();
+            animation.startTime = this.now();
             animation.currentLoop = 0;
             animation.direction = 1;
         }
@@ -98,7 +156,7 @@ class AnimationEngine {
         if (!animation || animation.state !== 'running') return;
 
         animation.state = 'paused';
-        animation.pauseTime = performance.now();
+        animation.pauseTime = this.now();
     }
 
     /**
@@ -110,6 +168,7 @@ class AnimationEngine {
 
         animation.state = 'completed';
         this.animations.delete(id);
+        animation.onStop?.();
 
         // Stop loop if no more animations and ticker not forced
         if (this.animations.size === 0 && !this.forceTicker) {
@@ -150,7 +209,12 @@ class AnimationEngine {
      * Stop all animations
      */
     stopAll(): void {
+        const stopped = [...this.animations.values()];
         this.animations.clear();
+        stopped.forEach(animation => {
+            animation.state = 'completed';
+            animation.onStop?.();
+        });
         setIsGlobalPlaying(false);
         setIsGlobalPaused(false);
         this.stopLoop();
@@ -163,7 +227,7 @@ class AnimationEngine {
         for (const animation of this.animations.values()) {
             if (animation.state === 'running') {
                 animation.state = 'paused';
-                animation.pauseTime = performance.now();
+                animation.pauseTime = this.now();
             }
         }
     }
@@ -172,7 +236,7 @@ class AnimationEngine {
      * Resume all paused animations
      */
     resumeAll(): void {
-        const now = performance.now();
+        const now = this.now();
         for (const animation of this.animations.values()) {
             if (animation.state === 'paused' && animation.pauseTime !== null) {
                 const pausedDuration = animation.pauseTime - animation.startTime;
@@ -281,7 +345,10 @@ class AnimationEngine {
         setIsGlobalPaused(hasPausedAnimations);
 
         if (hasRunningAnimations || this.animations.size > 0 || this.forceTicker) {
-            this.rafId = requestAnimationFrame(this.tick);
+            // A frozen clock is driven by step() instead
+            if (this.manualClock === null) {
+                this.rafId = requestAnimationFrame(this.tick);
+            }
         } else {
             this.stopLoop();
         }
@@ -294,7 +361,9 @@ class AnimationEngine {
         if (!this.isRunning) {
             this.isRunning = true;
             setIsGlobalAnimating(true);
-            this.rafId = requestAnimationFrame(this.tick);
+            if (this.manualClock === null) {
+                this.rafId = requestAnimationFrame(this.tick);
+            }
         }
     }
 
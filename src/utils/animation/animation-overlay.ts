@@ -0,0 +1,89 @@
+/**
+ * Animation Overlay
+ * Transient per-element property values written by running animations.
+ * The renderer composes them on top of the persisted element state, so
+ * animation ticks never touch the Solid store (no reactive fan-out to the
+ * minimap, property panel or render-cache hashes). Values are committed to
+ * the store once, when the animation completes or is stopped.
+ */
+
+import type { DrawingElement } from '../../types';
+import { followBoundLines } from '../binding-logic';
+
+const overlay = new Map<string, Partial<DrawingElement>>();
+
+/**
+ * Write the current frame's animated values for an element
+ */
+export function setOverlayValues(elementId: string, values: Partial<DrawingElement>): void {
+    const existing = overlay.get(elementId);
+    if (existing) {
+        Object.assign(existing, values);
+    } else {
+        overlay.set(elementId, { ...values });
+    }
+}
+
+/**
+ * Get the transient values for an element, if any
+ */
+export function getOverlayValues(elementId: string): Partial<DrawingElement> | undefined {
+    return overlay.get(elementId);
+}
+
+export function hasAnimationOverlay(): boolean {
+    return overlay.size > 0;
+}
+
+/**
+ * Remove the given properties from an element's overlay and return their values
+ * (used to commit a finished animation to the store).
+ */
+export function takeOverlayValues(elementId: string, props: Iterable<string>): Partial<DrawingElement> | null {
+    const existing = overlay.get(elementId);
+    if (!existing) return null;
+
+    let taken: Partial<DrawingElement> | null = null;
+    for (const prop of props) {
+        if (prop in existing) {
+            if (!taken) taken = {};
+            (taken as any)[prop] = (existing as any)[prop];
+            delete (existing as any)[prop];
+        }
+    }
+    if (Object.keys(existing).length === 0) overlay.delete(elementId);
+    return taken;
+}
+
+/**
+ * Drop overlay values superseded by a direct store write
+ */
+export function clearOverlayValues(elementId: string, props: Iterable<string>): void {
+    takeOverlayValues(elementId, props);
+}
+
+export function clearAllOverlays(): void {
+    overlay.clear();
+}
+
+const GEOMETRY_KEYS = ['x', 'y', 'width', 'height', 'angle'] as const;
+
+/**
+ * Compose the overlay on top of persisted elements for rendering.
+ * Connectors bound to elements whose geometry is animating are re-routed
+ * for the frame, so they follow every tick rather than jumping on commit.
+ * Returns the input array untouched when nothing is animating.
+ */
+export function applyAnimationOverlay(elements: DrawingElement[]): DrawingElement[] {
+    if (overlay.size === 0) return elements;
+    const composed = elements.map(el => {
+        const values = overlay.get(el.id);
+        return values ? { ...el, ...values } : el;
+    });
+
+    const moved: string[] = [];
+    overlay.forEach((values, id) => {
+        if (GEOMETRY_KEYS.some(key => key in values)) moved.push(id);
+    });
+    return moved.length > 0 ? followBoundLines(composed, moved) : composed;
+}
@@ -184,6 +184,8 @@ export interface AnimationConfig {
     onComplete?: () => void;
     /** Called when animation starts */
     onStart?: () => void;
+    /** Called when animation is stopped before completing */
+    onStop?: () => void;
     /** Loop the animation */
     loop?: boolean;
     /** Number of times to loop (Infinity for forever) */
@@ -243,6 +245,7 @@ export interface Animation {
     onUpdate: (progress: number) => void;
     onComplete?: () => void;
     onStart?: () => void;
+    onStop?: () => void;
     loop: boolean;
     loopCount: number;
     currentLoop: number;
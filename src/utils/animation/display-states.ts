@@ -0,0 +1,189 @@
+/**
+ * Display States
+ * Delta encoding and precompiled morph plans for "Magic Move" states.
+ * The first state is the base and holds a full snapshot; every other state
+ * stores only the properties that differ from the base. Each state also
+ * carries a plan for the transition from the previous state (the first
+ * state's from the last), listing which elements move, fade and enter, so
+ * stepping through states only touches what actually changes.
+ */
+
+import type { DrawingElement } from '../../types';
+import type { DisplayState, DrawingElementState, MorphPlan } from '../../types/motion-types';
+import { getElementVersionClock, getElementsChangedSince } from '../element-version';
+
+type StateProps = Partial<DrawingElementState>;
+export type ResolvedState = Record<string, StateProps>;
+
+const STATE_KEYS: readonly (keyof DrawingElementState)[] = [
+    'x', 'y', 'width', 'height', 'opacity', 'angle', 'backgroundColor', 'strokeColor', 'text'
+];
+
+/**
+ * Snapshot the state-tracked properties of every element
+ */
+export function captureElementStates(elements: readonly DrawingElement[]): ResolvedState {
+    const snapshot: ResolvedState = {};
+    for (const el of elements) {
+        const props: StateProps = {};
+        for (const key of STATE_KEYS) (props as any)[key] = (el as any)[key];
+        snapshot[el.id] = props;
+    }
+    return snapshot;
+}
+
+/**
+ * Properties of `to` that differ from `from` (all of them when `from` is missing)
+ */
+export function diffStateProps(from: StateProps | undefined, to: StateProps): StateProps | null {
+    if (!from) return { ...to };
+    let diff: StateProps | null = null;
+    for (const key of STATE_KEYS) {
+        if (!(key in to) || to[key] === from[key]) continue;
+        if (!diff) diff = {};
+        (diff as any)[key] = to[key];
+    }
+    return diff;
+}
+
+/**
+ * Full element -> properties map of a state. Legacy states (no `baseId`) are
+ * already full snapshots.
+ */
+export function resolveDisplayState(state: DisplayState, states: readonly DisplayState[]): ResolvedState {
+    if (!state.baseId) return state.overrides;
+    const base = states.find(s => s.id === state.baseId);
+    if (!base) return state.overrides;
+
+    const resolved: ResolvedState = {};
+    const removed = state.removed ? new Set(state.removed) : null;
+    for (const id in base.overrides) {
+        if (removed && removed.has(id)) continue;
+        const delta = state.overrides[id];
+        resolved[id] = delta ? { ...base.overrides[id], ...delta } : base.overrides[id];
+    }
+    for (const id in state.overrides) {
+        if (!resolved[id]) resolved[id] = state.overrides[id];
+    }
+    return resolved;
+}
+
+/**
+ * Transition from one resolved state to the next
+ */
+export function compileMorphPlan(fromId: string, from: ResolvedState, to: ResolvedState): MorphPlan {
+    const plan: MorphPlan = { fromId, move: {}, fade: {}, enter: {} };
+    for (const id in to) {
+        const source = from[id];
+        if (!source) {
+            plan.enter[id] = to[id];
+            continue;
+        }
+        const diff = diffStateProps(source, to[id]);
+        if (!diff) continue;
+        const keys = Object.keys(diff);
+        if (keys.length === 1 && keys[0] === 'opacity') plan.fade[id] = diff;
+        else plan.move[id] = diff;
+    }
+    return plan;
+}
+
+/**
+ * Encode a list of resolved states: the first becomes the base, the rest
+ * deltas against it, and every state gets its plan from the previous one.
+ */
+export function encodeDisplayStates(entries: readonly { id: string; name: string; resolved: ResolvedState }[]): DisplayState[] {
+    if (entries.length === 0) return [];
+    const base = entries[0];
+
+    return entries.map((entry, index) => {
+        const previous = entries[(index - 1 + entries.length) % entries.length];
+        const state: DisplayState = {
+            id: entry.id,
+            name: entry.name,
+            overrides: entry.resolved,
+            plan: compileMorphPlan(previous.id, previous.resolved, entry.resolved)
+        };
+        if (index === 0) return state;
+
+        const overrides: ResolvedState = {};
+        for (const id in entry.resolved) {
+            const delta = diffStateProps(base.resolved[id], entry.resolved[id]);
+            if (delta) overrides[id] = delta;
+        }
+        const removed: string[] = [];
+        for (const id in base.resolved) {
+            if (!entry.resolved[id]) removed.push(id);
+        }
+        state.overrides = overrides;
+        state.baseId = base.id;
+        if (removed.length > 0) state.removed = removed;
+        return state;
+    });
+}
+
+/**
+ * Re-encode states after a capture, update, delete or load. `replace` swaps
+ * in new resolved snapshots by state id; `removeId` drops a state. Every
+ * state is resolved against the full input list first, so deleting the base
+ * keeps the others intact.
+ */
+export function rebuildDisplayStates(
+    states: readonly DisplayState[],
+    replace?: Record<string, ResolvedState>,
+    removeId?: string
+): DisplayState[] {
+    const entries = states.map(state => ({
+        id: state.id,
+        name: state.name,
+        resolved: replace?.[state.id] ?? resolveDisplayState(state, states)
+    }));
+    return encodeDisplayStates(removeId ? entries.filter(e => e.id !== removeId) : entries);
+}
+
+// Last applied state and the version clock at that moment: while no element
+// has changed since, the canvas is known to match it and plans apply as-is
+let applied: { stateId: string; clock: number } | null = null;
+
+export function markDisplayStateApplied(stateId: string | undefined) {
+    applied = stateId ? { stateId, clock: getElementVersionClock() } : null;
+}
+
+/**
+ * Properties to animate (or set) to bring the canvas to `target`, coming
+ * from state `fromId`. Uses the target's plan when the canvas is still in the
+ * plan's source state, re-diffing only elements edited since; otherwise diffs
+ * the canvas against the resolved target in one pass.
+ */
+export function planDisplayStateChange(
+    target: DisplayState,
+    fromId: string | undefined,
+    states: readonly DisplayState[],
+    elements: readonly DrawingElement[]
+): ResolvedState {
+    const plan = target.plan;
+    const changed = plan && applied && fromId && applied.stateId === fromId && plan.fromId === fromId
+        ? getElementsChangedSince(applied.clock)
+        : null;
+
+    if (changed) {
+        const work: ResolvedState = { ...plan!.move, ...plan!.fade, ...plan!.enter };
+        if (changed.length > 0) {
+            const resolved = resolveDisplayState(target, states);
+            for (const id of changed) {
+                if (resolved[id]) work[id] = resolved[id];
+            }
+        }
+        return work;
+    }
+
+    const resolved = resolveDisplayState(target, states);
+    const work: ResolvedState = {};
+    for (const el of elements) {
+        const props = resolved[el.id];
+        if (!props) continue;
+        const diff = diffStateProps(el as StateProps, props);
+        if (diff) work[el.id] = diff;
+    }
+    return work;
+}
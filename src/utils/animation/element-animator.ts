@@ -8,8 +8,9 @@ import { PathUtils } from '../math/path-utils';
 import { MorphUtils } from '../math/morph-utils';
 import type { AnimationConfig } from './animation-types';
 import { lerp, lerpColor } from './animation-types';
-import { store, updateElement, setStore } from '../../store/app-store';
+import { store, updateElement } from '../../store/app-store';
 import type { DrawingElement } from '../../types';
+import { setOverlayValues, getOverlayValues, takeOverlayValues } from './animation-overlay';
 
 // Track active animations per element with their affected properties
 // Map<elementId, Map<animationId, Set<propertyName>>>
@@ -118,9 +119,46 @@ export interface ElementAnimationConfig extends Omit<AnimationConfig, 'onUpdate'
  * Get the current value of an animatable property from an element
  */
 function getElementProperty(element: DrawingElement, prop: keyof ElementAnimationTarget): number | string | undefined {
+    // An interrupted animation may not have committed yet - continue from what is on screen
+    const overlay = getOverlayValues(element.id);
+    if (overlay && prop in overlay) {
+        return overlay[prop as keyof DrawingElement] as number | string | undefined;
+    }
     return element[prop as keyof DrawingElement] as number | string | undefined;
 }
 
+/**
+ * Commit an animation's last rendered values from the overlay to the store
+ */
+function commitAnimatedValues(elementId: string, props: Iterable<string>): void {
+    const values = takeOverlayValues(elementId, props);
+    if (values) {
+        updateElement(elementId, values, false);
+    }
+}
+
+/**
+ * Register an externally driven animation (e.g. a keyframe table) so that
+ * conflicting animations and stopAllElementAnimations can stop it
+ */
+export function registerElementAnimation(elementId: string, animId: string, props: Set<string>): void {
+    if (!activeAnimations.has(elementId)) {
+        activeAnimations.set(elementId, new Map());
+    }
+    activeAnimations.get(elementId)!.set(animId, props);
+}
+
+/**
+ * Remove an animation from the active registry
+ */
+export function unregisterElementAnimation(elementId: string, animId: string): void {
+    const animIds = activeAnimations.get(elementId);
+    if (animIds) {
+        animIds.delete(animId);
+        if (animIds.size === 0) activeAnimations.delete(elementId);
+    }
+}
+
 /**
  * Animate a single element's properties
  * 
@@ -218,8 +256,8 @@ export function animateElement(
                 }
             }
 
-            // Update the element in store (skip history during animation)
-            updateElement(elementId, updates, false);
+            // Write to the render overlay; the store is updated once on completion
+            setOverlayValues(elementId, updates);
 
             // Call user callback if provided
             config.onUpdate?.(callbackValues);
@@ -230,14 +268,14 @@ export function animateElement(
             delay: config.delay,
             onStart: config.onStart,
             onComplete: () => {
-                // Unregister
-                const animIds = activeAnimations.get(elementId);
-                if (animIds) {
-                    animIds.delete(animId);
-                    if (animIds.size === 0) activeAnimations.delete(elementId);
-                }
+                commitAnimatedValues(elementId, targetProps);
+                unregisterElementAnimation(elementId, animId);
                 config.onComplete?.();
             },
+            onStop: () => {
+                commitAnimatedValues(elementId, targetProps);
+                unregisterElementAnimation(elementId, animId);
+            },
             loop: config.loop,
             loopCount: config.loopCount,
             alternate: config.alternate
@@ -348,7 +386,7 @@ export function animateAlongPath(
                 updates.angle = point.angle; // Use tangent angle (maybe add to originalAngle?)
             }
 
-            updateElement(elementId, updates, false);
+            setOverlayValues(elementId, updates);
 
             // Callback
             config.onUpdate?.({ x: updates.x, y: updates.y, angle: updates.angle });
@@ -359,13 +397,14 @@ export function animateAlongPath(
             delay: config.delay,
             onStart: config.onStart,
             onComplete: () => {
-                const animIds = activeAnimations.get(elementId);
-                if (animIds) {
-                    animIds.delete(animId);
-                    if (animIds.size === 0) activeAnimations.delete(elementId);
-                }
+                commitAnimatedValues(elementId, targetProps);
+                unregisterElementAnimation(elementId, animId);
                 config.onComplete?.();
             },
+            onStop: () => {
+                commitAnimatedValues(elementId, targetProps);
+                unregisterElementAnimation(elementId, animId);
+            },
             loop: config.loop,
             loopCount: config.loopCount,
             alternate: config.alternate
@@ -1757,7 +1796,7 @@ export function revolve(elementId: string, duration: number = 2000, config: Elem
             const angle = progress * Math.PI * 2;
             const x = centerX - radius * Math.cos(angle);
             const y = centerY - radius * Math.sin(angle);
-            updateElement(elementId, { x, y }, false);
+            setOverlayValues(elementId, { x, y });
         },
         {
             duration,
@@ -1767,12 +1806,13 @@ export function revolve(elementId: string, duration: number = 2000, config: Elem
             loopCount: config.loopCount,
             alternate: config.alternate,
             onComplete: () => {
-                const animIds = activeAnimations.get(elementId);
-                if (animIds) {
-                    animIds.delete(animId);
-                    if (animIds.size === 0) activeAnimations.delete(elementId);
-                }
+                commitAnimatedValues(elementId, targetProps);
+                unregisterElementAnimation(elementId, animId);
                 config.onComplete?.();
+            },
+            onStop: () => {
+                commitAnimatedValues(elementId, targetProps);
+                unregisterElementAnimation(elementId, animId);
             }
         }
     );
@@ -2344,27 +2384,12 @@ export function animateMorph(
     animationEngine.create(
         animId,
         (progress: number) => {
-            console.log('[Morph] Progress:', progress.toFixed(3));
             // Interpolate
             const currentPoints = MorphUtils.interpolatePoints(startPoints, endPoints, progress);
 
-            // DIFFERENT APPROACH: Render directly to canvas instead of updating store
-            // This bypasses the reactive system entirely
-            // We'll update the element's points at the END, but render live during animation
-
-            // Store the current morph state on the element for the renderer to pick up
-            const idx = store.elements.findIndex(e => e.id === elementId);
-            if (idx !== -1) {
-                // Update the element with current morph points
-                // Force a new object reference to trigger reactivity
-                const newElements = [...store.elements];
-                newElements[idx] = {
-                    ...newElements[idx],
-                    points: [...currentPoints],
-
-                };
-                setStore('elements', newElements);
-            }
+            // Render the in-between outline through the overlay; the store only
+            // receives the final shape type once the morph completes
+            setOverlayValues(elementId, { points: currentPoints });
         },
         {
             duration: config.duration,
@@ -2374,13 +2399,10 @@ export function animateMorph(
             loopCount: config.loopCount,
             alternate: config.alternate,
             onComplete: () => {
-                const animIds = activeAnimations.get(elementId);
-                if (animIds) {
-                    animIds.delete(animId);
-                    if (animIds.size === 0) activeAnimations.delete(elementId);
-                }
+                unregisterElementAnimation(elementId, animId);
 
                 // Final state: Set to the actual target shape type and clean up
+                // (supersedes the overlay points)
                 updateElement(elementId, {
                     type: targetShape as any,
                     points: undefined,
@@ -2388,6 +2410,10 @@ export function animateMorph(
                 }, false);
 
                 config.onComplete?.();
+            },
+            onStop: () => {
+                commitAnimatedValues(elementId, targetProps);
+                unregisterElementAnimation(elementId, animId);
             }
         }
     );
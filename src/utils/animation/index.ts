@@ -65,6 +65,10 @@ export type {
 // Timeline
 export { Timeline, createTimeline } from './timeline';
 
+// Keyframe Tables
+export { KeyframeTable, KeyframeTrackBuilder, compileKeyframeTable, playKeyframeTable } from './keyframe-table';
+export type { KeyframeTrack, KeyframePlaybackCallbacks } from './keyframe-table';
+
 // Sequence Animator
 export { sequenceAnimator } from './sequence-animator';
 
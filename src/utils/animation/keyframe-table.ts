@@ -0,0 +1,441 @@
+/**
+ * Keyframe Tables
+ * Compiles a run of property tweens (an element's animation sequence, a
+ * slide build, a declarative timeline) into struct-of-arrays typed arrays.
+ * Evaluating the whole table at time t is one pass over flat columns - no
+ * per-animation closures or engine entries - and seeking to any time is
+ * O(tracks) with no replay.
+ */
+
+import { batch } from 'solid-js';
+import { animationEngine, generateAnimationId } from './animation-engine';
+import { getEasing } from './animation-types';
+import type { EasingName, EasingFunction, AnimationConfig } from './animation-types';
+import { setOverlayValues, getOverlayValues, takeOverlayValues } from './animation-overlay';
+import { registerElementAnimation, unregisterElementAnimation } from './element-animator';
+import type { ElementAnimationTarget } from './element-animator';
+import { store, updateElement } from '../../store/app-store';
+import type { DrawingElement } from '../../types';
+
+export interface KeyframeTrack {
+    elementId: string;
+    property: string;
+    from: number | string;
+    to: number | string;
+    /** Start time in ms from the table origin (delay included) */
+    start: number;
+    duration: number;
+    easing?: EasingName | EasingFunction;
+}
+
+const KIND_NUMBER = 0;
+const KIND_COLOR = 1;
+
+const NUMERIC_PROPS = new Set([
+    'x', 'y', 'width', 'height', 'opacity', 'angle', 'strokeWidth', 'roughness', 'drawProgress'
+]);
+const COLOR_PROPS = new Set(['strokeColor', 'backgroundColor']);
+
+/**
+ * Parse a #rrggbb colour into a packed 24-bit integer
+ */
+function packColor(value: number | string): number | null {
+    if (typeof value !== 'string' || !/^#[0-9a-f]{6}$/i.test(value)) return null;
+    return parseInt(value.slice(1), 16);
+}
+
+function unpackColor(packed: number): string {
+    return `#${packed.toString(16).padStart(6, '0')}`;
+}
+
+/**
+ * Per-channel interpolation of packed colours (rounded like lerpColor)
+ */
+function lerpPacked(from: number, to: number, t: number): number {
+    const r = Math.round((from >> 16) + (((to >> 16) & 0xff) - (from >> 16)) * t);
+    const g = Math.round(((from >> 8) & 0xff) + (((to >> 8) & 0xff) - ((from >> 8) & 0xff)) * t);
+    const b = Math.round((from & 0xff) + ((to & 0xff) - (from & 0xff)) * t);
+    const clamp = (c: number) => (c < 0 ? 0 : c > 255 ? 255 : c);
+    return (clamp(r) << 16) | (clamp(g) << 8) | clamp(b);
+}
+
+export class KeyframeTable {
+    /** Time at which the last track finishes */
+    readonly duration: number;
+    readonly elementIds: string[];
+
+    private readonly properties: string[] = [];
+    private readonly easingFns: EasingFunction[] = [];
+
+    // Track columns, ordered by element then start time
+    private readonly elementIndex: Uint32Array;
+    private readonly propertyIndex: Uint16Array;
+    private readonly kind: Uint8Array;
+    private readonly easingIndex: Uint16Array;
+    private readonly start: Float64Array;
+    private readonly length: Float64Array;
+    private readonly from: Float64Array;
+    private readonly to: Float64Array;
+
+    // Element columns: track range [firstTrack[e], firstTrack[e + 1]) and finish time
+    private readonly firstTrack: Uint32Array;
+    private readonly elementEnd: Float64Array;
+
+    // Output of the last evaluation
+    private readonly values: Float64Array;
+    private readonly active: Uint8Array;
+
+    constructor(tracks: KeyframeTrack[]) {
+        const elementLookup = new Map<string, number>();
+        const propertyLookup = new Map<string, number>();
+        const easingLookup = new Map<EasingFunction, number>();
+        this.elementIds = [];
+
+        for (const track of tracks) {
+            if (!elementLookup.has(track.elementId)) {
+                elementLookup.set(track.elementId, this.elementIds.length);
+                this.elementIds.push(track.elementId);
+            }
+        }
+
+        // Group by element; within an element later starts win when props overlap
+        const ordered = [...tracks].sort((a, b) =>
+            (elementLookup.get(a.elementId)! - elementLookup.get(b.elementId)!) || (a.start - b.start)
+        );
+
+        const n = ordered.length;
+        this.elementIndex = new Uint32Array(n);
+        this.propertyIndex = new Uint16Array(n);
+        this.kind = new Uint8Array(n);
+        this.easingIndex = new Uint16Array(n);
+        this.start = new Float64Array(n);
+        this.length = new Float64Array(n);
+        this.from = new Float64Array(n);
+        this.to = new Float64Array(n);
+        this.values = new Float64Array(n);
+        this.active = new Uint8Array(n);
+        this.firstTrack = new Uint32Array(this.elementIds.length + 1);
+        this.elementEnd = new Float64Array(this.elementIds.length);
+
+        let duration = 0;
+        ordered.forEach((track, i) => {
+            const e = elementLookup.get(track.elementId)!;
+
+            let p = propertyLookup.get(track.property);
+            if (p === undefined) {
+                p = this.properties.length;
+                propertyLookup.set(track.property, p);
+                this.properties.push(track.property);
+            }
+
+            const easing = getEasing(track.easing);
+            let k = easingLookup.get(easing);
+            if (k === undefined) {
+                k = this.easingFns.length;
+                easingLookup.set(easing, k);
+                this.easingFns.push(easing);
+            }
+
+            const fromColor = packColor(track.from);
+            const toColor = packColor(track.to);
+            const isColor = fromColor !== null && toColor !== null;
+
+            this.elementIndex[i] = e;
+            this.propertyIndex[i] = p;
+            this.kind[i] = isColor ? KIND_COLOR : KIND_NUMBER;
+            this.easingIndex[i] = k;
+            this.start[i] = track.start;
+            this.length[i] = Math.max(0, track.duration);
+            this.from[i] = isColor ? fromColor! : Number(track.from);
+            this.to[i] = isColor ? toColor! : Number(track.to);
+
+            const end = track.start + this.length[i];
+            if (end > this.elementEnd[e]) this.elementEnd[e] = end;
+            if (end > duration) duration = end;
+        });
+
+        // Element track ranges (tracks are contiguous per element)
+        let e = 0;
+        for (let i = 0; i < n; i++) {
+            while (e < this.elementIndex[i]) this.firstTrack[++e] = i;
+        }
+        while (e < this.elementIds.length) this.firstTrack[++e] = n;
+
+        this.duration = duration;
+    }
+
+    get trackCount(): number {
+        return this.start.length;
+    }
+
+    /**
+     * Evaluate tracks [first, last) at `time` into the value/active columns
+     */
+    private evaluateRange(time: number, first: number, last: number): void {
+        const { start, length, from, to, kind, easingIndex, easingFns, values, active } = this;
+        for (let i = first; i < last; i++) {
+            const local = time - start[i];
+            if (local < 0) {
+                active[i] = 0;
+                continue;
+            }
+            const len = length[i];
+            const progress = len > 0 && local < len ? local / len : 1;
+            const eased = easingFns[easingIndex[i]](progress);
+            values[i] = kind[i] === KIND_NUMBER
+                ? from[i] + (to[i] - from[i]) * eased
+                : lerpPacked(from[i], to[i], eased);
+            active[i] = 1;
+        }
+    }
+
+    /**
+     * Evaluate every track at `time`
+     */
+    evaluate(time: number): void {
+        this.evaluateRange(time, 0, this.trackCount);
+    }
+
+    /**
+     * Collect one element's started tracks from the last evaluation
+     */
+    private collect(e: number): Partial<DrawingElement> | null {
+        let result: Record<string, number | string> | null = null;
+        for (let i = this.firstTrack[e]; i < this.firstTrack[e + 1]; i++) {
+            if (!this.active[i]) continue;
+            if (!result) result = {};
+            result[this.properties[this.propertyIndex[i]]] = this.kind[i] === KIND_NUMBER
+                ? this.values[i]
+                : unpackColor(this.values[i]);
+        }
+        return result as Partial<DrawingElement> | null;
+    }
+
+    /**
+     * Properties animated on an element (by element index)
+     */
+    getProperties(e: number): Set<string> {
+        const props = new Set<string>();
+        for (let i = this.firstTrack[e]; i < this.firstTrack[e + 1]; i++) {
+            props.add(this.properties[this.propertyIndex[i]]);
+        }
+        return props;
+    }
+
+    getElementEnd(e: number): number {
+        return this.elementEnd[e];
+    }
+
+    /**
+     * Values of one element at `time`
+     */
+    valuesAt(e: number, time: number): Partial<DrawingElement> | null {
+        this.evaluateRange(time, this.firstTrack[e], this.firstTrack[e + 1]);
+        return this.collect(e);
+    }
+
+    /**
+     * Evaluate at `time` and write the result into the render overlay.
+     * Elements whose tracks have all finished are skipped - the player commits
+     * those to the store once.
+     */
+    apply(time: number): void {
+        this.evaluate(time);
+        for (let e = 0; e < this.elementIds.length; e++) {
+            if (time >= this.elementEnd[e]) continue;
+            const values = this.collect(e);
+            if (values) setOverlayValues(this.elementIds[e], values);
+        }
+    }
+
+    /**
+     * Seek: write the state at `time` straight to the store
+     */
+    commit(time: number): void {
+        this.evaluate(time);
+        batch(() => {
+            for (let e = 0; e < this.elementIds.length; e++) {
+                const values = this.collect(e);
+                if (values) updateElement(this.elementIds[e], values, false);
+            }
+        });
+    }
+}
+
+/**
+ * Compile tracks into a keyframe table
+ */
+export function compileKeyframeTable(tracks: KeyframeTrack[]): KeyframeTable {
+    return new KeyframeTable(tracks);
+}
+
+interface ScheduledProperty {
+    value: number | string | undefined;
+    busyUntil: number;
+}
+
+/**
+ * Builds keyframe tracks while tracking each property's scheduled value, so
+ * a tween's start value is whatever the previous tween on that property left.
+ */
+export class KeyframeTrackBuilder {
+    readonly tracks: KeyframeTrack[] = [];
+    private scheduled = new Map<string, Map<string, ScheduledProperty>>();
+    private elementsById: Map<string, DrawingElement> | null = null;
+
+    private getElement(elementId: string): DrawingElement | undefined {
+        if (!this.elementsById) {
+            this.elementsById = new Map(store.elements.map(el => [el.id, el]));
+        }
+        return this.elementsById.get(elementId);
+    }
+
+    private getScheduled(elementId: string, prop: string): ScheduledProperty | null {
+        let props = this.scheduled.get(elementId);
+        if (!props) {
+            props = new Map();
+            this.scheduled.set(elementId, props);
+        }
+        let entry = props.get(prop);
+        if (!entry) {
+            const element = this.getElement(elementId);
+            if (!element) return null;
+            // An interrupted animation may not have committed yet - start from what is on screen
+            const overlay = getOverlayValues(elementId);
+            const value = overlay && prop in overlay
+                ? (overlay as any)[prop]
+                : (element as any)[prop];
+            entry = { value, busyUntil: 0 };
+            props.set(prop, entry);
+        }
+        return entry;
+    }
+
+    /**
+     * Value a property will have once everything scheduled so far has played
+     */
+    valueOf(elementId: string, prop: string): number | string | undefined {
+        return this.getScheduled(elementId, prop)?.value;
+    }
+
+    /**
+     * Schedule a tween of `target` created at `time` (start values are
+     * captured then, like animateElement does).
+     *
+     * @returns the tween's end time, or null when it cannot be compiled
+     *          (unknown element, non-tweenable property, non-hex colour, a
+     *          property that is still being animated at `time`, or per-tween
+     *          callbacks / looping, which a table cannot reproduce)
+     */
+    add(
+        elementId: string,
+        target: ElementAnimationTarget,
+        time: number,
+        config: Pick<AnimationConfig, 'duration' | 'delay' | 'easing' | 'onStart' | 'onComplete' | 'onStop' | 'loop' | 'loopCount' | 'alternate'> & {
+            onUpdate?: unknown;
+        }
+    ): number | null {
+        const keys = Object.keys(target);
+        if (keys.length === 0) return null;
+        if (config.onStart || config.onUpdate || config.onComplete || config.onStop) return null;
+        if (config.loop || config.alternate || (config.loopCount !== undefined && config.loopCount !== 1)) return null;
+
+        const start = time + (config.delay ?? 0);
+        const end = start + Math.max(0, config.duration ?? 0);
+
+        for (const prop of keys) {
+            const to = (target as any)[prop];
+            const entry = this.getScheduled(elementId, prop);
+            if (!entry || entry.value === undefined || entry.busyUntil > time) return null;
+
+            if (NUMERIC_PROPS.has(prop)) {
+                if (typeof entry.value !== 'number' || typeof to !== 'number' || isNaN(to) || isNaN(entry.value)) return null;
+            } else if (COLOR_PROPS.has(prop)) {
+                if (packColor(entry.value) === null || packColor(to) === null) return null;
+            } else {
+                return null;
+            }
+
+            this.tracks.push({
+                elementId,
+                property: prop,
+                from: entry.value,
+                to,
+                start,
+                duration: end - start,
+                easing: config.easing
+            });
+            entry.value = to;
+            entry.busyUntil = end;
+        }
+
+        return end;
+    }
+}
+
+export interface KeyframePlaybackCallbacks {
+    /** Called when an element's last track finishes (after its values are committed) */
+    onElementComplete?: (elementId: string) => void;
+    onComplete?: () => void;
+    onStop?: () => void;
+}
+
+/**
+ * Play a keyframe table as a single engine animation. Each frame is one
+ * table evaluation written to the render overlay; every element is committed
+ * to the store once, when its own tracks finish.
+ *
+ * @returns Animation ID for control
+ */
+export function playKeyframeTable(table: KeyframeTable, callbacks: KeyframePlaybackCallbacks = {}): string {
+    const animId = generateAnimationId('table');
+    const elementCount = table.elementIds.length;
+    const settled = new Uint8Array(elementCount);
+    const props = table.elementIds.map((_, e) => table.getProperties(e));
+
+    table.elementIds.forEach((id, e) => registerElementAnimation(id, animId, props[e]));
+
+    const settle = (e: number) => {
+        settled[e] = 1;
+        const id = table.elementIds[e];
+        unregisterElementAnimation(id, animId);
+        const values = table.valuesAt(e, table.getElementEnd(e));
+        if (values) updateElement(id, values, false);
+        callbacks.onElementComplete?.(id);
+    };
+
+    animationEngine.create(
+        animId,
+        (progress: number) => {
+            const time = progress * table.duration;
+            table.apply(time);
+            for (let e = 0; e < elementCount; e++) {
+                if (!settled[e] && time >= table.getElementEnd(e)) settle(e);
+            }
+        },
+        {
+            duration: Math.max(table.duration, 1),
+            easing: 'linear',
+            onComplete: () => {
+                for (let e = 0; e < elementCount; e++) {
+                    if (!settled[e]) settle(e);
+                }
+                callbacks.onComplete?.();
+            },
+            onStop: () => {
+                // Commit whatever was last rendered for elements still in flight
+                for (let e = 0; e < elementCount; e++) {
+                    if (settled[e]) continue;
+                    const id = table.elementIds[e];
+                    unregisterElementAnimation(id, animId);
+                    const values = takeOverlayValues(id, props[e]);
+                    if (values) updateElement(id, values, false);
+                }
+                callbacks.onStop?.();
+            }
+        }
+    );
+
+    animationEngine.start(animId);
+    return animId;
+}
@@ -1,5 +1,6 @@
 import { store } from "../../store/app-store";
-import { animateElement, fadeIn } from "./element-animator";
+import { animateElement } from "./element-animator";
+import { markDisplayStateApplied, planDisplayStateChange } from "./display-states";
 import type { DisplayState } from "../../types/motion-types";
 
 /**
@@ -8,42 +9,39 @@ import type { DisplayState } from "../../types/motion-types";
  * and triggers smooth animations to transition between them.
  */
 export class MorphAnimator {
+    private static generation = 0;
+
     /**
-     * Morph the current canvas to match the target DisplayState
+     * Morph the current canvas to match the target DisplayState.
+     * `fromStateId` is the state the canvas was last set to; when it is the
+     * source of the target's precompiled plan, only the planned elements
+     * (plus any edited since) are animated.
      */
-    static morphTo(target: DisplayState, duration: number = 800) {
-        const currentElements = store.elements;
-        const targetOverrides = target.overrides;
-
-        // Element IDs from target state
-        const targetIds = Object.keys(targetOverrides);
-
-        // 1. Identify segments
-        const sharedIds = currentElements.filter(el => targetIds.includes(el.id)).map(el => el.id);
-        const enteringIds = targetIds.filter(id => !currentElements.some(el => el.id === id));
-
-        // 2. Animate Shared Elements (The "Magic Move")
-        sharedIds.forEach(id => {
-            const targetProps = targetOverrides[id];
-            if (!targetProps) return;
-
-            animateElement(id, targetProps as any, {
-                duration,
-                easing: 'easeInOutQuad'
-            });
-        });
+    static morphTo(target: DisplayState, duration: number = 800, fromStateId?: string) {
+        const work = planDisplayStateChange(target, fromStateId, store.states, store.elements);
 
-        // 3. Animate Entering Elements (Fade in)
-        enteringIds.forEach(id => {
-            const targetProps = targetOverrides[id];
-            if (!targetProps) return;
+        // The canvas is in the target state only once every animation has
+        // committed; marking it then keeps the morph's own writes out of the
+        // next plan's "edited since" set. Interrupted morphs never mark it.
+        markDisplayStateApplied(undefined);
+        const generation = ++MorphAnimator.generation;
+        let remaining = 0;
+        const settle = () => {
+            if (--remaining === 0 && generation === MorphAnimator.generation) {
+                markDisplayStateApplied(target.id);
+            }
+        };
 
-            // Ensure opacity starts at 0 if it's "entering"
-            fadeIn(id, duration);
-            animateElement(id, targetProps as any, {
+        // Moving, fading and entering elements all animate to their target props
+        for (const id in work) {
+            remaining++;
+            const animId = animateElement(id, work[id] as any, {
                 duration,
-                easing: 'easeInOutQuad'
+                easing: 'easeInOutQuad',
+                onComplete: settle
             });
-        });
+            if (!animId) remaining--;
+        }
+        if (remaining === 0) markDisplayStateApplied(target.id);
     }
 }
@@ -3,6 +3,55 @@ import * as animator from './element-animator';
 import type { ElementAnimation, PropertyAnimation } from '../../types/motion-types';
 import { store, updateElement, setIsPreviewing } from '../../store/app-store';
 import { animationEngine } from './animation-engine';
+import { KeyframeTrackBuilder, compileKeyframeTable, playKeyframeTable, type KeyframeTable } from './keyframe-table';
+
+const NUMERIC_PROPERTY_TARGETS = new Set(['opacity', 'x', 'y', 'width', 'height', 'angle', 'strokeWidth', 'roughness']);
+const COLOR_PROPERTY_TARGETS = new Set(['strokeColor', 'backgroundColor']);
+
+/**
+ * Build the animateElement target for a property animation
+ */
+function getPropertyTarget(anim: PropertyAnimation): ElementAnimationTarget {
+    const target: ElementAnimationTarget = {};
+
+    // Handle numeric or string conversion if needed
+    const val = anim.to;
+    if (NUMERIC_PROPERTY_TARGETS.has(anim.property)) {
+        (target as any)[anim.property] = Number(val);
+    } else if (COLOR_PROPERTY_TARGETS.has(anim.property)) {
+        (target as any)[anim.property] = String(val);
+    }
+    return target;
+}
+
+/**
+ * Schedule a property or rotate animation created at `time` into a keyframe
+ * builder. Returns the animation's end time, or null when it can only run
+ * through the animator closures (presets, paths, morphs, spins, loops).
+ */
+export function scheduleKeyframeAnimation(
+    builder: KeyframeTrackBuilder,
+    elementId: string,
+    anim: ElementAnimation,
+    time: number
+): number | null {
+    // Finite repeats play a single pass (see executeAnimation); infinite loops never end
+    if (anim.repeat === -1) return null;
+
+    let target: ElementAnimationTarget;
+    if (anim.type === 'property') {
+        target = getPropertyTarget(anim);
+    } else if (anim.type === 'rotate') {
+        const angle = builder.valueOf(elementId, 'angle') ?? 0;
+        if (typeof angle !== 'number') return null;
+        const toAngle = anim.relative ? angle + (anim.toAngle * Math.PI / 180) : (anim.toAngle * Math.PI / 180);
+        target = { angle: toAngle };
+    } else {
+        return null;
+    }
+
+    return builder.add(elementId, target, time, anim);
+}
 
 /**
  * Manages the execution of animation sequences for elements
@@ -91,9 +140,45 @@ export class SequenceAnimator {
             }
         };
 
+        // Property/rotate-only sequences play from one precompiled keyframe table
+        const table = this.activeSequences.has(elementId) ? this.compileSequence(elementId, sequence) : null;
+        if (table) {
+            playKeyframeTable(table, { onComplete: onAllComplete });
+            return;
+        }
+
         this.runStep(elementId, sequence, 0, onAllComplete);
     }
 
+    /**
+     * Compile a sequence into a keyframe table using runStep's timing:
+     * 'with-prev' steps start with the step they follow, every other step
+     * starts when the previous main step finishes.
+     * Returns null when any step needs the closure-based runner.
+     */
+    private compileSequence(elementId: string, sequence: ElementAnimation[]): KeyframeTable | null {
+        const builder = new KeyframeTrackBuilder();
+        let mainStart = 0;
+        let mainEnd = 0;
+
+        for (let index = 0; index < sequence.length; index++) {
+            const anim = sequence[index];
+            if (anim.restoreAfter) return null;
+
+            const isWithPrev = index > 0 && anim.trigger === 'with-prev';
+            if (!isWithPrev) mainStart = mainEnd;
+
+            const end = scheduleKeyframeAnimation(builder, elementId, anim, mainStart);
+            if (end === null) return null;
+            if (!isWithPrev) mainEnd = end;
+        }
+
+        const table = compileKeyframeTable(builder.tracks);
+        // Concurrent steps still running when the sequence ends are cut short by
+        // onAllComplete - leave that to the closure-based runner
+        return table.duration > mainEnd ? null : table;
+    }
+
     /**
      * Stop all animations for a specific element
      */
@@ -320,21 +405,7 @@ export class SequenceAnimator {
     }
 
     private animateProperty(elementId: string, anim: PropertyAnimation, config: ElementAnimationConfig): void {
-        // Construct target object
-        const target: ElementAnimationTarget = {};
-
-        // Handle numeric or string conversion if needed
-        const val = anim.to;
-        if (anim.property === 'opacity' || anim.property === 'x' || anim.property === 'y' ||
-            anim.property === 'width' || anim.property === 'height' ||
-            anim.property === 'angle' || anim.property === 'strokeWidth' ||
-            anim.property === 'roughness') {
-            (target as any)[anim.property] = Number(val);
-        } else if (anim.property === 'strokeColor' || anim.property === 'backgroundColor') {
-            (target as any)[anim.property] = String(val);
-        }
-
-        animateElement(elementId, target, config);
+        animateElement(elementId, getPropertyTarget(anim), config);
     }
 }
 
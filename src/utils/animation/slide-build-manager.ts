@@ -1,6 +1,7 @@
 import { store } from '../../store/app-store';
 import type { ElementAnimation } from '../../types/motion-types';
-import { sequenceAnimator } from './sequence-animator';
+import { sequenceAnimator, scheduleKeyframeAnimation } from './sequence-animator';
+import { KeyframeTrackBuilder, compileKeyframeTable, playKeyframeTable } from './keyframe-table';
 import { getElementsOnSlide } from '../slide-utils';
 
 export interface BuildStep {
@@ -79,12 +80,18 @@ class SlideBuildManager {
     playInitial() {
         if (store.appMode !== 'presentation') return;
 
-        // Find all initial animations (on-load)
+        const initialSteps: number[] = [];
         this.buildSequence.forEach((step, idx) => {
             if (step.animation.trigger === 'on-load' && !step.played) {
-                this.executeStep(idx);
+                initialSteps.push(idx);
             }
         });
+
+        // All on-load runs share one precompiled table when possible
+        if (this.playCompiled(initialSteps)) return;
+
+        // Find all initial animations (on-load)
+        initialSteps.forEach(idx => this.executeStep(idx));
     }
 
     /**
@@ -110,12 +117,50 @@ class SlideBuildManager {
         }
 
         this.isPlaying = true;
-        await this.executeStep(nextClickIdx);
+        await (this.playCompiled([nextClickIdx]) ?? this.executeStep(nextClickIdx));
         this.isPlaying = false;
 
         return true;
     }
 
+    /**
+     * Play the runs started by the given steps (each step plus the 'with-prev'
+     * and 'after-prev' steps chained to it) from one precompiled keyframe table.
+     * Timing matches executeStep: 'with-prev' starts with the previous step,
+     * 'after-prev' when the previous step finishes.
+     * Returns null when any step needs the closure-based path.
+     */
+    private playCompiled(heads: number[]): Promise<void> | null {
+        if (heads.length === 0) return null;
+
+        const builder = new KeyframeTrackBuilder();
+        const steps: BuildStep[] = [];
+
+        for (const head of heads) {
+            let start = 0;
+            let end = 0;
+            for (let i = head; i < this.buildSequence.length; i++) {
+                const step = this.buildSequence[i];
+                const trigger = step.animation.trigger;
+                if (i > head && trigger !== 'with-prev' && trigger !== 'after-prev') break;
+                if (step.played) return null;
+
+                if (i > head && trigger === 'after-prev') start = end;
+                const stepEnd = scheduleKeyframeAnimation(builder, step.elementId, step.animation, start);
+                if (stepEnd === null) return null;
+                end = stepEnd;
+                steps.push(step);
+            }
+        }
+
+        steps.forEach(step => step.played = true);
+        const table = compileKeyframeTable(builder.tracks);
+
+        return new Promise((resolve) => {
+            playKeyframeTable(table, { onComplete: resolve, onStop: resolve });
+        });
+    }
+
     private executeStep(index: number): Promise<void> {
         const step = this.buildSequence[index];
         if (!step || step.played) return Promise.resolve();
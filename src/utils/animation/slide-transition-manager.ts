@@ -24,7 +24,7 @@ export interface TransitionOptions {
 /**
  * Calculate the viewState needed to center and fit a slide
  */
-function calculateSlideViewState(slide: Slide): { scale: number; panX: number; panY: number } {
+export function calculateSlideViewState(slide: Slide): { scale: number; panX: number; panY: number } {
     const { width: sW, height: sH } = slide.dimensions;
     const { x: spatialX, y: spatialY } = slide.spatialPosition;
     const margin = 40;
@@ -46,6 +46,7 @@ class SlideTransitionManager {
     private activeAnimationId: string | null = null;
     private isTransitioning: boolean = false;
     private fadeOverlay: HTMLDivElement | null = null;
+    private onEnd: (() => void) | null = null;
 
     /**
      * Check if a transition is currently in progress
@@ -54,6 +55,14 @@ class SlideTransitionManager {
         return this.isTransitioning;
     }
 
+    /**
+     * Called when an animated transition finishes (to redraw without the
+     * transition shortcuts)
+     */
+    setEndCallback(callback: (() => void) | null) {
+        this.onEnd = callback;
+    }
+
     /**
      * Transition from current slide to target slide
      */
@@ -105,6 +114,7 @@ class SlideTransitionManager {
         } finally {
             this.isTransitioning = false;
             this.activeAnimationId = null;
+            if (this.onEnd) this.onEnd();
         }
     }
 
@@ -4,15 +4,25 @@
  */
 
 import { animationEngine } from './animation-engine';
+import { animateElement, type ElementAnimationTarget, type ElementAnimationConfig } from './element-animator';
+import { KeyframeTrackBuilder, compileKeyframeTable, playKeyframeTable, type KeyframeTable } from './keyframe-table';
 
 type AnimationFactory = () => string;
 
+interface TimelineTween {
+    elementId: string;
+    target: ElementAnimationTarget;
+    config: ElementAnimationConfig;
+}
+
 interface TimelineStep {
     type: 'animation' | 'parallel' | 'delay' | 'callback';
     factory?: AnimationFactory;
     factories?: AnimationFactory[];
     delay?: number;
     callback?: () => void;
+    /** Declarative tween - lets the timeline compile to a keyframe table */
+    tween?: TimelineTween;
 }
 
 /**
@@ -35,6 +45,14 @@ interface TimelineStep {
  *   .delay(500)
  *   .add(() => animateElement('el3', { opacity: 0 }, { duration: 300 }))
  *   .play();
+ *
+ * @example
+ * // Declarative tweens compile to a keyframe table: one engine animation,
+ * // and seek() can scrub to any time without replaying
+ * const timeline = new Timeline()
+ *   .to('el1', { x: 100 }, { duration: 300 })
+ *   .to('el2', { opacity: 0 }, { duration: 300, easing: 'easeOutQuad' });
+ * timeline.seek(450);
  */
 export class Timeline {
     private steps: TimelineStep[] = [];
@@ -43,6 +61,8 @@ export class Timeline {
     private isPaused: boolean = false;
     private activeAnimationIds: string[] = [];
     private resolvePromise: (() => void) | null = null;
+    // Table seek() scrubs: start values from the last play(), or the first seek() after a change
+    private compiled: KeyframeTable | null = null;
 
     /**
      * Add a single animation to the timeline
@@ -52,6 +72,17 @@ export class Timeline {
             this.steps.push({ type: 'delay', delay });
         }
         this.steps.push({ type: 'animation', factory });
+        this.compiled = null;
+        return this;
+    }
+
+    /**
+     * Add a declarative tween of an element's properties
+     */
+    to(elementId: string, target: ElementAnimationTarget, config: ElementAnimationConfig): this {
+        const tween = { elementId, target, config };
+        this.steps.push({ type: 'animation', factory: () => animateElement(elementId, target, config), tween });
+        this.compiled = null;
         return this;
     }
 
@@ -60,6 +91,7 @@ export class Timeline {
      */
     parallel(...factories: AnimationFactory[]): this {
         this.steps.push({ type: 'parallel', factories });
+        this.compiled = null;
         return this;
     }
 
@@ -68,6 +100,7 @@ export class Timeline {
      */
     delay(ms: number): this {
         this.steps.push({ type: 'delay', delay: ms });
+        this.compiled = null;
         return this;
     }
 
@@ -76,6 +109,7 @@ export class Timeline {
      */
     call(callback: () => void): this {
         this.steps.push({ type: 'callback', callback });
+        this.compiled = null;
         return this;
     }
 
@@ -98,10 +132,69 @@ export class Timeline {
         this.isPlaying = true;
         this.currentStepIndex = 0;
 
+        // Start values are captured now, from what is on screen
+        const table = this.compile();
+        this.compiled = table;
+
         return new Promise((resolve) => {
             this.resolvePromise = resolve;
-            this.runNextStep();
+            if (table) {
+                this.runCompiled(table);
+            } else {
+                this.runNextStep();
+            }
+        });
+    }
+
+    /**
+     * Compile the timeline into a keyframe table, with start values taken
+     * from the elements as they are now. Only timelines made of `to()` tweens
+     * (without callbacks or looping) and delays compile; anything else
+     * returns null and plays step by step.
+     */
+    compile(): KeyframeTable | null {
+        const builder = new KeyframeTrackBuilder();
+        let time = 0;
+        let compiled: KeyframeTable | null = null;
+
+        const compilable = this.steps.every(step => {
+            if (step.type === 'delay') {
+                time += step.delay ?? 0;
+                return true;
+            }
+            if (!step.tween) return false;
+            const { elementId, target, config } = step.tween;
+            const end = builder.add(elementId, target, time, config);
+            if (end === null) return false;
+            time = end;
+            return true;
         });
+
+        if (compilable && builder.tracks.length > 0) {
+            compiled = compileKeyframeTable(builder.tracks);
+        }
+        return compiled;
+    }
+
+    /**
+     * Jump to a time (ms) in a compiled timeline and apply that state.
+     * O(animated properties) - nothing is replayed.
+     *
+     * @returns false when the timeline cannot be compiled
+     */
+    seek(time: number): boolean {
+        if (!this.compiled) this.compiled = this.compile();
+        const table = this.compiled;
+        if (!table) return false;
+        table.commit(Math.max(0, Math.min(time, table.duration)));
+        return true;
+    }
+
+    /**
+     * Total duration in ms (compiled timelines only, otherwise null)
+     */
+    get duration(): number | null {
+        return (this.compiled ?? this.compile())?.duration ?? null;
     }
 
     /**
@@ -140,6 +233,7 @@ export class Timeline {
     reset(): void {
         this.stop();
         this.currentStepIndex = 0;
+        this.compiled = null;
     }
 
     /**
@@ -197,6 +291,20 @@ export class Timeline {
         }
     }
 
+    /**
+     * Play a compiled timeline as a single engine animation
+     */
+    private runCompiled(table: KeyframeTable): void {
+        const animId = playKeyframeTable(table, {
+            onComplete: () => {
+                this.activeAnimationIds = this.activeAnimationIds.filter(id => id !== animId);
+                this.currentStepIndex = this.steps.length;
+                this.runNextStep();
+            }
+        });
+        this.activeAnimationIds.push(animId);
+    }
+
     /**
      * Run a single animation and wait for completion
      */
@@ -260,3 +260,31 @@ export function refreshBoundLine(
         }
     }
 }
+
+/**
+ * Route the lines bound to `movedIds` against a transient frame (animation
+ * overlay) without writing to the store. Returns `elements` untouched when no
+ * bound line is affected, otherwise a copy with the lines' frame geometry.
+ */
+export function followBoundLines(elements: DrawingElement[], movedIds: Iterable<string>): DrawingElement[] {
+    const indexById = new Map<string, number>();
+    elements.forEach((el, i) => indexById.set(el.id, i));
+
+    const lineIds = new Set<string>();
+    for (const id of movedIds) {
+        const i = indexById.get(id);
+        const el = i === undefined ? undefined : elements[i];
+        el?.boundElements?.forEach(b => lineIds.add(b.id));
+    }
+    if (lineIds.size === 0) return elements;
+
+    let frame = elements;
+    const write = (id: string, updates: Partial<DrawingElement>) => {
+        const i = indexById.get(id);
+        if (i === undefined) return;
+        if (frame === elements) frame = [...elements];
+        frame[i] = { ...frame[i], ...updates };
+    };
+    lineIds.forEach(lineId => refreshBoundLine(lineId, () => frame, write));
+    return frame;
+}
@@ -10,13 +10,17 @@ import type { SpacingGuide } from './spacing';
 import { isLayerVisible } from '../store/app-store';
 import { isElementHiddenByHierarchy } from './hierarchy';
 import { renderElement } from './render-element';
-import { beginElement, endElement, computeElementHash, createCachedRc } from './rough-cache';
+import type { RenderQuality } from '../shapes/base/types';
+import { beginElement, endElement, createCachedRc } from './rough-cache';
+import { getElementVersion } from './element-version';
 import { renderElementOverlays, renderMultiSelectionBox, renderSelectionBox, renderBindingHighlight } from './selection-renderer';
 import { renderSnappingGuides, renderSpacingGuides } from './snap-renderer';
 import { getSelectionBoundingBox } from './handle-detection';
 import { getAnchorPoints } from './anchor-points';
 import { projectMasterPosition } from './slide-utils';
 import { getImage } from './image-cache';
+import { pickBuffer } from './pick-buffer';
+import { slideMembership } from './slide-membership';
 
 // ─── Types ──────────────────────────────────────────────────────────
 
@@ -46,6 +50,10 @@ export interface RenderElementsParams {
     hoveredConnector: { elementId: string; handle: string } | null;
     editingId: string | null;
     canInteractWithElement: (el: DrawingElement) => boolean;
+    /** Per-element render quality; omitted for exports and other offline renders */
+    qualityFor?: (id: string) => RenderQuality;
+    /** Layers whose background is already on the canvas (composited slide bitmap) */
+    skipLayerBackgrounds?: ReadonlySet<string>;
 }
 
 export interface SelectionOverlayParams {
@@ -85,10 +93,15 @@ export function computeViewportBounds(
     return { minX, maxX, minY, maxY, bufferX, bufferY };
 }
 
+/**
+ * Elements that need animation states this frame. In slide documents this
+ * reads `slideMembership`, which must be synced with the store elements
+ * `elements` derives from (directly or through the animation overlay).
+ */
 export function cullElementsForAnimation(
     elements: DrawingElement[],
     slides: any[],
-    layers: any[],
+    _layers: any[],
     docType: string,
     activeSlideIndex: number,
     vp: ViewportBounds
@@ -96,25 +109,22 @@ export function cullElementsForAnimation(
     if (docType === 'slides' && slides.length > 0) {
         const activeSlide = slides[activeSlideIndex];
         if (activeSlide) {
-            const { x: sX, y: sY } = activeSlide.spatialPosition;
-            const { width: sW, height: sH } = activeSlide.dimensions;
-            const BUFFER = 200;
-
-            const masterLayerIds = new Set(layers.filter(l => l.isMaster).map(l => l.id));
-            const primaryElements = elements.filter(el => {
-                if (masterLayerIds.has(el.layerId)) return true;
-                const cx = el.x + el.width / 2;
-                const cy = el.y + el.height / 2;
-                return cx >= sX - BUFFER && cx <= sX + sW + BUFFER &&
-                    cy >= sY - BUFFER && cy <= sY + sH + BUFFER;
-            });
-
-            const centerIds = new Set(primaryElements.map(el => el.orbitCenterId).filter(Boolean));
-            const centerElements = elements.filter(el => centerIds.has(el.id));
-
-            return primaryElements.length === elements.length
-                ? elements
-                : [...new Set([...primaryElements, ...centerElements])];
+            // Master layers plus everything near the slide, from the maintained index
+            const master = slideMembership.masterElements();
+            const nearby = slideMembership.nearbyOf(activeSlide.id);
+            if (master.length + nearby.length === elements.length) return elements;
+
+            const picked = new Set<DrawingElement>();
+            for (const i of master) if (elements[i]) picked.add(elements[i]);
+            for (const i of nearby) if (elements[i]) picked.add(elements[i]);
+
+            // Orbit centres drive their satellites' positions
+            for (const el of Array.from(picked)) {
+                if (!el.orbitCenterId) continue;
+                const center = elements[slideMembership.positionOf(el.orbitCenterId)];
+                if (center) picked.add(center);
+            }
+            return Array.from(picked);
         }
     }
 
@@ -513,7 +523,7 @@ export function renderLayersAndElements(
         if (!isLayerVisible(layer.id)) return;
 
         // Layer background
-        if (layer.backgroundColor && layer.backgroundColor !== 'transparent') {
+        if (layer.backgroundColor && layer.backgroundColor !== 'transparent' && !params.skipLayerBackgrounds?.has(layer.id)) {
             ctx.save();
             ctx.globalAlpha = layer.opacity;
             ctx.fillStyle = layer.backgroundColor;
@@ -564,9 +574,12 @@ export function renderLayersAndElements(
             const needsTextVar = el.type === 'text' && el.text && el.text.startsWith('=');
 
             // Only create a copy when we need to mutate (animation, master projection, or text variables)
+            // Every culled element gets a state; only copy when it actually differs
+            const isAnimated = !!animState &&
+                (animState.x !== el.x || animState.y !== el.y || animState.angle !== (el.angle || 0));
             let renderedEl: DrawingElement;
-            if (animState) {
-                renderedEl = { ...el, x: animState.x, y: animState.y, angle: animState.angle };
+            if (isAnimated) {
+                renderedEl = { ...el, x: animState!.x, y: animState!.y, angle: animState!.angle };
             } else if (needsMasterProjection || needsTextVar) {
                 renderedEl = { ...el };
             } else {
@@ -586,13 +599,7 @@ export function renderLayersAndElements(
             // Strict slide isolation
             if (docType === 'slides' && !isMasterLayer) {
                 const activeSlide = slides[activeSlideIndex];
-                if (activeSlide) {
-                    const { x: sX, y: sY } = activeSlide.spatialPosition;
-                    const { width: sW, height: sH } = activeSlide.dimensions;
-                    const cx = renderedEl.x + renderedEl.width / 2;
-                    const cy = renderedEl.y + renderedEl.height / 2;
-                    if (!(cx >= sX && cx <= sX + sW && cy >= sY && cy <= sY + sH)) return;
-                }
+                if (activeSlide && slideMembership.slideOf(renderedEl) !== activeSlide.id) return;
             }
 
             // Dynamic text variables
@@ -608,12 +615,21 @@ export function renderLayersAndElements(
                 }
             }
 
+            if (params.canInteractWithElement(el)) pickBuffer.record(el.id, renderedEl);
+
             if (renderedEl.type !== 'text' || editingId !== renderedEl.id) {
                 const layerOpacity = (layer?.opacity ?? 1);
-                const shouldCache = !animState;
-                if (shouldCache) beginElement(renderedEl.id, computeElementHash(renderedEl));
-                renderElement(cachedRc, ctx, renderedEl, isDarkMode, layerOpacity);
-                if (shouldCache) endElement();
+                const quality = params.qualityFor ? params.qualityFor(el.id) : 'full';
+                if (quality === 'draft') {
+                    // Draft silhouettes never touch RoughJS - leave the cache alone
+                    renderElement(cachedRc, ctx, renderedEl, isDarkMode, layerOpacity, quality, scale);
+                } else {
+                    // O(1) validation: (element, version, position) - spin only changes
+                    // the canvas transform, orbits change position and miss
+                    beginElement(el, renderedEl, getElementVersion(el.id));
+                    renderElement(cachedRc, ctx, renderedEl, isDarkMode, layerOpacity, quality, scale);
+                    endElement();
+                }
             }
 
             renderElementOverlays(ctx, el, renderedEl, {
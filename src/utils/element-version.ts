@@ -0,0 +1,82 @@
+/**
+ * Element Versions
+ * Monotonic per-element change counters. The store's in-place mutators bump
+ * them; render caches validate against (element, version) instead of hashing
+ * the element's properties every frame.
+ */
+
+// Recent bumps kept for getElementsChangedSince
+const LOG_LIMIT = 1024;
+
+let clock = 0;
+let epoch = 0;
+const versions = new Map<string, number>();
+let log: { version: number; ids: readonly string[] }[] = [];
+// Bumps at or before this clock value have dropped out of the log
+let logFloor = 0;
+
+function record(version: number, ids: readonly string[]) {
+    log.push({ version, ids });
+    if (log.length > LOG_LIMIT) {
+        const dropped = log.length - LOG_LIMIT / 2;
+        logFloor = log[dropped - 1].version;
+        log = log.slice(dropped);
+    }
+}
+
+/**
+ * Mark an element as changed
+ */
+export function bumpElementVersion(id: string): void {
+    versions.set(id, ++clock);
+    record(clock, [id]);
+}
+
+/**
+ * Mark several elements as changed
+ */
+export function bumpElementVersions(ids: Iterable<string>): void {
+    const version = ++clock;
+    const list = Array.from(ids);
+    for (const id of list) versions.set(id, version);
+    record(version, list);
+}
+
+/**
+ * Mark every element as changed (undo/redo, document load)
+ */
+export function bumpAllElementVersions(): void {
+    epoch = ++clock;
+    versions.clear();
+    log = [];
+    logFloor = epoch;
+}
+
+/**
+ * Current version of an element - O(1), no allocation
+ */
+export function getElementVersion(id: string): number {
+    return versions.get(id) ?? epoch;
+}
+
+/**
+ * Current value of the version clock - a cheap "nothing changed since" marker
+ */
+export function getElementVersionClock(): number {
+    return clock;
+}
+
+/**
+ * Ids changed after `since` (a value of getElementVersionClock), or null when
+ * everything must be treated as changed (undo/redo, document load, or more
+ * changes than the log keeps). Cost is proportional to the changes since,
+ * not to the number of elements.
+ */
+export function getElementsChangedSince(since: number): string[] | null {
+    if (epoch > since || logFloor > since) return null;
+    const changed = new Set<string>();
+    for (let i = log.length - 1; i >= 0 && log[i].version > since; i--) {
+        for (const id of log[i].ids) changed.add(id);
+    }
+    return Array.from(changed);
+}
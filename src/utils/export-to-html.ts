@@ -1,64 +1,65 @@
 import type { SlideDocument } from "../types/slide-types";
 import { PLAYER_JS, PLAYER_CSS } from "../assets/player-assets";
+import { escapeXml } from "./svg-writer";
+import { splitPresentation, escapeScriptJson, PRESENTATION_RUNTIME } from "./presentation-chunks";
+
+interface EncodedAsset {
+    hash: string;
+    dataURL: string;
+}
+
+const blobToDataURL = (blob: Blob): Promise<string> => new Promise((resolve, reject) => {
+    const reader = new FileReader();
+    reader.onloadend = () => resolve(reader.result as string);
+    reader.onerror = reject;
+    reader.readAsDataURL(blob);
+});
 
 /**
- * Converts a Blob URL to a Base64 string
+ * Fetches an image source and returns its content hash and Data URL
  */
-const blobUrlToBase64 = async (url: string): Promise<string> => {
+const encodeAsset = async (url: string): Promise<EncodedAsset> => {
     try {
-        const response = await fetch(url);
-        const blob = await response.blob();
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
-            reader.onloadend = () => resolve(reader.result as string);
-            reader.onerror = reject;
-            reader.readAsDataURL(blob);
-        });
+        const blob = await (await fetch(url)).blob();
+        const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+        const hash = Array.from(new Uint8Array(digest).subarray(0, 12), b => b.toString(16).padStart(2, '0')).join('');
+        const dataURL = url.startsWith('data:') ? url : await blobToDataURL(blob);
+        return { hash, dataURL };
     } catch (e) {
-        console.warn(`Failed to convert ${url} to base64`, e);
-        return url; // Return original if failure
+        console.warn(`Failed to embed ${url}`, e);
+        // Keep the original source, hashed by URL so it still dedupes
+        let h = 0;
+        for (let i = 0; i < url.length; i++) h = (Math.imul(h, 31) + url.charCodeAt(i)) | 0;
+        return { hash: `url${(h >>> 0).toString(16)}`, dataURL: url };
     }
 };
 
-/**
- * Traverses the document and embeds all images as Base64
- */
-const embedImages = async (doc: SlideDocument): Promise<SlideDocument> => {
-    // Clone doc to avoid mutating original
-    const newDoc = JSON.parse(JSON.stringify(doc));
-
-    // 1. Process Elements (Image shapes)
-    for (const el of newDoc.elements) {
-        if (el.type === 'image' && el.src && el.src.startsWith('blob:')) {
-            el.src = await blobUrlToBase64(el.src);
-        }
-    }
-
-    // 2. Process Slide Backgrounds (if they use images)
-    for (const slide of newDoc.slides) {
-        if (slide.background?.type === 'image' && slide.background.url?.startsWith('blob:')) {
-            slide.background.url = await blobUrlToBase64(slide.background.url);
-        }
+export const exportToHtml = async (doc: SlideDocument, filename: string) => {
+    // An embedded player older than the chunked format still plays the export
+    // (through the __PRESENTATION_DATA__ getter) but assembles the whole deck up front
+    if (import.meta.env.DEV && !PLAYER_JS.includes('__PRESENTATION_CHUNKS__')) {
+        console.warn('src/assets/player-assets.ts predates the chunked export format - run `npm run build:player`');
     }
 
-    return newDoc;
-};
-
-export const exportToHtml = async (doc: SlideDocument, filename: string) => {
-    // 1. Prepare data with embedded assets
-    const processedDoc = await embedImages(doc);
+    // 1. Split into shell + per-slide chunks (synchronous snapshot), then
+    //    encode every distinct image in parallel, deduplicated by content hash
+    const { manifest, chunks, assetUrls } = splitPresentation(doc);
+    const encoded = await Promise.all(assetUrls.map(encodeAsset));
+    const assets = new Map<string, string>();
+    for (const asset of encoded) assets.set(asset.hash, asset.dataURL);
+    const manifestJson = JSON.stringify({ ...manifest, assets: encoded.map(a => a.hash) });
     const flags = {
         isStandalone: true,
         generatedAt: new Date().toISOString()
     };
 
-    // 2. Construct HTML
-    const html = `<!DOCTYPE html>
+    // 2. Construct HTML - chunks and assets are separate Blob parts, never one string
+    const head = `<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>${processedDoc.metadata.name || 'Presentation'} - Yappy</title>
+    <title>${escapeXml(doc.metadata.name || 'Presentation')} - Yappy</title>
     <style>
         /* Reset and Base Styles */
         body, html { margin: 0; padding: 0; width: 100%; height: 100%; overflow: hidden; }
@@ -80,8 +81,11 @@ export const exportToHtml = async (doc: SlideDocument, filename: string) => {
     <div id="loader">Loading Presentation...</div>
     <div id="root"></div>
 
+    <script type="application/json" id="yappy-manifest">${escapeScriptJson(manifestJson)}</script>
+`;
+    const tail = `
     <script>
-        window.__PRESENTATION_DATA__ = ${JSON.stringify(processedDoc)};
+        ${PRESENTATION_RUNTIME}
         window.__YAPPY_FLAGS__ = ${JSON.stringify(flags)};
         
         // Hide loader when app mounts (can be triggered by app)
@@ -101,8 +105,17 @@ export const exportToHtml = async (doc: SlideDocument, filename: string) => {
 </body>
 </html>`;
 
+    const parts: string[] = [head];
+    chunks.forEach((chunk, i) => {
+        parts.push(`    <script type="application/json" id="yappy-slide-${i}">${escapeScriptJson(chunk)}</script>\n`);
+    });
+    assets.forEach((dataURL, hash) => {
+        parts.push(`    <script type="application/json" id="yappy-asset-${hash}">${escapeScriptJson(JSON.stringify(dataURL))}</script>\n`);
+    });
+    parts.push(tail);
+
     // 3. Download
-    const blob = new Blob([html], { type: 'text/html' });
+    const blob = new Blob(parts, { type: 'text/html' });
     const url = URL.createObjectURL(blob);
     const a = document.createElement('a');
     a.href = url;
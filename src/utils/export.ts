@@ -1,11 +1,26 @@
 import { store } from "../store/app-store";
 import { renderElement } from "./render-element";
 import rough from 'roughjs/bin/rough';
-import { jsPDF } from "jspdf";
-import PptxGenJS from "pptxgenjs";
-
+import type { Options } from 'roughjs/bin/core';
+import type { DrawingElement } from "../types";
+import { SvgWriter, escapeXml } from "./svg-writer";
+import { shapeRegistry } from "../shapes/shape-registry";
+import { slideMembership } from "./slide-membership";
+
+// PDF/PPTX backends are fetched on demand (see preloadExportBackends)
+const loadJsPdf = () => import("jspdf").then(m => m.jsPDF);
+const loadPptxGen = () => import("pptxgenjs").then(m => m.default);
+
+/**
+ * Start fetching the export backends, e.g. when the Export dialog opens
+ */
+export const preloadExportBackends = () => {
+    loadJsPdf();
+    loadPptxGen();
+};
 
 export const exportToPng = async (scale: number, background: boolean, onlySelected: boolean) => {
+    await shapeRegistry.preloadAll();
     let elements = store.elements;
     if (onlySelected) {
         if (store.selection.length === 0) return; // Nothing to export
@@ -56,7 +71,32 @@ export const exportToPng = async (scale: number, background: boolean, onlySelect
     link.click();
 };
 
-export const exportToSvg = (onlySelected: boolean) => {
+export interface SvgExportOptions {
+    /** Decimals kept in coordinates (default 2) */
+    precision?: number;
+}
+
+/**
+ * Dedupe key for an element's drawing in local coordinates. Same key means
+ * identical output (RoughJS is deterministic for a given seed), so repeats
+ * are written once as a <symbol>. Free-form point data is not keyed, and
+ * icon families (infra, cloud-infra, sketchnote) have no SVG output to key.
+ */
+const svgInstanceKey = (el: DrawingElement, options: Options): string | null => {
+    const style = `${options.seed}|${options.roughness}|${options.stroke}|${options.strokeWidth}|${options.fill}|${options.fillStyle}|${options.strokeLineDash}`;
+    if (el.type === 'rectangle' || el.type === 'circle') {
+        return `${el.type}|${el.width}|${el.height}|${style}`;
+    }
+    if ((el.type === 'line' || el.type === 'arrow') && !(el.points && el.points.length > 0)) {
+        return `${el.type}|${el.width}|${el.height}|${el.startArrowhead}|${el.endArrowhead}|${el.startArrowheadSize}|${el.endArrowheadSize}|${style}`;
+    }
+    if (el.type === 'image' && el.dataURL) {
+        return `image|${el.width}|${el.height}|${el.dataURL}`;
+    }
+    return null;
+};
+
+export const exportToSvg = (onlySelected: boolean, svgOptions: SvgExportOptions = {}) => {
     let elements = store.elements;
     if (onlySelected) {
         if (store.selection.length === 0) return;
@@ -77,76 +117,63 @@ export const exportToSvg = (onlySelected: boolean) => {
     const width = maxX - minX + padding * 2;
     const height = maxY - minY + padding * 2;
 
-    const svg = document.createElementNS('http://www.w3.org/2000/svg', 'svg');
-    svg.setAttribute('width', `${width}`);
-    svg.setAttribute('height', `${height}`);
-    svg.setAttribute('viewBox', `0 0 ${width} ${height}`);
-    svg.style.backgroundColor = '#ffffff'; // Optional: white bg
-
-    const rc = rough.svg(svg);
-
-    // Group for Translation
-    const g = document.createElementNS('http://www.w3.org/2000/svg', 'g');
-    g.setAttribute('transform', `translate(${-minX + padding}, ${-minY + padding})`);
-    svg.appendChild(g);
+    // Drawables are generated without a DOM and streamed as strings
+    const generator = rough.generator();
+    const writer = new SvgWriter(generator, svgOptions.precision ?? 2);
+    const q = (n: number) => writer.num(n);
+
+    const optionsFor = (el: DrawingElement): Options => ({
+        seed: el.seed,
+        roughness: el.roughness,
+        stroke: el.strokeColor,
+        strokeWidth: el.strokeWidth,
+        fill: el.backgroundColor === 'transparent' ? undefined : el.backgroundColor,
+        fillStyle: el.fillStyle,
+        strokeLineDash: el.strokeStyle === 'dashed' ? [10, 10] : (el.strokeStyle === 'dotted' ? [5, 10] : undefined),
+    });
 
-    elements.forEach(el => {
-        // Rotation Group
-        let node: SVGElement | null = null;
-
-        // Options
-        const options: any = {
-            seed: el.seed,
-            roughness: el.roughness,
-            stroke: el.strokeColor,
-            strokeWidth: el.strokeWidth,
-            fill: el.backgroundColor === 'transparent' ? undefined : el.backgroundColor,
-            fillStyle: el.fillStyle,
-            strokeLineDash: el.strokeStyle === 'dashed' ? [10, 10] : (el.strokeStyle === 'dotted' ? [5, 10] : undefined),
-        };
+    // Pass 1: count repeated drawings
+    const keys = elements.map(el => svgInstanceKey(el, optionsFor(el)));
+    const counts = new Map<string, number>();
+    for (const key of keys) {
+        if (key) counts.set(key, (counts.get(key) ?? 0) + 1);
+    }
 
+    // Pass 2: each element is drawn in local coordinates (origin at el.x, el.y)
+    // and positioned by its group transform
+    const renderLocal = (el: DrawingElement, options: Options): string => {
         if (el.type === 'rectangle') {
-            node = rc.rectangle(el.x, el.y, el.width, el.height, options);
+            return writer.drawables([generator.rectangle(0, 0, el.width, el.height, options)]);
         } else if (el.type === 'circle') {
-            node = rc.ellipse(el.x + el.width / 2, el.y + el.height / 2, Math.abs(el.width), Math.abs(el.height), options);
+            return writer.drawables([generator.ellipse(el.width / 2, el.height / 2, Math.abs(el.width), Math.abs(el.height), options)]);
         } else if (el.type === 'line' || el.type === 'arrow') {
-            const endX = el.x + el.width;
-            const endY = el.y + el.height;
+            const endX = el.width;
+            const endY = el.height;
+            const drawables = [generator.line(0, 0, endX, endY, options)];
 
             if (el.type === 'arrow') {
-                const arrowG = document.createElementNS('http://www.w3.org/2000/svg', 'g');
-                arrowG.appendChild(rc.line(el.x, el.y, endX, endY, options));
-
                 const angle = Math.atan2(el.height, el.width);
                 const startHeadLen = el.startArrowheadSize || 15;
                 const endHeadLen = el.endArrowheadSize || 15;
 
                 if (el.startArrowhead) {
-                    const p1 = { x: el.x - startHeadLen * Math.cos(angle + Math.PI - Math.PI / 6), y: el.y - startHeadLen * Math.sin(angle + Math.PI - Math.PI / 6) };
-                    const p2 = { x: el.x - startHeadLen * Math.cos(angle + Math.PI + Math.PI / 6), y: el.y - startHeadLen * Math.sin(angle + Math.PI + Math.PI / 6) };
-                    arrowG.appendChild(rc.line(el.x, el.y, p1.x, p1.y, options));
-                    arrowG.appendChild(rc.line(el.x, el.y, p2.x, p2.y, options));
+                    const p1 = { x: -startHeadLen * Math.cos(angle + Math.PI - Math.PI / 6), y: -startHeadLen * Math.sin(angle + Math.PI - Math.PI / 6) };
+                    const p2 = { x: -startHeadLen * Math.cos(angle + Math.PI + Math.PI / 6), y: -startHeadLen * Math.sin(angle + Math.PI + Math.PI / 6) };
+                    drawables.push(generator.line(0, 0, p1.x, p1.y, options));
+                    drawables.push(generator.line(0, 0, p2.x, p2.y, options));
                 }
 
                 if (el.endArrowhead || (!el.startArrowhead && !el.endArrowhead)) { // Default to end arrow if none specified for legacy
                     const p1 = { x: endX - endHeadLen * Math.cos(angle - Math.PI / 6), y: endY - endHeadLen * Math.sin(angle - Math.PI / 6) };
                     const p2 = { x: endX - endHeadLen * Math.cos(angle + Math.PI / 6), y: endY - endHeadLen * Math.sin(angle + Math.PI / 6) };
-                    arrowG.appendChild(rc.line(endX, endY, p1.x, p1.y, options));
-                    arrowG.appendChild(rc.line(endX, endY, p2.x, p2.y, options));
+                    drawables.push(generator.line(endX, endY, p1.x, p1.y, options));
+                    drawables.push(generator.line(endX, endY, p2.x, p2.y, options));
                 }
-                node = arrowG;
-            } else {
-                node = rc.line(el.x, el.y, endX, endY, options);
             }
+            return writer.drawables(drawables);
         } else if (el.type === 'text' && el.text) {
-            const textText = document.createElementNS('http://www.w3.org/2000/svg', 'text');
-            textText.textContent = el.text;
-            textText.setAttribute('x', `${el.x}`);
-            textText.setAttribute('y', `${el.y + (el.fontSize || 28)}`); // Baseline
-            textText.setAttribute('fill', el.strokeColor);
-            textText.setAttribute('font-family', 'sans-serif');
-            textText.setAttribute('font-size', `${el.fontSize || 28}px`);
-            node = textText;
+            const fontSize = el.fontSize || 28;
+            return `<text x="0" y="${q(fontSize)}" fill="${escapeXml(el.strokeColor)}" font-family="sans-serif" font-size="${q(fontSize)}px">${escapeXml(el.text)}</text>`; // Baseline
         } else if ((el.type === 'fineliner' || el.type === 'inkbrush' || el.type === 'marker') && el.points) {
             // Helper to normalize
             let points: { x: number, y: number }[] = [];
@@ -158,36 +185,38 @@ export const exportToSvg = (onlySelected: boolean) => {
             }
             if (points.length > 1) {
                 // Simplified SVG Path for these tools
-                // Ideally we duplicate the exact bezier logic from renderElement.ts, 
-                // but for now a simple polyline or standard curve is better than nothing.
-                // Or better: use roughjs linearPath or curve
-                const absPoints = points.map(p => [el.x + p.x, el.y + p.y] as [number, number]);
-                node = rc.curve(absPoints, options);
+                // Ideally we duplicate the exact bezier logic from renderElement.ts,
+                // but a roughjs curve is better than nothing.
+                return writer.drawables([generator.curve(points.map(p => [p.x, p.y] as [number, number]), options)]);
             }
         } else if (el.type === 'image' && el.dataURL) {
-            const image = document.createElementNS('http://www.w3.org/2000/svg', 'image');
-            image.setAttribute('href', el.dataURL);
-            image.setAttribute('x', `${el.x}`);
-            image.setAttribute('y', `${el.y}`);
-            image.setAttribute('width', `${el.width}`);
-            image.setAttribute('height', `${el.height}`);
-            node = image;
+            return `<image href="${escapeXml(el.dataURL)}" x="0" y="0" width="${q(el.width)}" height="${q(el.height)}"/>`;
         }
+        return '';
+    };
 
-        if (node) {
-            node.setAttribute('opacity', `${(el.opacity ?? 100) / 100}`);
-            if (el.angle) {
-                const cx = el.x + el.width / 2;
-                const cy = el.y + el.height / 2;
-                node.setAttribute('transform', `rotate(${el.angle * (180 / Math.PI)}, ${cx}, ${cy})`);
-            }
-            g.appendChild(node);
+    writer.write(`<g transform="translate(${q(-minX + padding)}, ${q(-minY + padding)})">`);
+
+    elements.forEach((el, i) => {
+        const options = optionsFor(el);
+        const key = keys[i];
+        // Unkeyed content is rendered up front so undrawable elements are skipped
+        const inline = key ? null : renderLocal(el, options);
+        if (inline === '') return;
+
+        let transform = `translate(${q(el.x)}, ${q(el.y)})`;
+        if (el.angle) {
+            transform += ` rotate(${q(el.angle * (180 / Math.PI))}, ${q(el.width / 2)}, ${q(el.height / 2)})`;
         }
+        writer.write(`<g transform="${transform}" opacity="${(el.opacity ?? 100) / 100}">`);
+        if (inline !== null) writer.write(inline);
+        else writer.instance(key, counts, () => renderLocal(el, options));
+        writer.write('</g>');
     });
 
-    const s = new XMLSerializer();
-    const str = s.serializeToString(svg);
-    const blob = new Blob([str], { type: 'image/svg+xml' });
+    writer.write('</g>');
+
+    const blob = writer.toBlob(width, height, '#ffffff'); // Optional: white bg
     const url = URL.createObjectURL(blob);
     const link = document.createElement('a');
     link.download = 'yappy_drawing.svg';
@@ -199,11 +228,15 @@ export const exportToPdf = async (scale: number, background: boolean, onlySelect
     const allElements = store.elements;
     if (allElements.length === 0) return;
 
+    const [jsPDF] = await Promise.all([loadJsPdf(), shapeRegistry.preloadAll()]);
+
     const isSlides = store.docType === 'slides' && store.slides.length > 0 && !onlySelected;
 
     if (isSlides) {
         // Multi-page: one page per slide
         const sortedSlides = [...store.slides].sort((a, b) => a.order - b.order);
+        slideMembership.sync(store.elements, store.slides, store.layers);
+        const elementsBySlide = slideMembership.groupBySlide(allElements);
         const firstSlide = sortedSlides[0];
         const { width: pw, height: ph } = firstSlide.dimensions;
         const orientation = pw >= ph ? 'landscape' : 'portrait';
@@ -220,12 +253,8 @@ export const exportToPdf = async (scale: number, background: boolean, onlySelect
             const { width: sW, height: sH } = slide.dimensions;
             const { x: sX, y: sY } = slide.spatialPosition;
 
-            // Filter elements whose center falls on this slide
-            const slideElements = allElements.filter(el => {
-                const cx = el.x + el.width / 2;
-                const cy = el.y + el.height / 2;
-                return cx >= sX && cx <= sX + sW && cy >= sY && cy <= sY + sH;
-            });
+            // Elements whose center falls on this slide
+            const slideElements = elementsBySlide.get(slide.id) ?? [];
 
             // Create offscreen canvas
             const canvas = document.createElement('canvas');
@@ -320,12 +349,15 @@ export const exportToPptx = async (scale: number, background: boolean, onlySelec
     const allElements = store.elements;
     if (allElements.length === 0) return;
 
+    const [PptxGenJS] = await Promise.all([loadPptxGen(), shapeRegistry.preloadAll()]);
     const pptx = new PptxGenJS();
 
     const isSlides = store.docType === 'slides' && store.slides.length > 0 && !onlySelected;
 
     if (isSlides) {
         const sortedSlides = [...store.slides].sort((a, b) => a.order - b.order);
+        slideMembership.sync(store.elements, store.slides, store.layers);
+        const elementsBySlide = slideMembership.groupBySlide(allElements);
 
         // Set presentation size from first slide's aspect ratio (inches, 10" base width)
         const firstSlide = sortedSlides[0];
@@ -338,12 +370,8 @@ export const exportToPptx = async (scale: number, background: boolean, onlySelec
             const { width: sW, height: sH } = slide.dimensions;
             const { x: sX, y: sY } = slide.spatialPosition;
 
-            // Filter elements whose center falls on this slide
-            const slideElements = allElements.filter(el => {
-                const cx = el.x + el.width / 2;
-                const cy = el.y + el.height / 2;
-                return cx >= sX && cx <= sX + sW && cy >= sY && cy <= sY + sH;
-            });
+            // Elements whose center falls on this slide
+            const slideElements = elementsBySlide.get(slide.id) ?? [];
 
             // Render to offscreen canvas
             const canvas = document.createElement('canvas');
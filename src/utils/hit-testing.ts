@@ -16,6 +16,7 @@ import {
 } from './geometry';
 import { normalizePoints } from './render-element';
 import { isElementHiddenByHierarchy } from './hierarchy';
+import { getShapeGeometry, getShapeOutline } from './shape-geometry';
 
 /**
  * Inverse-rotate a point around a center by the given angle.
@@ -25,36 +26,33 @@ function unrotatePoint(x: number, y: number, cx: number, cy: number, angle: numb
 }
 
 /**
- * Tests whether a point (x, y) in world coordinates hits the given element.
- *
- * Uses a two-phase approach:
- *  1. Broad-phase: axis-aligned bounding box (with rotation unrolled)
- *  2. Narrow-phase: shape-specific geometry test
- *
- * @param el         The element to test
- * @param x          World x-coordinate of the test point
- * @param y          World y-coordinate of the test point
- * @param threshold  Hit tolerance in world units
- * @param elements   Full element list (for hierarchy visibility checks)
- * @param elementMap Optional pre-built id→element map for hierarchy lookups
+ * Narrow phase for closed polygonal shapes against the shared geometry cache
+ * (inside the outline, or within threshold of an edge). Curved, multi-part
+ * and custom-point shapes keep the bounding box result.
  */
-export function hitTestElement(
-    el: DrawingElement,
-    x: number,
-    y: number,
-    threshold: number,
-    elements: DrawingElement[],
-    elementMap?: Map<string, DrawingElement>
-): boolean {
-    if (isElementHiddenByHierarchy(el, elements, elementMap)) return false;
+function hitTestOutline(el: DrawingElement, p: { x: number; y: number }, threshold: number): boolean {
+    if (el.points && el.points.length > 0) return true;
+    const geometry = getShapeGeometry(el);
+    if (!geometry || geometry.type !== 'points' || geometry.isClosed === false) return true;
 
-    // Transform point to local non-rotated space
-    const cx = el.x + el.width / 2;
-    const cy = el.y + el.height / 2;
-    const p = unrotatePoint(x, y, cx, cy, el.angle || 0);
+    const outline = getShapeOutline(el);
+    if (!outline || outline.points.length < 3) return true;
 
-    // Check if inside bounding box (broad phase)
-    // Normalize bounds to handle negative width/height
+    // Geometry is centered on the element
+    const local = { x: p.x - (el.x + el.width / 2), y: p.y - (el.y + el.height / 2) };
+    const pts = outline.points;
+    if (isPointInPolygon(local, pts)) return true;
+    for (let i = 0; i < pts.length; i++) {
+        if (distanceToSegment(local, pts[i], pts[(i + 1) % pts.length]) <= threshold) return true;
+    }
+    return false;
+}
+
+/**
+ * Local (non-rotated) broad-phase bounds of an element, normalized for
+ * negative width/height and expanded for extruding 3D shapes.
+ */
+export function getHitBounds(el: DrawingElement): { x1: number; y1: number; x2: number; y2: number } {
     let x1 = Math.min(el.x, el.x + el.width);
     let x2 = Math.max(el.x, el.x + el.width);
     let y1 = Math.min(el.y, el.y + el.height);
@@ -93,6 +91,41 @@ export function hitTestElement(
         y2 = Math.max(y2, bY1, bY2);
     }
 
+    return { x1, y1, x2, y2 };
+}
+
+/**
+ * Tests whether a point (x, y) in world coordinates hits the given element.
+ *
+ * Uses a two-phase approach:
+ *  1. Broad-phase: axis-aligned bounding box (with rotation unrolled)
+ *  2. Narrow-phase: shape-specific geometry test
+ *
+ * @param el         The element to test
+ * @param x          World x-coordinate of the test point
+ * @param y          World y-coordinate of the test point
+ * @param threshold  Hit tolerance in world units
+ * @param elements   Full element list (for hierarchy visibility checks)
+ * @param elementMap Optional pre-built id→element map for hierarchy lookups
+ */
+export function hitTestElement(
+    el: DrawingElement,
+    x: number,
+    y: number,
+    threshold: number,
+    elements: DrawingElement[],
+    elementMap?: Map<string, DrawingElement>
+): boolean {
+    if (isElementHiddenByHierarchy(el, elements, elementMap)) return false;
+
+    // Transform point to local non-rotated space
+    const cx = el.x + el.width / 2;
+    const cy = el.y + el.height / 2;
+    const p = unrotatePoint(x, y, cx, cy, el.angle || 0);
+
+    // Check if inside bounding box (broad phase)
+    const { x1, y1, x2, y2 } = getHitBounds(el);
+
     if (p.x < x1 - threshold || p.x > x2 + threshold ||
         p.y < y1 - threshold || p.y > y2 + threshold) {
         return false;
@@ -240,9 +273,8 @@ export function hitTestElement(
         el.type === 'magnet' || el.type === 'scale' || el.type === 'seedling' ||
         el.type === 'tree' || el.type === 'mountain'
     ) {
-        // For these shapes, rely on bounding box hit test (passed above)
-        // or implement detailed geometry check if needed
-        return true;
+        // Bounding box passed above; polygonal outlines get an exact check
+        return hitTestOutline(el, p, threshold);
 
     }
 
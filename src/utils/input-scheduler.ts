@@ -0,0 +1,116 @@
+/**
+ * Input Scheduler
+ * Coalesces pointer moves into at most one tool update per animation frame.
+ * High-rate mice and pens deliver several events per frame, and each one used
+ * to run snapping, spacing guides, binding checks and store writes that the
+ * next paint overwrote. Only the latest position drives the tool now, but
+ * every sample (including the browser's own coalesced events) is kept, so
+ * pens, the laser trail and the eraser still see the full point history, and
+ * relative movement is summed for panning.
+ */
+
+export interface PointerFrame {
+    /** Latest event since the previous frame */
+    event: PointerEvent;
+    /** Every sample since the previous frame, oldest first */
+    samples: PointerEvent[];
+    /** Summed movementX/movementY since the previous frame */
+    movementX: number;
+    movementY: number;
+}
+
+export interface PointerInputStats {
+    /** pointermove events received */
+    events: number;
+    /** Pointer samples received, coalesced ones included */
+    samples: number;
+    /** Tool updates run */
+    updates: number;
+    /** Tool updates skipped by coalescing (events - updates) */
+    dropped: number;
+}
+
+export class PointerInputScheduler {
+    private enabled = true;
+    private handler: ((frame: PointerFrame) => void) | null = null;
+    private pending: PointerFrame | null = null;
+    private frameId = 0;
+    private events = 0;
+    private samples = 0;
+    private updates = 0;
+
+    isEnabled() {
+        return this.enabled;
+    }
+
+    setEnabled(enabled: boolean) {
+        this.enabled = enabled;
+        if (!enabled) this.flush();
+    }
+
+    setHandler(handler: ((frame: PointerFrame) => void) | null) {
+        this.handler = handler;
+    }
+
+    /**
+     * Queue a pointermove. Samples are read now, while the event is current.
+     */
+    push(e: PointerEvent) {
+        const coalesced = e.getCoalescedEvents?.() ?? [];
+        const samples = coalesced.length > 0 ? coalesced : [e];
+        this.events++;
+        this.samples += samples.length;
+
+        const frame = this.pending;
+        if (frame) {
+            frame.event = e;
+            for (const sample of samples) frame.samples.push(sample);
+            frame.movementX += e.movementX;
+            frame.movementY += e.movementY;
+        } else {
+            this.pending = { event: e, samples: [...samples], movementX: e.movementX, movementY: e.movementY };
+        }
+
+        if (!this.enabled) {
+            this.flush();
+        } else if (!this.frameId) {
+            this.frameId = requestAnimationFrame(() => {
+                this.frameId = 0;
+                this.flush();
+            });
+        }
+    }
+
+    /**
+     * Run the pending update now. Called before pointerdown/pointerup are
+     * handled, so they act on the latest position.
+     */
+    flush() {
+        if (this.frameId) {
+            cancelAnimationFrame(this.frameId);
+            this.frameId = 0;
+        }
+        const frame = this.pending;
+        if (!frame) return;
+        this.pending = null;
+        this.updates++;
+        if (this.handler) this.handler(frame);
+    }
+
+    getStats(): PointerInputStats {
+        return {
+            events: this.events,
+            samples: this.samples,
+            updates: this.updates,
+            dropped: Math.max(0, this.events - this.updates)
+        };
+    }
+
+    resetStats() {
+        this.events = 0;
+        this.samples = 0;
+        this.updates = 0;
+    }
+}
+
+export const pointerInput = new PointerInputScheduler();
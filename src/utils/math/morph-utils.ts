@@ -1,7 +1,5 @@
 
-import type { ShapeGeometry } from '../shape-geometry';
-import { getShapeGeometry } from '../shape-geometry';
-import { PathUtils } from './path-utils';
+import { getShapeOutline } from '../shape-geometry';
 import type { DrawingElement } from '../../types';
 
 interface Point { x: number; y: number; }
@@ -131,62 +129,11 @@ export class MorphUtils {
             return (el.points as Point[]) || [{ x: 0, y: 0 }, { x: el.width, y: el.height }];
         }
 
-        const geom = getShapeGeometry(el);
-        // console.log('[MorphUtils] Geometry for', el.type, geom?.type);
-        if (!geom) return this.generateCirclePoints(el.width / 2, el.height / 2); // Fallback
+        // Shared, memoized outline (same cache as rendering and hit-testing)
+        const outline = getShapeOutline(el);
+        if (!outline) return this.generateCirclePoints(el.width / 2, el.height / 2); // Fallback
 
-        return this.geometryToPoints(geom, el.width, el.height);
-    }
-
-    private static geometryToPoints(geom: ShapeGeometry, w: number, h: number): Point[] {
-        switch (geom.type) {
-            case 'points':
-                if (geom.points.length === 0) return [];
-                return geom.points;
-
-            case 'rect':
-                // Generate rect points (clockwise)
-                // x,y is topleft relative to center usually in getShapeGeometry (x=-w/2)
-                return [
-                    { x: geom.x, y: geom.y },
-                    { x: geom.x + geom.w, y: geom.y },
-                    { x: geom.x + geom.w, y: geom.y + geom.h },
-                    { x: geom.x, y: geom.y + geom.h }
-                ];
-
-            case 'ellipse':
-                // Sample ellipse
-                const points: Point[] = [];
-                const steps = 60;
-                for (let i = 0; i < steps; i++) {
-                    const angle = (i / steps) * Math.PI * 2;
-                    points.push({
-                        x: geom.cx + geom.rx * Math.cos(angle),
-                        y: geom.cy + geom.ry * Math.sin(angle)
-                    });
-                }
-                return points;
-
-            case 'path':
-                // Parse SVG path to points
-                // Use proper sampling along the curve instead of control points
-                const commands = PathUtils.parsePath(geom.path);
-                const pathPoints: Point[] = [];
-                const pSteps = 60;
-                for (let i = 0; i < pSteps; i++) {
-                    const pt = PathUtils.getPointOnPath(commands, i / pSteps);
-                    pathPoints.push({ x: pt.x, y: pt.y });
-                }
-                return pathPoints;
-
-            case 'multi':
-                // Morphing complex multi-shapes is hard. Pick primary shape.
-                if (geom.shapes.length > 0) {
-                    return this.geometryToPoints(geom.shapes[0], w, h);
-                }
-                return [];
-        }
-        return [];
+        return outline.points;
     }
 
     // Fallback generator
@@ -1,4 +1,5 @@
 import type { DrawingElement } from "../types";
+import { getElementVersionClock, getElementsChangedSince } from "./element-version";
 
 export interface MindmapNode {
     id: string;
@@ -15,6 +16,56 @@ export interface MindmapNode {
 
 export type LayoutDirection = 'horizontal-right' | 'horizontal-left' | 'vertical-down' | 'vertical-up' | 'radial';
 
+/**
+ * Per-node result of the last layout of a tree, used to skip clean subtrees
+ */
+interface CachedLayoutNode {
+    x: number;
+    y: number;
+    width: number;
+    height: number;
+    childIds: string[];
+    extent: number;      // Subtree height (horizontal) or width (vertical)
+    startAngle: number;  // Radial wedge the node was laid out in
+    endAngle: number;
+    radius: number;
+}
+
+/**
+ * Shape of a laid-out tree, kept between layouts so a change doesn't re-index
+ * the whole document
+ */
+interface TreeIndex {
+    positions: Map<string, number>;  // Node id -> index in the elements array
+    parents: Map<string, string>;
+    children: Map<string, string[]>; // Child ids in document order
+}
+
+interface CachedLayout {
+    direction: LayoutDirection;
+    nodes: Map<string, CachedLayoutNode>;
+    index: TreeIndex;
+    clock: number; // Element version clock at layout time
+}
+
+interface ElementIndex {
+    byId: Map<string, DrawingElement>;
+    children: Map<string, DrawingElement[]>;
+}
+
+const RADIAL_RADIUS = 250;
+
+const isConnector = (e: DrawingElement) =>
+    e.type === 'arrow' || e.type === 'line' || e.type === 'bezier';
+
+function sameIds(ids: string[], elements: DrawingElement[]): boolean {
+    if (ids.length !== elements.length) return false;
+    for (let i = 0; i < ids.length; i++) {
+        if (ids[i] !== elements[i].id) return false;
+    }
+    return true;
+}
+
 const PALETTE = [
     '#e03131', // Red
     '#1971c2', // Blue
@@ -30,35 +81,361 @@ const PALETTE = [
 export class MindmapLayoutEngine {
     private hSpacing = 100;
     private vSpacing = 40;
+    private layouts = new Map<string, CachedLayout>();
 
     /**
      * Builds a tree structure starting from the root element.
      */
     buildTree(rootId: string, elements: readonly DrawingElement[]): MindmapNode | null {
-        const rootElement = elements.find(e => e.id === rootId);
+        const index = this.indexElements(elements);
+        const rootElement = index.byId.get(rootId);
         if (!rootElement) return null;
+        return this.buildNode(rootElement, index, new Set());
+    }
 
+    private buildNode(element: DrawingElement, index: ElementIndex, visited: Set<string>): MindmapNode {
+        visited.add(element.id);
         const node: MindmapNode = {
-            id: rootElement.id,
-            element: rootElement,
+            id: element.id,
+            element,
             children: [],
-            width: rootElement.width,
-            height: rootElement.height,
-            x: rootElement.x,
-            y: rootElement.y
+            width: element.width,
+            height: element.height,
+            x: element.x,
+            y: element.y
         };
 
-        const childrenElements = elements.filter(e => e.parentId === rootId);
-        for (const childEl of childrenElements) {
-            const childNode = this.buildTree(childEl.id, elements);
-            if (childNode) {
-                node.children.push(childNode);
+        for (const childEl of index.children.get(element.id) || []) {
+            if (!visited.has(childEl.id)) {
+                node.children.push(this.buildNode(childEl, index, visited));
             }
         }
 
         return node;
     }
 
+    /**
+     * One pass over the elements: id lookup and parent -> children lists
+     * (children keep their document order).
+     */
+    private indexElements(elements: readonly DrawingElement[]): ElementIndex {
+        const byId = new Map<string, DrawingElement>();
+        const children = new Map<string, DrawingElement[]>();
+        for (const el of elements) {
+            byId.set(el.id, el);
+            if (el.parentId) {
+                const list = children.get(el.parentId);
+                if (list) list.push(el);
+                else children.set(el.parentId, [el]);
+            }
+        }
+        return { byId, children };
+    }
+
+    /**
+     * Walks up parentId links to the top of the hierarchy.
+     */
+    findRoot(elementId: string, elements: readonly DrawingElement[]): string {
+        const byId = new Map<string, DrawingElement>();
+        for (const el of elements) byId.set(el.id, el);
+
+        let id = elementId;
+        const seen = new Set<string>([id]);
+        let parentId = byId.get(id)?.parentId;
+        while (parentId && byId.has(parentId) && !seen.has(parentId)) {
+            id = parentId;
+            seen.add(id);
+            parentId = byId.get(id)?.parentId;
+        }
+        return id;
+    }
+
+    /**
+     * Root of the laid-out tree that contains a node, read from the cached
+     * layouts instead of scanning the elements. Undefined when no cached tree
+     * has the node or its root has since been attached elsewhere.
+     */
+    findLaidOutRoot(nodeId: string, elements: readonly DrawingElement[]): string | undefined {
+        for (const [rootId, layout] of this.layouts) {
+            if (!layout.index.positions.has(nodeId)) continue;
+            const root = elements[layout.index.positions.get(rootId)!];
+            if (root?.id === rootId && !root.parentId) return rootId;
+        }
+        return undefined;
+    }
+
+    /**
+     * Direction of the last incremental layout of this root, if any.
+     */
+    getLayoutDirection(rootId: string): LayoutDirection | undefined {
+        return this.layouts.get(rootId)?.direction;
+    }
+
+    /**
+     * Drops cached layouts (all of them when no root is given).
+     */
+    invalidate(rootId?: string) {
+        if (rootId) this.layouts.delete(rootId);
+        else this.layouts.clear();
+    }
+
+    /**
+     * Lays out the tree under rootId, reusing the previous layout of the same
+     * root and direction. A node is dirty when it is new, was resized or moved
+     * away from its laid-out position, or its children changed; dirtiness
+     * travels up the ancestor path only. Clean subtrees keep their cached
+     * extents and are translated as a block when an ancestor shifts them.
+     *
+     * @param changedIds Nodes just added or edited. When given, only they and
+     *        the elements bumped since the last layout are checked, against the
+     *        cached tree index; otherwise the tree is re-indexed and every node
+     *        is checked.
+     * @returns position updates for the nodes that actually moved, or null
+     *          when the root does not exist
+     */
+    layoutIncremental(
+        rootId: string,
+        direction: LayoutDirection,
+        elements: readonly DrawingElement[],
+        changedIds?: readonly string[]
+    ): Map<string, Partial<DrawingElement>> | null {
+        const cached = this.layouts.get(rootId);
+        const previous = cached && cached.direction === direction ? cached.nodes : new Map<string, CachedLayoutNode>();
+
+        // 1. Tree index and the nodes to check: patched from the cache when the
+        //    changes are known, else rebuilt with every node checked
+        let index: TreeIndex | null = null;
+        let byId: Map<string, DrawingElement> | null = null;
+        let candidates: Iterable<string> | null = null;
+        if (cached && changedIds) {
+            const logged = getElementsChangedSince(cached.clock);
+            byId = logged && this.resolveTree(cached.index, elements);
+            if (byId) {
+                index = cached.index;
+                this.addLeaves(index, byId, elements, changedIds);
+                candidates = [...changedIds, ...logged!];
+            }
+        }
+        if (!index || !byId) {
+            index = this.indexTree(rootId, elements);
+            if (!index) return null;
+            byId = this.resolveTree(index, elements)!;
+            candidates = index.positions.keys();
+        }
+        const root = byId.get(rootId)!;
+
+        const nodes = new Map<string, CachedLayoutNode>();
+        const updates = new Map<string, Partial<DrawingElement>>();
+        const dirty = new Set<string>();
+        const extents = new Map<string, number>();
+        const tree = index;
+        const nodesById = byId;
+        const childrenOf = (el: DrawingElement) => (tree.children.get(el.id) || []).map(id => nodesById.get(id)!);
+
+        // A dirty node dirties its ancestors (walk stops at one already marked)
+        for (const id of candidates!) {
+            const el = byId.get(id);
+            if (!el || dirty.has(id)) continue;
+            const prev = previous.get(id);
+            const isDirty = !prev || prev.width !== el.width || prev.height !== el.height ||
+                prev.x !== el.x || prev.y !== el.y || !sameIds(prev.childIds, childrenOf(el));
+            if (!isDirty) continue;
+            let ancestor: string | undefined = id;
+            while (ancestor && !dirty.has(ancestor)) {
+                dirty.add(ancestor);
+                ancestor = ancestor === rootId ? undefined : index.parents.get(ancestor);
+            }
+        }
+
+        // 2. Subtree extents, recomputed for dirty nodes only
+        const horizontal = direction.startsWith('horizontal');
+        const extentOf = (el: DrawingElement): number => {
+            const prev = previous.get(el.id);
+            if (prev && !dirty.has(el.id)) {
+                extents.set(el.id, prev.extent);
+                return prev.extent;
+            }
+            const kids = childrenOf(el);
+            const own = horizontal ? el.height : el.width;
+            const spacing = horizontal ? this.vSpacing : this.hSpacing;
+            let extent = own;
+            if (kids.length > 0) {
+                const sum = kids.reduce((acc, kid) => acc + extentOf(kid), 0);
+                extent = Math.max(own, sum + (kids.length - 1) * spacing);
+            }
+            extents.set(el.id, extent);
+            return extent;
+        };
+        if (direction !== 'radial') extentOf(root);
+
+        // 3. Positions
+        const record = (el: DrawingElement, x: number, y: number, kids: DrawingElement[], startAngle = 0, endAngle = 0, radius = 0) => {
+            if (x !== el.x || y !== el.y) updates.set(el.id, { x, y });
+            nodes.set(el.id, {
+                x, y,
+                width: el.width,
+                height: el.height,
+                childIds: kids.map(k => k.id),
+                extent: extents.get(el.id) ?? 0,
+                startAngle, endAngle, radius
+            });
+        };
+
+        const translate = (el: DrawingElement, dx: number, dy: number) => {
+            const prev = previous.get(el.id)!;
+            const x = prev.x + dx;
+            const y = prev.y + dy;
+            if (x !== el.x || y !== el.y) updates.set(el.id, { x, y });
+            nodes.set(el.id, { ...prev, x, y });
+            for (const kid of childrenOf(el)) {
+                translate(kid, dx, dy);
+            }
+        };
+
+        // Clean subtree whose layout inputs are unchanged: shift as a block
+        const reuse = (el: DrawingElement, x: number, y: number, startAngle = 0, endAngle = 0, radius = 0): boolean => {
+            const prev = previous.get(el.id);
+            if (!prev || dirty.has(el.id)) return false;
+            if (direction === 'radial' &&
+                (prev.startAngle !== startAngle || prev.endAngle !== endAngle || prev.radius !== radius)) {
+                return false;
+            }
+            translate(el, x - prev.x, y - prev.y);
+            return true;
+        };
+
+        const placeHorizontal = (el: DrawingElement, x: number, y: number, side: 'right' | 'left') => {
+            if (reuse(el, x, y)) return;
+            const kids = childrenOf(el);
+            record(el, x, y, kids);
+            if (kids.length === 0) return;
+
+            const startX = side === 'right' ? x + el.width + this.hSpacing : x - this.hSpacing;
+            const totalChildrenHeight = kids.reduce((acc, c) => acc + extents.get(c.id)!, 0) + (kids.length - 1) * this.vSpacing;
+            let currentY = y + (el.height / 2) - (totalChildrenHeight / 2);
+            for (const child of kids) {
+                const extent = extents.get(child.id)!;
+                const childX = side === 'right' ? startX : startX - child.width;
+                placeHorizontal(child, childX, currentY + extent / 2 - child.height / 2, side);
+                currentY += extent + this.vSpacing;
+            }
+        };
+
+        const placeVertical = (el: DrawingElement, x: number, y: number, side: 'down' | 'up') => {
+            if (reuse(el, x, y)) return;
+            const kids = childrenOf(el);
+            record(el, x, y, kids);
+            if (kids.length === 0) return;
+
+            const startY = side === 'down' ? y + el.height + this.vSpacing : y - this.vSpacing;
+            const totalChildrenWidth = kids.reduce((acc, c) => acc + extents.get(c.id)!, 0) + (kids.length - 1) * this.hSpacing;
+            let currentX = x + (el.width / 2) - (totalChildrenWidth / 2);
+            for (const child of kids) {
+                const extent = extents.get(child.id)!;
+                const childY = side === 'down' ? startY : startY - child.height;
+                placeVertical(child, currentX + extent / 2 - child.width / 2, childY, side);
+                currentX += extent + this.hSpacing;
+            }
+        };
+
+        const placeRadial = (el: DrawingElement, x: number, y: number, startAngle: number, endAngle: number, radius: number) => {
+            if (reuse(el, x, y, startAngle, endAngle, radius)) return;
+            const kids = childrenOf(el);
+            record(el, x, y, kids, startAngle, endAngle, radius);
+            if (kids.length === 0) return;
+
+            const centerX = x + el.width / 2;
+            const centerY = y + el.height / 2;
+            const anglePerChild = (endAngle - startAngle) / kids.length;
+            const wedge = Math.min(Math.PI / 2, anglePerChild * 0.9);
+            kids.forEach((child, i) => {
+                const angle = startAngle + (i + 0.5) * anglePerChild;
+                const childX = centerX + Math.cos(angle) * (radius + el.width / 2) - child.width / 2;
+                const childY = centerY + Math.sin(angle) * (radius + el.height / 2) - child.height / 2;
+                placeRadial(child, childX, childY, angle - wedge / 2, angle + wedge / 2, radius * 0.8);
+            });
+        };
+
+        if (direction === 'radial') {
+            placeRadial(root, root.x, root.y, 0, Math.PI * 2, RADIAL_RADIUS);
+        } else if (horizontal) {
+            placeHorizontal(root, root.x, root.y, direction === 'horizontal-right' ? 'right' : 'left');
+        } else {
+            placeVertical(root, root.x, root.y, direction === 'vertical-down' ? 'down' : 'up');
+        }
+
+        this.layouts.set(rootId, { direction, nodes, index, clock: getElementVersionClock() });
+        return updates;
+    }
+
+    /**
+     * One pass over the elements, keeping the tree under rootId only.
+     */
+    private indexTree(rootId: string, elements: readonly DrawingElement[]): TreeIndex | null {
+        const positions = new Map<string, number>();
+        const children = new Map<string, string[]>();
+        elements.forEach((el, i) => {
+            positions.set(el.id, i);
+            if (el.parentId) {
+                const list = children.get(el.parentId);
+                if (list) list.push(el.id);
+                else children.set(el.parentId, [el.id]);
+            }
+        });
+        if (!positions.has(rootId)) return null;
+
+        const index: TreeIndex = { positions: new Map(), parents: new Map(), children: new Map() };
+        const visit = (id: string) => {
+            index.positions.set(id, positions.get(id)!);
+            const kids = (children.get(id) || []).filter(kid => !index.positions.has(kid));
+            index.children.set(id, kids);
+            for (const kid of kids) {
+                index.parents.set(kid, id);
+                visit(kid);
+            }
+        };
+        visit(rootId);
+        return index;
+    }
+
+    /**
+     * Current element of every node in the index, or null when the index is
+     * stale (elements removed or reordered, or a node re-parented).
+     */
+    private resolveTree(index: TreeIndex, elements: readonly DrawingElement[]): Map<string, DrawingElement> | null {
+        const byId = new Map<string, DrawingElement>();
+        for (const [id, position] of index.positions) {
+            const el = elements[position];
+            if (el?.id !== id) return null;
+            const parentId = index.parents.get(id);
+            if (parentId && el.parentId !== parentId) return null;
+            byId.set(id, el);
+        }
+        return byId;
+    }
+
+    /**
+     * Adds new nodes whose parent is in the tree. They are appended to the
+     * elements, so the search runs from the end.
+     */
+    private addLeaves(index: TreeIndex, byId: Map<string, DrawingElement>, elements: readonly DrawingElement[], ids: readonly string[]) {
+        for (const id of ids) {
+            if (index.positions.has(id)) continue;
+            let position = elements.length - 1;
+            while (position >= 0 && elements[position].id !== id) position--;
+            const el = elements[position];
+            if (!el?.parentId || !byId.has(el.parentId)) continue;
+
+            index.positions.set(id, position);
+            index.parents.set(id, el.parentId);
+            index.children.set(id, []);
+            byId.set(id, el);
+            const siblings = index.children.get(el.parentId)!;
+            const at = siblings.findIndex(sibling => index.positions.get(sibling)! > position);
+            siblings.splice(at === -1 ? siblings.length : at, 0, id);
+        }
+    }
+
     /**
      * Calculates positions for a horizontal layout.
      */
@@ -145,7 +522,7 @@ export class MindmapLayoutEngine {
      * Calculates positions for a radial (neuron) layout.
      */
     layoutRadial(root: MindmapNode) {
-        this.assignRadialPositions(root, root.x, root.y, 0, Math.PI * 2, 250);
+        this.assignRadialPositions(root, root.x, root.y, 0, Math.PI * 2, RADIAL_RADIUS);
     }
 
     private assignRadialPositions(node: MindmapNode, x: number, y: number, startAngle: number, endAngle: number, radius: number) {
@@ -177,23 +554,21 @@ export class MindmapLayoutEngine {
         }
     }
 
-    /**
-     * Collects all updated positions into a flat map.
-     */
     /**
      * Applies semantic styling (colors, thickness, opacity) based on depth.
+     * Incoming connectors are styled by getUpdates.
      */
-    applySemanticStyling(root: MindmapNode, elements: readonly DrawingElement[]) {
+    applySemanticStyling(root: MindmapNode) {
         // Root remains neutral or user-defined, but let's ensure it has styleUpdates initialized
         root.styleUpdates = {};
 
         root.children.forEach((branchRoot, index) => {
             const branchColor = PALETTE[index % PALETTE.length];
-            this.styleSubtree(branchRoot, branchColor, 1, elements);
+            this.styleSubtree(branchRoot, branchColor, 1);
         });
     }
 
-    private styleSubtree(node: MindmapNode, color: string, depth: number, elements: readonly DrawingElement[]) {
+    private styleSubtree(node: MindmapNode, color: string, depth: number) {
         const strokeWidth = Math.max(1, 4 - depth * 0.5);
         const opacity = Math.max(40, 100 - depth * 10);
 
@@ -203,20 +578,8 @@ export class MindmapLayoutEngine {
             opacity
         };
 
-        // Also style the connector leading TO this node
-        const connector = elements.find(e =>
-            (e.type === 'arrow' || e.type === 'line' || e.type === 'bezier') &&
-            e.endBinding?.elementId === node.id
-        );
-
-        if (connector) {
-            // Store connector update in a separate map if we don't want to add connectors to nodes
-            // But for simplicity, we can let node.styleUpdates track its incoming connector too?
-            // Actually, better to have a generic updates map.
-        }
-
         for (const child of node.children) {
-            this.styleSubtree(child, color, depth + 1, elements);
+            this.styleSubtree(child, color, depth + 1);
         }
     }
 
@@ -224,6 +587,17 @@ export class MindmapLayoutEngine {
      * Collects all updated properties (position and style) into a flat map.
      */
     getUpdates(node: MindmapNode, elements: readonly DrawingElement[], updates: Map<string, Partial<DrawingElement>> = new Map()) {
+        // Incoming connector per node, indexed once instead of a scan per node
+        const incoming = new Map<string, DrawingElement>();
+        for (const el of elements) {
+            const target = el.endBinding?.elementId;
+            if (target && isConnector(el) && !incoming.has(target)) incoming.set(target, el);
+        }
+        this.collectUpdates(node, incoming, updates);
+        return updates;
+    }
+
+    private collectUpdates(node: MindmapNode, incoming: Map<string, DrawingElement>, updates: Map<string, Partial<DrawingElement>>) {
         const currentUpdates: Partial<DrawingElement> = {
             x: node.x,
             y: node.y,
@@ -232,10 +606,7 @@ export class MindmapLayoutEngine {
         updates.set(node.id, currentUpdates);
 
         // Styling the incoming connector
-        const connector = elements.find(e =>
-            (e.type === 'arrow' || e.type === 'line' || e.type === 'bezier') &&
-            e.endBinding?.elementId === node.id
-        );
+        const connector = incoming.get(node.id);
 
         if (connector && node.styleUpdates) {
             updates.set(connector.id, {
@@ -246,8 +617,10 @@ export class MindmapLayoutEngine {
         }
 
         for (const child of node.children) {
-            this.getUpdates(child, elements, updates);
+            this.collectUpdates(child, incoming, updates);
         }
-        return updates;
     }
 }
+
+/** Shared engine so cached layouts survive between store actions */
+export const mindmapLayoutEngine = new MindmapLayoutEngine();
@@ -1,9 +1,18 @@
+export interface ColdStartMetrics {
+    /** Time from navigation start to the first rendered canvas frame */
+    firstFrameMs: number;
+    /** JavaScript fetched up to that frame */
+    scriptCount: number;
+    scriptBytes: number;
+}
+
 export class PerformanceMonitor {
     private frameCount = 0;
     private lastReportTime = 0;
     private slowFrames = 0;
     private totalDrawTime = 0;
     private enabled: boolean;
+    private coldStart: ColdStartMetrics | null = null;
 
     constructor(enabled = true) {
         this.enabled = enabled;
@@ -40,6 +49,29 @@ export class PerformanceMonitor {
         }
     }
 
+    /**
+     * Record cold-start metrics once, on the first canvas frame (always on - it is one-shot)
+     */
+    markFirstFrame() {
+        if (this.coldStart) return;
+        let scriptCount = 0;
+        let scriptBytes = 0;
+        for (const entry of performance.getEntriesByType('resource') as PerformanceResourceTiming[]) {
+            if (entry.initiatorType !== 'script' && !entry.name.endsWith('.js')) continue;
+            scriptCount++;
+            scriptBytes += entry.decodedBodySize || 0;
+        }
+        this.coldStart = { firstFrameMs: performance.now(), scriptCount, scriptBytes };
+        console.log(
+            `[Perf] Cold start: first frame at ${this.coldStart.firstFrameMs.toFixed(0)}ms | ` +
+            `${scriptCount} scripts, ${(scriptBytes / 1024).toFixed(1)} KB JS`
+        );
+    }
+
+    getColdStart(): ColdStartMetrics | null {
+        return this.coldStart;
+    }
+
     setEnabled(enabled: boolean) {
         this.enabled = enabled;
     }
@@ -0,0 +1,273 @@
+/**
+ * Pick Buffer
+ * Optional ID-buffer picking. Every interactable element drawn in the last
+ * frame is rasterised as a flat-coloured silhouette into a low-resolution
+ * offscreen canvas, with its draw index encoded in the colour. A point query
+ * then becomes a single pixel read followed by an exact `hitTestElement`
+ * confirmation on one candidate, instead of a layer-sorted scan.
+ *
+ * The buffer is updated lazily: the main render only records what it drew
+ * (`beginFrame` / `record`), and silhouettes are rasterised on the first
+ * query after that frame. Queries made after the elements changed since that
+ * frame (version clock or array), and queries landing on an empty pixel, are
+ * left to the caller's geometric scan.
+ */
+
+import type { DrawingElement } from '../types';
+import { getHitBounds } from './hit-testing';
+import { getOrganicBranchPolygon } from './geometry';
+import { normalizePoints } from './render-element';
+import { getElementVersionClock } from './element-version';
+
+type PickContext = CanvasRenderingContext2D | OffscreenCanvasRenderingContext2D;
+
+interface PickEntry {
+    id: string;
+    el: DrawingElement;
+}
+
+// Buffer pixels per screen pixel
+const PICK_RESOLUTION = 0.5;
+// 16 bits of index (R, G) + 8 bit checksum (B); 0 is reserved for "empty"
+const MAX_PICK_ENTRIES = 0xfffe;
+
+const checksum = (n: number) => ((n * 151) ^ (n >> 8) ^ 0x5a) & 0xff;
+
+export class PickBuffer {
+    private enabled = false;
+    private canvas: HTMLCanvasElement | OffscreenCanvas | null = null;
+    private ctx: PickContext | null = null;
+    private entries: PickEntry[] = [];
+    private scale = 1;
+    private panX = 0;
+    private panY = 0;
+    private width = 0;
+    private height = 0;
+    private dirty = true;
+    private rasterPad = -1;
+    // Elements and version clock the recorded frame was drawn from
+    private source: readonly DrawingElement[] | null = null;
+    private clock = -1;
+
+    isEnabled() {
+        return this.enabled;
+    }
+
+    setEnabled(enabled: boolean) {
+        this.enabled = enabled;
+        if (!enabled) {
+            this.entries = [];
+            this.source = null;
+            this.canvas = null;
+            this.ctx = null;
+        }
+        this.dirty = true;
+    }
+
+    /**
+     * Start recording a new frame. Called by the main render before elements are drawn.
+     */
+    beginFrame(
+        width: number, height: number, scale: number, panX: number, panY: number,
+        elements: readonly DrawingElement[]
+    ) {
+        if (!this.enabled) return;
+        this.entries.length = 0;
+        this.source = elements;
+        this.clock = getElementVersionClock();
+        this.width = width;
+        this.height = height;
+        this.scale = scale;
+        this.panX = panX;
+        this.panY = panY;
+        this.dirty = true;
+    }
+
+    /**
+     * Record an element exactly as it was drawn (after animation / master projection).
+     * Must be called in paint order, bottom-most first.
+     */
+    record(id: string, el: DrawingElement) {
+        if (!this.enabled) return;
+        this.entries.push({ id, el });
+    }
+
+    /**
+     * Resolve the topmost element under a world-space point.
+     *
+     * @param confirm Exact test run on the single candidate, passed as it was
+     *        drawn in the recorded frame (see `findTopmostHit`)
+     * @param elements Current elements - the buffer only answers if they are
+     *        unchanged since the recorded frame
+     * @returns the element id, or `undefined` when the buffer cannot answer
+     *          and the caller should fall back to a full scan.
+     */
+    pick(
+        x: number,
+        y: number,
+        threshold: number,
+        confirm: (el: DrawingElement) => boolean,
+        elements: readonly DrawingElement[]
+    ): string | undefined {
+        if (!this.enabled || this.width === 0 || this.entries.length > MAX_PICK_ENTRIES) return undefined;
+        // Added, removed or moved since the buffer's frame: its pixels are stale
+        if (elements !== this.source || getElementVersionClock() !== this.clock) return undefined;
+
+        const pad = threshold + 1 / (this.scale * PICK_RESOLUTION);
+        if (this.dirty || pad !== this.rasterPad) {
+            if (!this.rasterize(pad)) return undefined;
+        }
+
+        const bx = Math.floor((x * this.scale + this.panX) * PICK_RESOLUTION);
+        const by = Math.floor((y * this.scale + this.panY) * PICK_RESOLUTION);
+        const canvas = this.canvas!;
+        if (bx < 0 || by < 0 || bx >= canvas.width || by >= canvas.height) return undefined;
+
+        const [r, g, b, a] = this.ctx!.getImageData(bx, by, 1, 1).data;
+        // Empty pixel: not proof of a miss (e.g. an element created mid-frame), scan instead
+        if (a === 0) return undefined;
+
+        const n = (r << 8) | g;
+        // Anti-aliased edges blend neighbouring colours — reject anything that doesn't decode cleanly
+        if (a !== 255 || n === 0 || n > this.entries.length || b !== checksum(n)) return undefined;
+
+        const entry = this.entries[n - 1];
+        return confirm(entry.el) ? entry.id : undefined;
+    }
+
+    private ensureCanvas(width: number, height: number): boolean {
+        if (!this.canvas) {
+            if (typeof OffscreenCanvas !== 'undefined') {
+                this.canvas = new OffscreenCanvas(width, height);
+            } else if (typeof document !== 'undefined') {
+                this.canvas = document.createElement('canvas');
+            } else {
+                return false;
+            }
+            this.ctx = this.canvas.getContext('2d', { willReadFrequently: true }) as PickContext | null;
+        }
+        if (this.canvas.width !== width) this.canvas.width = width;
+        if (this.canvas.height !== height) this.canvas.height = height;
+        return !!this.ctx;
+    }
+
+    private rasterize(pad: number): boolean {
+        const w = Math.max(1, Math.ceil(this.width * PICK_RESOLUTION));
+        const h = Math.max(1, Math.ceil(this.height * PICK_RESOLUTION));
+        if (!this.ensureCanvas(w, h)) return false;
+
+        const ctx = this.ctx!;
+        ctx.setTransform(1, 0, 0, 1, 0, 0);
+        ctx.clearRect(0, 0, w, h);
+        ctx.setTransform(
+            this.scale * PICK_RESOLUTION, 0, 0, this.scale * PICK_RESOLUTION,
+            this.panX * PICK_RESOLUTION, this.panY * PICK_RESOLUTION
+        );
+        ctx.lineCap = 'round';
+        ctx.lineJoin = 'round';
+
+        for (let i = 0; i < this.entries.length; i++) {
+            const n = i + 1;
+            const color = `rgb(${n >> 8}, ${n & 0xff}, ${checksum(n)})`;
+            ctx.fillStyle = color;
+            ctx.strokeStyle = color;
+            drawSilhouette(ctx, this.entries[i].el, pad);
+        }
+
+        this.dirty = false;
+        this.rasterPad = pad;
+        return true;
+    }
+}
+
+/**
+ * Draw a conservative silhouette: it must cover everything `hitTestElement`
+ * accepts within `pad`, so that an empty pixel reliably means "no hit".
+ */
+function drawSilhouette(ctx: PickContext, el: DrawingElement, pad: number) {
+    const cx = el.x + el.width / 2;
+    const cy = el.y + el.height / 2;
+
+    ctx.save();
+    if (el.angle) {
+        ctx.translate(cx, cy);
+        ctx.rotate(el.angle);
+        ctx.translate(-cx, -cy);
+    }
+    ctx.lineWidth = pad * 2;
+    ctx.beginPath();
+
+    if (el.type === 'line' || el.type === 'arrow') {
+        const pts = normalizePoints(el.points);
+        if (el.curveType === 'bezier') {
+            const endX = el.x + el.width;
+            const endY = el.y + el.height;
+            ctx.moveTo(el.x, el.y);
+            if (el.controlPoints && el.controlPoints.length === 2) {
+                const [c1, c2] = el.controlPoints;
+                ctx.bezierCurveTo(c1.x, c1.y, c2.x, c2.y, endX, endY);
+            } else if (el.controlPoints && el.controlPoints.length === 1) {
+                const cp = el.controlPoints[0];
+                ctx.quadraticCurveTo(cp.x, cp.y, endX, endY);
+            } else if (Math.abs(el.width) > Math.abs(el.height)) {
+                ctx.bezierCurveTo(el.x + el.width / 2, el.y, endX - el.width / 2, endY, endX, endY);
+            } else {
+                ctx.bezierCurveTo(el.x, el.y + el.height / 2, endX, endY - el.height / 2, endX, endY);
+            }
+        } else if (pts.length > 1) {
+            ctx.moveTo(el.x + pts[0].x, el.y + pts[0].y);
+            for (let i = 1; i < pts.length; i++) ctx.lineTo(el.x + pts[i].x, el.y + pts[i].y);
+            if (el.curveType === 'elbow' && pts.length >= 3 && !el.startBinding && !el.endBinding) {
+                ctx.closePath();
+                ctx.fill();
+            }
+        } else {
+            ctx.moveTo(el.x, el.y);
+            ctx.lineTo(el.x + el.width, el.y + el.height);
+        }
+        ctx.stroke();
+    } else if (el.type === 'fineliner' || el.type === 'marker' || el.type === 'inkbrush' || el.type === 'ink') {
+        const pts = normalizePoints(el.points);
+        if (pts.length > 0) {
+            ctx.lineWidth = pad * 2 + (el.strokeWidth || 0);
+            ctx.moveTo(el.x + pts[0].x, el.y + pts[0].y);
+            for (let i = 1; i < pts.length; i++) ctx.lineTo(el.x + pts[i].x, el.y + pts[i].y);
+            if (pts.length === 1) ctx.lineTo(el.x + pts[0].x, el.y + pts[0].y);
+            ctx.stroke();
+        }
+    } else if (el.type === 'organicBranch') {
+        const pts = normalizePoints(el.points);
+        const controls = el.controlPoints || [];
+        if (pts.length >= 2 && controls.length >= 2) {
+            const start = { x: el.x + pts[0].x, y: el.y + pts[0].y };
+            const end = { x: el.x + pts[pts.length - 1].x, y: el.y + pts[pts.length - 1].y };
+            const polygon = getOrganicBranchPolygon(start, end, controls[0], controls[1], el.strokeWidth);
+            ctx.moveTo(polygon[0].x, polygon[0].y);
+            for (let i = 1; i < polygon.length; i++) ctx.lineTo(polygon[i].x, polygon[i].y);
+            ctx.closePath();
+            ctx.fill();
+            ctx.stroke();
+        }
+    } else if (el.type === 'circle') {
+        ctx.ellipse(cx, cy, Math.abs(el.width) / 2, Math.abs(el.height) / 2, 0, 0, Math.PI * 2);
+        ctx.fill();
+        ctx.stroke();
+    } else if (el.type === 'diamond') {
+        ctx.moveTo(cx, el.y);
+        ctx.lineTo(el.x + el.width, cy);
+        ctx.lineTo(cx, el.y + el.height);
+        ctx.lineTo(el.x, cy);
+        ctx.closePath();
+        ctx.fill();
+        ctx.stroke();
+    } else {
+        // Box-tested shapes: the (extruded) broad-phase bounds expanded by the tolerance
+        const { x1, y1, x2, y2 } = getHitBounds(el);
+        ctx.fillRect(x1 - pad, y1 - pad, x2 - x1 + pad * 2, y2 - y1 + pad * 2);
+    }
+
+    ctx.restore();
+}
+
+// Singleton instance
+export const pickBuffer = new PickBuffer();
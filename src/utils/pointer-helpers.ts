@@ -19,6 +19,7 @@ export interface PointerHelpers {
     refreshLinePoints: (line: DrawingElement, overrideStartX?: number, overrideStartY?: number, overrideEndX?: number, overrideEndY?: number) => any;
     refreshBoundLine: (lineId: string) => void;
     flushPenPoints: () => void;
+    commitPenStroke: () => void;
     applyMasterProjection: (el: DrawingElement) => DrawingElement;
     normalizePencil: (el: DrawingElement) => { x: number; y: number; width: number; height: number; points: { x: number; y: number }[] } | null;
     commitText: () => void;
@@ -0,0 +1,178 @@
+/**
+ * Presentation Chunks
+ * Chunked format for standalone HTML presentations. The exported page carries:
+ * - a manifest (`#yappy-manifest`) with the document shell: layers, slides,
+ *   display states and the elements that belong to no single slide
+ *   (master layers, off-slide content);
+ * - one JSON chunk per slide (`#yappy-slide-<n>`), holding its elements and
+ *   their original paint order;
+ * - one JSON string per distinct binary asset (`#yappy-asset-<hash>`), keyed by
+ *   content hash so repeated images are stored once.
+ *
+ * All blocks are inert `<script>` tags: the browser only scans them, and each
+ * is parsed on first use by `PRESENTATION_RUNTIME`, which the player reads as
+ * `window.__PRESENTATION_CHUNKS__`.
+ */
+
+import type { DrawingElement } from '../types';
+import type { SlideDocument } from '../types/slide-types';
+
+const ASSET_PREFIX = 'asset:';
+
+export interface SlideChunk {
+    /** Index of each element in the original `elements` array */
+    order: number[];
+    elements: DrawingElement[];
+}
+
+export interface PresentationManifest {
+    document: SlideDocument;
+    /** Paint order of `document.elements` */
+    order: number[];
+    slideCount: number;
+    /** Asset reference index -> content hash */
+    assets: string[];
+}
+
+/**
+ * Runtime API the exported page exposes to the player
+ */
+export interface PresentationChunks {
+    document: SlideDocument;
+    order: number[];
+    slideCount: number;
+    /** Parse (once) and return a slide's chunk, with asset references resolved */
+    load(index: number): SlideChunk;
+}
+
+export interface SplitPresentation {
+    /** Detached manifest; asset hashes are added once assets are encoded */
+    manifest: Omit<PresentationManifest, 'assets'>;
+    /** Serialized slide chunks */
+    chunks: string[];
+    /** Source URL of each asset reference, by reference index */
+    assetUrls: string[];
+}
+
+/**
+ * Split a document into a shell plus per-slide chunks. Image sources are
+ * replaced by `asset:<n>` references; everything is serialized here, so the
+ * result is a snapshot even if the document changes while assets are encoded.
+ */
+export function splitPresentation(doc: SlideDocument): SplitPresentation {
+    const assetUrls: string[] = [];
+    const assetRefs = new Map<string, string>();
+    const ref = (url: string | undefined) => {
+        if (!url) return url;
+        let key = assetRefs.get(url);
+        if (key === undefined) {
+            key = ASSET_PREFIX + assetUrls.length;
+            assetUrls.push(url);
+            assetRefs.set(url, key);
+        }
+        return key;
+    };
+
+    const masterLayers = new Set(doc.layers.filter(l => l.isMaster).map(l => l.id));
+    const slides = [...doc.slides].sort((a, b) => a.order - b.order);
+
+    const shell: SlideChunk = { order: [], elements: [] };
+    const chunks: SlideChunk[] = slides.map(() => ({ order: [], elements: [] }));
+
+    doc.elements.forEach((el, index) => {
+        const copy = el.dataURL ? { ...el, dataURL: ref(el.dataURL) } : el;
+
+        // Same membership rule as the renderer's slide isolation: element centre
+        let target = shell;
+        if (!masterLayers.has(el.layerId)) {
+            const cx = el.x + el.width / 2;
+            const cy = el.y + el.height / 2;
+            const slideIndex = slides.findIndex(s =>
+                cx >= s.spatialPosition.x && cx <= s.spatialPosition.x + s.dimensions.width &&
+                cy >= s.spatialPosition.y && cy <= s.spatialPosition.y + s.dimensions.height);
+            if (slideIndex >= 0) target = chunks[slideIndex];
+        }
+        target.order.push(index);
+        target.elements.push(copy);
+    });
+
+    const manifest = {
+        document: {
+            ...doc,
+            elements: shell.elements,
+            slides: slides.map(s => ({
+                ...s,
+                backgroundImage: ref(s.backgroundImage),
+                thumbnail: ref(s.thumbnail)
+            }))
+        },
+        order: shell.order,
+        slideCount: slides.length
+    };
+
+    return {
+        // Round-trip once so the shell is detached from the live document too
+        manifest: JSON.parse(JSON.stringify(manifest)),
+        chunks: chunks.map(chunk => JSON.stringify(chunk)),
+        assetUrls
+    };
+}
+
+/**
+ * Make JSON safe to embed in a <script> block
+ */
+export function escapeScriptJson(json: string): string {
+    return json.replace(/</g, '\\u003c').replace(/\u2028/g, '\\u2028').replace(/\u2029/g, '\\u2029');
+}
+
+/**
+ * Inline loader shipped with every chunked export. Exposes
+ * `window.__PRESENTATION_CHUNKS__` and, for players that predate the chunked
+ * format, a lazy `window.__PRESENTATION_DATA__` that assembles the full deck.
+ */
+export const PRESENTATION_RUNTIME = `(function () {
+    var text = function (id) { var node = document.getElementById(id); return node ? node.textContent : null; };
+    var manifest = JSON.parse(text('yappy-manifest'));
+    var assets = {};
+    var resolve = function (value) {
+        if (typeof value !== 'string' || value.indexOf('${ASSET_PREFIX}') !== 0) return value;
+        var hash = manifest.assets[+value.slice(${ASSET_PREFIX.length})];
+        if (!(hash in assets)) assets[hash] = JSON.parse(text('yappy-asset-' + hash) || '""');
+        return assets[hash];
+    };
+    var resolveElements = function (elements) {
+        for (var i = 0; i < elements.length; i++) {
+            if (elements[i].dataURL) elements[i].dataURL = resolve(elements[i].dataURL);
+        }
+        return elements;
+    };
+    var doc = manifest.document;
+    resolveElements(doc.elements);
+    doc.slides.forEach(function (s) {
+        s.backgroundImage = resolve(s.backgroundImage);
+        s.thumbnail = resolve(s.thumbnail);
+    });
+    var chunks = [];
+    var load = function (index) {
+        if (!chunks[index]) {
+            var raw = text('yappy-slide-' + index);
+            var chunk = raw ? JSON.parse(raw) : { order: [], elements: [] };
+            resolveElements(chunk.elements);
+            chunks[index] = chunk;
+        }
+        return chunks[index];
+    };
+    window.__PRESENTATION_CHUNKS__ = { document: doc, order: manifest.order, slideCount: manifest.slideCount, load: load };
+    Object.defineProperty(window, '__PRESENTATION_DATA__', {
+        configurable: true,
+        get: function () {
+            var all = doc.elements.map(function (el, i) { return [manifest.order[i], el]; });
+            for (var n = 0; n < manifest.slideCount; n++) {
+                var chunk = load(n);
+                chunk.elements.forEach(function (el, i) { all.push([chunk.order[i], el]); });
+            }
+            all.sort(function (a, b) { return a[0] - b[0]; });
+            return Object.assign({}, doc, { elements: all.map(function (entry) { return entry[1]; }) });
+        }
+    });
+})();`;
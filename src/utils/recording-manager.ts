@@ -12,24 +12,44 @@ import rough from 'roughjs';
 import { renderSlideBackground } from "./canvas-renderer";
 import { renderElement } from "./render-element";
 import { projectMasterPosition } from "./slide-utils";
+import { slideBuildManager } from "./animation/slide-build-manager";
+import { shapeRegistry } from "../shapes/shape-registry";
+
+export interface RecordingRequest {
+    start: boolean;
+    format?: 'webm' | 'mp4';
+    /** Frame-exact offline export (WebM only) instead of real-time capture */
+    offline?: { duration: number; fps?: number };
+}
 
 // Export controls for Menu/Dialog access
-export const [requestRecording, setRequestRecording] = createSignal<{ start: boolean, format?: 'webm' | 'mp4' } | null>(null);
+export const [requestRecording, setRequestRecording] = createSignal<RecordingRequest | null>(null);
+
+// Offline export progress (0-1), null when no export is running
+export const [exportProgress, setExportProgress] = createSignal<number | null>(null);
 
 /**
  * Sets up recording effects and thumbnail capture within the calling component's reactive scope.
  * Must be called from within a SolidJS component function.
  */
-export function setupRecording(getCanvasRef: () => HTMLCanvasElement | undefined): {
+export function setupRecording(
+    getCanvasRef: () => HTMLCanvasElement | undefined,
+    renderOfflineFrame: (canvas: OffscreenCanvas) => void
+): {
     handleStopRecording: () => void;
 } {
     let videoRecorder: VideoRecorder | null = null;
+    let offlineAbort: AbortController | null = null;
 
     // Effect: respond to requestRecording signal
     createEffect(() => {
         const req = requestRecording();
         if (req && req.start) {
-            handleStartRecording(req.format || 'webm');
+            if (req.offline) {
+                handleOfflineExport(req.offline.duration, req.offline.fps);
+            } else {
+                handleStartRecording(req.format || 'webm');
+            }
             setRequestRecording(null);
         }
     });
@@ -101,7 +121,8 @@ export function setupRecording(getCanvasRef: () => HTMLCanvasElement | undefined
 
         window.clearTimeout(thumbTimeout);
         thumbTimeout = window.setTimeout(() => {
-            untrack(() => captureThumbnail());
+            // Lazily loaded shapes would be missing from a one-shot capture
+            shapeRegistry.preloadAll().then(() => untrack(() => captureThumbnail()));
         }, 1000); // 1s throttle for thumbnails
     });
 
@@ -131,7 +152,61 @@ export function setupRecording(getCanvasRef: () => HTMLCanvasElement | undefined
         }
     };
 
+    const handleOfflineExport = async (duration: number, fps?: number) => {
+        const canvasRef = getCanvasRef();
+        if (!canvasRef || offlineAbort) return;
+
+        if (!VideoRecorder.isOfflineExportSupported()) {
+            showToast("Offline export needs WebCodecs (use real-time recording instead)", "error");
+            return;
+        }
+
+        if (!videoRecorder) {
+            videoRecorder = new VideoRecorder(canvasRef);
+        }
+
+        const abort = new AbortController();
+        offlineAbort = abort;
+        setExportProgress(0);
+        setStore("isRecording", true);
+
+        try {
+            const blob = await videoRecorder.exportOffline({
+                duration,
+                fps,
+                renderFrame: renderOfflineFrame,
+                onStart: () => {
+                    // Replay the active slide's builds on the frozen clock
+                    if (store.appMode === 'presentation') {
+                        slideBuildManager.init(store.activeSlideIndex);
+                        slideBuildManager.playInitial();
+                    }
+                },
+                onProgress: setExportProgress,
+                signal: abort.signal
+            });
+
+            if (blob) {
+                videoRecorder.download(blob);
+                showToast("Video exported!", "success");
+            } else {
+                showToast("Video export cancelled", "info");
+            }
+        } catch (err) {
+            console.error("Offline video export failed:", err);
+            showToast("Video export failed", "error");
+        } finally {
+            offlineAbort = null;
+            setExportProgress(null);
+            setStore("isRecording", false);
+        }
+    };
+
     const handleStopRecording = () => {
+        if (offlineAbort) {
+            offlineAbort.abort();
+            return;
+        }
         if (videoRecorder) {
             videoRecorder.stop(() => {
                 setStore("isRecording", false);
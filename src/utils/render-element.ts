@@ -1,6 +1,7 @@
 import type { DrawingElement } from "../types";
 import type { RoughCanvas } from "roughjs/bin/canvas";
 import { shapeRegistry } from "../shapes/shape-registry";
+import type { RenderQuality } from "../shapes/base/types";
 
 // Helper to normalize points (supports both old Point[] and new packed number[])
 export const normalizePoints = (points: any[] | number[] | undefined): { x: number; y: number }[] => {
@@ -103,13 +104,19 @@ export const renderElement = (
     ctx: CanvasRenderingContext2D,
     el: DrawingElement,
     isDarkMode: boolean = false,
-    layerOpacity: number = 1
+    layerOpacity: number = 1,
+    quality: RenderQuality = 'full',
+    scale: number = 1
 ) => {
     const renderer = shapeRegistry.getRenderer(el.type);
     if (renderer) {
-        renderer.render({ rc, ctx, element: el, isDarkMode, layerOpacity });
+        renderer.render({ rc, ctx, element: el, isDarkMode, layerOpacity, quality, scale });
         return;
     }
+    // Lazily registered family still loading - drawn once it arrives
+    if (shapeRegistry.isPending(el.type)) return;
+    // Failed to load - already reported by the registry
+    if (shapeRegistry.hasFailed(el.type)) return;
 
     // Fallback or warning for unknown types
     console.warn(`No renderer registered for element type: ${el.type}`);
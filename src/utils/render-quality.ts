@@ -0,0 +1,142 @@
+/**
+ * Render Quality
+ * Progressive draft rendering for interactive frames. While the user pans or
+ * zooms the view (or drags elements) the affected elements are drawn as cheap
+ * silhouettes - no RoughJS hachure, shadows or illegible text. Once input has
+ * been idle for `IDLE_MS`, follow-up frames upgrade them back to full quality
+ * a few at a time, within `REFINE_BUDGET_MS` of render work per frame, so a
+ * dense scene never blocks the next input event. Drafts follow actual input
+ * only: programmatic view changes (slide transitions, zoom-to-fit, auto-scroll)
+ * always render at full quality.
+ */
+
+import type { RenderQuality } from '../shapes/base/types';
+
+// Input quiet time before refinement starts
+const IDLE_MS = 120;
+// Full-quality render work allowed per refinement frame
+const REFINE_BUDGET_MS = 8;
+
+export interface FrameInput {
+    /** The view is being dragged */
+    panning: boolean;
+    /** A wheel or pinch zoom/scroll arrived since the previous frame */
+    zooming: boolean;
+    /** Elements being moved or resized, if any */
+    dragged: readonly string[] | null;
+}
+
+export class RenderQualityController {
+    private enabled = true;
+    private lastInteraction = 0;
+    // Elements that went draft: everything (view moved) or just the dragged ones
+    private draftAll = false;
+    private draftIds = new Set<string>();
+    private refined = new Set<string>();
+    private refining = false;
+    private interacting = false;
+    private pending = false;
+    private deadline = 0;
+    private idleTimer: ReturnType<typeof setTimeout> | null = null;
+    private refineFrame = 0;
+
+    isEnabled() {
+        return this.enabled;
+    }
+
+    setEnabled(enabled: boolean) {
+        this.enabled = enabled;
+        if (!enabled) this.reset();
+    }
+
+    /**
+     * Start an interactive frame with the input driving it. Pass null for
+     * frames that must be drawn at full quality (presentation, transitions).
+     */
+    beginFrame(input: FrameInput | null) {
+        if (!this.enabled) return;
+        if (!input) {
+            if (this.refining) this.reset();
+            return;
+        }
+
+        const now = performance.now();
+        const { dragged } = input;
+        const viewChanged = input.panning || input.zooming;
+        if (viewChanged || (dragged && dragged.length > 0)) {
+            if (!this.refining) {
+                this.draftAll = false;
+                this.draftIds.clear();
+            }
+            if (viewChanged) this.draftAll = true;
+            if (dragged) for (const id of dragged) this.draftIds.add(id);
+            this.lastInteraction = now;
+            this.refining = true;
+            this.refined.clear();
+        }
+
+        this.interacting = this.refining && now - this.lastInteraction < IDLE_MS;
+        this.pending = false;
+        this.deadline = now + REFINE_BUDGET_MS;
+    }
+
+    /**
+     * Quality for one element in the current frame. While refining, elements
+     * are upgraded in paint order until the frame's budget is spent.
+     */
+    qualityFor = (id: string): RenderQuality => {
+        if (!this.refining) return 'full';
+        if (!this.draftAll && !this.draftIds.has(id)) return 'full';
+        if (this.interacting) return 'draft';
+        if (this.refined.has(id)) return 'full';
+        if (performance.now() < this.deadline) {
+            this.refined.add(id);
+            return 'full';
+        }
+        this.pending = true;
+        return 'draft';
+    };
+
+    /**
+     * Finish a frame and schedule the next refinement step, if any.
+     */
+    endFrame(requestRedraw: () => void) {
+        if (!this.enabled || !this.refining) return;
+
+        if (this.interacting) {
+            if (this.idleTimer) clearTimeout(this.idleTimer);
+            const wait = Math.max(0, IDLE_MS - (performance.now() - this.lastInteraction)) + 1;
+            this.idleTimer = setTimeout(() => {
+                this.idleTimer = null;
+                requestRedraw();
+            }, wait);
+        } else if (this.pending) {
+            if (!this.refineFrame) {
+                this.refineFrame = requestAnimationFrame(() => {
+                    this.refineFrame = 0;
+                    requestRedraw();
+                });
+            }
+        } else {
+            // Everything drawn at full quality again
+            this.refining = false;
+            this.draftAll = false;
+            this.draftIds.clear();
+            this.refined.clear();
+        }
+    }
+
+    private reset() {
+        if (this.idleTimer) clearTimeout(this.idleTimer);
+        if (this.refineFrame) cancelAnimationFrame(this.refineFrame);
+        this.idleTimer = null;
+        this.refineFrame = 0;
+        this.refining = false;
+        this.interacting = false;
+        this.draftAll = false;
+        this.draftIds.clear();
+        this.refined.clear();
+    }
+}
+
+export const renderQuality = new RenderQualityController();
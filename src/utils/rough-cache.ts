@@ -3,13 +3,20 @@ import type { Drawable } from 'roughjs/bin/core';
 import type { DrawingElement } from '../types';
 
 // ── Cache storage ────────────────────────────────────────────────
-type CacheEntry = { hash: string; drawables: Drawable[] };
+// Keyed by element id and validated by (element object, version, position).
+// In-place store writes keep the object but bump the version; replacing an
+// element (undo, spread updates, animation overlay copies) changes the object.
+// Position covers render-time projection (master elements, orbits).
+type CacheEntry = { source: object; version: number; x: number; y: number; drawables: Drawable[] };
 const cache = new Map<string, CacheEntry>();
 const MAX_CACHE = 2000;
 
 // ── Per-element tracking state ───────────────────────────────────
 let currentId: string | null = null;
-let currentHash: string | null = null;
+let currentSource: object | null = null;
+let currentVersion = 0;
+let currentX = 0;
+let currentY = 0;
 let currentDrawables: Drawable[] = [];
 let currentIndex = 0;
 let isHit = false;
@@ -22,13 +29,20 @@ const DRAW_METHODS = new Set([
 
 // ── Lifecycle ────────────────────────────────────────────────────
 
-export function beginElement(id: string, hash: string): void {
-    currentId = id;
-    currentHash = hash;
+/**
+ * Start tracking an element. `source` is the store element (stable across
+ * frames until replaced), `rendered` the possibly projected copy being drawn.
+ */
+export function beginElement(source: DrawingElement, rendered: DrawingElement, version: number): void {
+    currentId = source.id;
+    currentSource = source;
+    currentVersion = version;
+    currentX = rendered.x;
+    currentY = rendered.y;
     currentIndex = 0;
 
-    const entry = cache.get(id);
-    if (entry && entry.hash === hash) {
+    const entry = cache.get(source.id);
+    if (entry && entry.source === source && entry.version === version && entry.x === currentX && entry.y === currentY) {
         isHit = true;
         currentDrawables = entry.drawables;
     } else {
@@ -40,10 +54,10 @@ export function beginElement(id: string, hash: string): void {
 export function endElement(): void {
     if (currentId && !isHit && currentDrawables.length > 0) {
         if (cache.size >= MAX_CACHE) cache.clear();
-        cache.set(currentId, { hash: currentHash!, drawables: currentDrawables });
+        cache.set(currentId, { source: currentSource!, version: currentVersion, x: currentX, y: currentY, drawables: currentDrawables });
     }
     currentId = null;
-    currentHash = null;
+    currentSource = null;
     currentDrawables = [];
     currentIndex = 0;
     isHit = false;
@@ -85,56 +99,3 @@ export function createCachedRc(rc: RoughCanvas): RoughCanvas {
         },
     });
 }
-
-// ── Element hash ─────────────────────────────────────────────────
-
-export function computeElementHash(el: DrawingElement): string {
-    // Core visual properties that affect RoughJS drawable generation.
-    // Excludes: opacity, angle, blendMode, shadow*, text*, layerId
-    // (those are handled by canvas transforms or separate rendering steps)
-    let h = `${el.type}|${el.x}|${el.y}|${el.width}|${el.height}|${el.strokeColor}|${el.backgroundColor}|${el.fillStyle}|${el.fillDensity || 0}|${el.strokeWidth}|${el.strokeStyle}|${el.roughness}|${el.seed}|${el.renderStyle}`;
-
-    // Shape-specific geometry properties
-    if (el.roundness) h += `|rn${el.roundness.type}`;
-    if (el.borderRadius) h += `|br${el.borderRadius}`;
-    if (el.starPoints) h += `|sp${el.starPoints}`;
-    if (el.polygonSides) h += `|ps${el.polygonSides}`;
-    if (el.burstPoints) h += `|bp${el.burstPoints}`;
-    if (el.shapeRatio !== undefined) h += `|sr${el.shapeRatio}`;
-    if (el.sideRatio !== undefined) h += `|si${el.sideRatio}`;
-    if (el.depth !== undefined) h += `|dp${el.depth}`;
-    if (el.viewAngle !== undefined) h += `|va${el.viewAngle}`;
-    if (el.taper !== undefined) h += `|tp${el.taper}`;
-    if (el.innerRadius !== undefined) h += `|ir${el.innerRadius}`;
-
-    // Double border
-    if (el.drawInnerBorder) h += `|ib${el.innerBorderColor || ''}${el.innerBorderDistance || 0}`;
-
-    // Connector/arrow points
-    if (el.points && (el as any).points.length > 0) {
-        if (typeof (el.points as any)[0] === 'number') {
-            h += `|pt${(el.points as number[]).join(',')}`;
-        } else {
-            h += `|pt${(el.points as any[]).map((p: any) => `${p.x},${p.y}`).join(';')}`;
-        }
-    }
-    if (el.curveType) h += `|ct${el.curveType}`;
-    if (el.controlPoints) h += `|cp${el.controlPoints.map(p => `${p.x},${p.y}`).join(';')}`;
-
-    // Tail properties (callout, speech bubble)
-    if (el.tailX !== undefined) h += `|tx${el.tailX}`;
-    if (el.tailY !== undefined) h += `|ty${el.tailY}`;
-    if (el.tailPosition !== undefined) h += `|tpos${el.tailPosition}`;
-
-    // 3D properties
-    if (el.skewX !== undefined) h += `|sx${el.skewX}`;
-    if (el.skewY !== undefined) h += `|sy${el.skewY}`;
-    if (el.frontTaper !== undefined) h += `|ft${el.frontTaper}`;
-    if (el.frontSkewX !== undefined) h += `|fsx${el.frontSkewX}`;
-    if (el.frontSkewY !== undefined) h += `|fsy${el.frontSkewY}`;
-
-    // Draw progress (changes during draw-in animation)
-    if (el.drawProgress !== undefined) h += `|dprog${el.drawProgress}`;
-
-    return h;
-}
@@ -1,4 +1,5 @@
 import type { DrawingElement } from "../types";
+import { PathUtils } from "./math/path-utils";
 
 export type ShapeGeometry =
     | { type: 'rect', x: number, y: number, w: number, h: number, r?: number, shade?: number }
@@ -11,10 +12,9 @@ const getRoundedRectPath = (x: number, y: number, w: number, h: number, r: numbe
     return `M ${x + r} ${y} L ${x + w - r} ${y} Q ${x + w} ${y} ${x + w} ${y + r} L ${x + w} ${y + h - r} Q ${x + w} ${y + h} ${x + w - r} ${y + h} L ${x + r} ${y + h} Q ${x} ${y + h} ${x} ${y + h - r} L ${x} ${y + r} Q ${x} ${y} ${x + r} ${y}`;
 };
 
-export const getShapeGeometry = (el: DrawingElement): ShapeGeometry | null => {
+const computeShapeGeometry = (el: DrawingElement): ShapeGeometry | null => {
     // If element has custom points (e.g., during morph animation), use them directly
     if (el.points && el.points.length > 0) {
-        console.log('[getShapeGeometry] Using custom points:', el.id, el.points.length);
         return { type: 'points', points: el.points as { x: number; y: number }[] };
     }
 
@@ -1147,3 +1147,144 @@ export const getShapeGeometry = (el: DrawingElement): ShapeGeometry | null => {
 
     return null;
 };
+
+// ── Geometry cache ───────────────────────────────────────────────
+// Geometry is in local (center-origin) coordinates, so it only depends on the
+// properties below - not on x/y/angle. Render, hit-testing, anchors and
+// morphing all share one entry per element.
+
+export interface ShapeOutline {
+    points: { x: number, y: number }[];
+    isClosed: boolean;
+    bounds: { minX: number, minY: number, maxX: number, maxY: number };
+}
+
+const GEOMETRY_KEYS = [
+    'type', 'width', 'height', 'points', 'roundness', 'borderRadius', 'starPoints', 'polygonSides',
+    'burstPoints', 'shapeRatio', 'sideRatio', 'depth', 'viewAngle', 'taper', 'skewX', 'skewY',
+    'frontTaper', 'frontSkewX', 'frontSkewY', 'tailPosition', 'seed'
+] as const;
+
+type GeometryInputs = Pick<DrawingElement, typeof GEOMETRY_KEYS[number]>;
+type GeometryEntry = { inputs: GeometryInputs; geometry: ShapeGeometry | null; outline?: ShapeOutline | null };
+
+const geometryCache = new Map<string, GeometryEntry>();
+const path2DCache = new WeakMap<ShapeGeometry, Path2D>();
+const MAX_GEOMETRY_CACHE = 5000;
+const OUTLINE_SAMPLES = 60;
+
+function sameInputs(inputs: GeometryInputs, el: DrawingElement): boolean {
+    for (const key of GEOMETRY_KEYS) {
+        if (inputs[key] !== el[key]) return false;
+    }
+    return true;
+}
+
+function getEntry(el: DrawingElement): GeometryEntry {
+    const entry = geometryCache.get(el.id);
+    if (entry && sameInputs(entry.inputs, el)) return entry;
+
+    const inputs = {} as Record<string, unknown>;
+    for (const key of GEOMETRY_KEYS) inputs[key] = el[key];
+    const fresh: GeometryEntry = { inputs: inputs as GeometryInputs, geometry: computeShapeGeometry(el) };
+    if (geometryCache.size >= MAX_GEOMETRY_CACHE) geometryCache.clear();
+    geometryCache.set(el.id, fresh);
+    return fresh;
+}
+
+/**
+ * Local geometry of an element (memoized per element; the returned object is
+ * shared and must not be mutated)
+ */
+export const getShapeGeometry = (el: DrawingElement): ShapeGeometry | null => {
+    return getEntry(el).geometry;
+};
+
+/**
+ * Flattened local outline and bounds of an element (memoized with its geometry).
+ * Curves and ellipses are sampled; 'multi' geometry uses its primary shape.
+ */
+export const getShapeOutline = (el: DrawingElement): ShapeOutline | null => {
+    const entry = getEntry(el);
+    if (entry.outline === undefined) {
+        entry.outline = entry.geometry ? flattenGeometry(entry.geometry) : null;
+    }
+    return entry.outline;
+};
+
+/**
+ * Path2D for 'path' geometry, parsed once per geometry object
+ */
+export const getGeometryPath2D = (geo: ShapeGeometry & { type: 'path' }): Path2D => {
+    let path = path2DCache.get(geo);
+    if (!path) {
+        path = new Path2D(geo.path);
+        path2DCache.set(geo, path);
+    }
+    return path;
+};
+
+export const clearShapeGeometryCache = () => {
+    geometryCache.clear();
+};
+
+function flattenGeometry(geo: ShapeGeometry): ShapeOutline | null {
+    let points: { x: number, y: number }[];
+    let isClosed = true;
+
+    switch (geo.type) {
+        case 'rect':
+            points = [
+                { x: geo.x, y: geo.y },
+                { x: geo.x + geo.w, y: geo.y },
+                { x: geo.x + geo.w, y: geo.y + geo.h },
+                { x: geo.x, y: geo.y + geo.h }
+            ];
+            break;
+        case 'ellipse':
+            points = [];
+            for (let i = 0; i < OUTLINE_SAMPLES; i++) {
+                const angle = (i / OUTLINE_SAMPLES) * Math.PI * 2;
+                points.push({ x: geo.cx + geo.rx * Math.cos(angle), y: geo.cy + geo.ry * Math.sin(angle) });
+            }
+            break;
+        case 'path': {
+            // Sample along the curve rather than using control points
+            const commands = PathUtils.parsePath(geo.path);
+            points = [];
+            for (let i = 0; i < OUTLINE_SAMPLES; i++) {
+                const pt = PathUtils.getPointOnPath(commands, i / OUTLINE_SAMPLES);
+                points.push({ x: pt.x, y: pt.y });
+            }
+            break;
+        }
+        case 'points': {
+            const raw = geo.points as unknown[];
+            if (typeof raw[0] === 'number') {
+                // Flat [x0, y0, x1, y1, ...] arrays
+                const flat = raw as number[];
+                points = [];
+                for (let i = 0; i + 1 < flat.length; i += 2) points.push({ x: flat[i], y: flat[i + 1] });
+            } else {
+                points = geo.points;
+            }
+            isClosed = geo.isClosed !== false;
+            break;
+        }
+        case 'multi':
+            return geo.shapes.length > 0 ? flattenGeometry(geo.shapes[0]) : null;
+        default:
+            return null;
+    }
+
+    if (points.length === 0) return { points, isClosed, bounds: { minX: 0, minY: 0, maxX: 0, maxY: 0 } };
+
+    let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+    for (const p of points) {
+        if (p.x < minX) minX = p.x;
+        if (p.y < minY) minY = p.y;
+        if (p.x > maxX) maxX = p.x;
+        if (p.y > maxY) maxY = p.y;
+    }
+    return { points, isClosed, bounds: { minX, minY, maxX, maxY } };
+}
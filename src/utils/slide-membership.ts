@@ -0,0 +1,197 @@
+/**
+ * Slide Membership
+ * Maintained element -> slide index. An element belongs to the slide that
+ * contains its centre - the rule used by slide isolation, slide duplication
+ * and the exporters. Per-element results are validated against element
+ * versions, so after an edit only the changed elements are re-resolved, and
+ * the per-slide lists are rebuilt only when the elements, the slide layout
+ * or the master layers change.
+ *
+ * Member lists hold positions in the synced elements array. They are also
+ * valid for an animation overlay of that array (same order and length).
+ */
+
+import type { DrawingElement } from '../types';
+import type { Slide } from '../types/slide-types';
+import { getElementVersion, getElementVersionClock } from './element-version';
+
+// Margin around a slide for elements that may animate onto it
+const NEARBY_BUFFER = 200;
+
+interface MembershipEntry {
+    version: number;
+    x: number;
+    y: number;
+    width: number;
+    height: number;
+    slideId: string | null;
+    nearby: string[];
+}
+
+interface LayerLike {
+    id: string;
+    isMaster?: boolean;
+}
+
+const EMPTY: readonly number[] = [];
+
+function layoutKeyOf(slides: readonly Slide[], layers: readonly LayerLike[]): string {
+    let key = '';
+    for (const s of slides) {
+        key += `${s.id}:${s.spatialPosition.x},${s.spatialPosition.y},${s.dimensions.width},${s.dimensions.height};`;
+    }
+    key += '|';
+    for (const l of layers) if (l.isMaster) key += `${l.id};`;
+    return key;
+}
+
+export class SlideMembershipIndex {
+    private entries = new Map<string, MembershipEntry>();
+    private slides: readonly Slide[] = [];
+    private source: readonly DrawingElement[] | null = null;
+    private clock = -1;
+    private layoutKey = '';
+    private positions = new Map<string, number>();
+    private members = new Map<string, number[]>();
+    private nearby = new Map<string, number[]>();
+    private master: number[] = [];
+    private revisionCount = 0;
+
+    /**
+     * Incremented whenever the member lists are rebuilt - a cache key for
+     * anything derived from slide contents
+     */
+    get revision(): number {
+        return this.revisionCount;
+    }
+
+    /**
+     * Bring the index up to date. O(1) when nothing changed since the last call.
+     */
+    sync(elements: readonly DrawingElement[], slides: readonly Slide[], layers: readonly LayerLike[]) {
+        const clock = getElementVersionClock();
+        const layoutKey = layoutKeyOf(slides, layers);
+        if (elements === this.source && clock === this.clock && layoutKey === this.layoutKey) return;
+
+        if (layoutKey !== this.layoutKey) this.entries.clear();
+        this.source = elements;
+        this.clock = clock;
+        this.layoutKey = layoutKey;
+        this.slides = slides;
+        this.revisionCount++;
+
+        const masterLayers = new Set(layers.filter(l => l.isMaster).map(l => l.id));
+        this.positions.clear();
+        this.members.clear();
+        this.nearby.clear();
+        this.master = [];
+
+        const seen = new Set<string>();
+        elements.forEach((el, index) => {
+            seen.add(el.id);
+            this.positions.set(el.id, index);
+            if (masterLayers.has(el.layerId)) {
+                this.master.push(index);
+                return;
+            }
+            const entry = this.resolve(el);
+            if (entry.slideId) push(this.members, entry.slideId, index);
+            for (const slideId of entry.nearby) push(this.nearby, slideId, index);
+        });
+
+        // Forget deleted elements
+        if (this.entries.size > seen.size) {
+            this.entries.forEach((_, id) => {
+                if (!seen.has(id)) this.entries.delete(id);
+            });
+        }
+    }
+
+    /**
+     * Id of the slide containing the element's centre, or null
+     */
+    slideOf(el: DrawingElement): string | null {
+        return this.resolve(el).slideId;
+    }
+
+    /**
+     * Positions of the elements whose centre is on the slide, in paint order
+     */
+    membersOf(slideId: string): readonly number[] {
+        return this.members.get(slideId) ?? EMPTY;
+    }
+
+    /**
+     * Positions of the elements whose centre is within NEARBY_BUFFER of the slide
+     */
+    nearbyOf(slideId: string): readonly number[] {
+        return this.nearby.get(slideId) ?? EMPTY;
+    }
+
+    /**
+     * Positions of the elements on master layers (shown on every slide)
+     */
+    masterElements(): readonly number[] {
+        return this.master;
+    }
+
+    /**
+     * Position of an element in the synced array, or -1
+     */
+    positionOf(id: string): number {
+        return this.positions.get(id) ?? -1;
+    }
+
+    /**
+     * Group any subset of elements by owning slide in one pass (exporters)
+     */
+    groupBySlide(elements: readonly DrawingElement[]): Map<string, DrawingElement[]> {
+        const groups = new Map<string, DrawingElement[]>();
+        for (const el of elements) {
+            const slideId = this.slideOf(el);
+            if (!slideId) continue;
+            let group = groups.get(slideId);
+            if (!group) { group = []; groups.set(slideId, group); }
+            group.push(el);
+        }
+        return groups;
+    }
+
+    private resolve(el: DrawingElement): MembershipEntry {
+        const version = getElementVersion(el.id);
+        const width = el.width || 0;
+        const height = el.height || 0;
+        const cached = this.entries.get(el.id);
+        // Geometry is compared too: the version is per id, and callers may pass copies
+        const sameGeometry = !!cached && cached.x === el.x && cached.y === el.y &&
+            cached.width === width && cached.height === height;
+        if (cached && cached.version === version && sameGeometry) return cached;
+        // Same version, other geometry: a transient copy (animation frame, master
+        // projection). Answer without replacing the stored element's entry.
+        const keep = !cached || cached.version !== version;
+
+        const cx = el.x + width / 2;
+        const cy = el.y + height / 2;
+        let slideId: string | null = null;
+        const nearby: string[] = [];
+        for (const s of this.slides) {
+            const { x: sX, y: sY } = s.spatialPosition;
+            const { width: sW, height: sH } = s.dimensions;
+            if (!slideId && cx >= sX && cx <= sX + sW && cy >= sY && cy <= sY + sH) slideId = s.id;
+            if (cx >= sX - NEARBY_BUFFER && cx <= sX + sW + NEARBY_BUFFER &&
+                cy >= sY - NEARBY_BUFFER && cy <= sY + sH + NEARBY_BUFFER) nearby.push(s.id);
+        }
+
+        const entry: MembershipEntry = { version, x: el.x, y: el.y, width, height, slideId, nearby };
+        if (keep) this.entries.set(el.id, entry);
+        return entry;
+    }
+}
+
+function push(map: Map<string, number[]>, key: string, value: number) {
+    const list = map.get(key);
+    if (list) list.push(value);
+    else map.set(key, [value]);
+}
+
+export const slideMembership = new SlideMembershipIndex();
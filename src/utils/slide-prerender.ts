@@ -0,0 +1,250 @@
+/**
+ * Slide Prerender
+ * Idle-time rasterization of the slides next to the active one in
+ * presentation mode. Each bitmap holds the slide background and its static
+ * content (master layers included, projected onto the slide) at the scale
+ * the slide is presented at. Slide transitions composite the bitmap and
+ * draw only the remaining elements live - animated ones, images that may
+ * still be decoding - so the first frames on a heavy slide cost one drawImage.
+ *
+ * Only the bottom of the paint order is baked: layers in order, elements in
+ * array order, up to the first element that must be drawn live. Everything
+ * above it (layer backgrounds included) is drawn live on top of the bitmap,
+ * so the composite paints in the same order as a full render.
+ */
+
+import rough from 'roughjs';
+import type { DrawingElement } from '../types';
+import type { Slide } from '../types/slide-types';
+import { store, isLayerVisible } from '../store/app-store';
+import { renderLayersAndElements, renderSlideBackground } from './canvas-renderer';
+import { slideMembership } from './slide-membership';
+import { getImage } from './image-cache';
+import { getElementVersion } from './element-version';
+import { shapeRegistry } from '../shapes/shape-registry';
+import { calculateSlideViewState } from './animation/slide-transition-manager';
+
+export interface SlideBitmap {
+    canvas: HTMLCanvasElement;
+    /** World-space rectangle the bitmap covers */
+    x: number;
+    y: number;
+    width: number;
+    height: number;
+    /** Elements already drawn into the bitmap */
+    baked: Set<string>;
+    /** Layers whose background is in the bitmap */
+    bakedLayers: Set<string>;
+}
+
+function isStatic(el: DrawingElement): boolean {
+    return !(el.animations && el.animations.length > 0) &&
+        !el.orbitEnabled && !el.spinEnabled && el.type !== 'image';
+}
+
+function scheduleIdle(callback: () => void) {
+    if (typeof requestIdleCallback === 'function') requestIdleCallback(callback, { timeout: 1000 });
+    else setTimeout(callback, 50);
+}
+
+class SlidePrerenderer {
+    private enabled = true;
+    private cache = new Map<string, { key: string; bitmap: SlideBitmap }>();
+    private queue: number[] = [];
+    private scheduled = false;
+    private checkedRevision = -1;
+
+    isEnabled() {
+        return this.enabled;
+    }
+
+    setEnabled(enabled: boolean) {
+        this.enabled = enabled;
+        if (!enabled) this.clear();
+    }
+
+    /**
+     * Queue the active slide's neighbours for rendering at idle time. Bitmaps
+     * for other slides (except the active one) are dropped.
+     */
+    schedule(activeIndex: number) {
+        if (!this.enabled) return;
+        const neighbours = [activeIndex + 1, activeIndex - 1].filter(i => i >= 0 && i < store.slides.length);
+        const keep = new Set([activeIndex, ...neighbours].map(i => store.slides[i]?.id));
+        this.cache.forEach((_, id) => {
+            if (!keep.has(id)) this.cache.delete(id);
+        });
+
+        this.queue = neighbours;
+        if (this.scheduled) return;
+        this.scheduled = true;
+        scheduleIdle(() => this.drain());
+    }
+
+    /**
+     * Re-queue neighbour bitmaps whose content changed since they were drawn.
+     * O(1) while the membership index is unchanged; call after syncing it.
+     */
+    refresh(activeIndex: number) {
+        if (!this.enabled || slideMembership.revision === this.checkedRevision) return;
+        this.checkedRevision = slideMembership.revision;
+        for (const index of [activeIndex + 1, activeIndex - 1]) {
+            const slide = store.slides[index];
+            if (!slide) continue;
+            if (this.cache.get(slide.id)?.key !== this.keyFor(slide, index)) this.requeue(index);
+        }
+    }
+
+    /**
+     * Bitmap for a slide, if one is up to date with its content and the view.
+     * A missing or stale bitmap is queued for rendering.
+     */
+    get(index: number): SlideBitmap | null {
+        if (!this.enabled) return null;
+        const slide = store.slides[index];
+        if (!slide) return null;
+        const entry = this.cache.get(slide.id);
+        if (entry && entry.key === this.keyFor(slide, index)) return entry.bitmap;
+        this.requeue(index);
+        return null;
+    }
+
+    clear() {
+        this.cache.clear();
+        this.queue = [];
+    }
+
+    private requeue(index: number) {
+        if (!this.queue.includes(index)) this.queue.push(index);
+        if (this.scheduled) return;
+        this.scheduled = true;
+        scheduleIdle(() => this.drain());
+    }
+
+    // One slide per idle callback
+    private drain() {
+        this.scheduled = false;
+        const index = this.queue.shift();
+        if (index === undefined) return;
+        this.render(index);
+        if (this.queue.length > 0) {
+            this.scheduled = true;
+            scheduleIdle(() => this.drain());
+        }
+    }
+
+    // What the bitmap is drawn from: the slide's own, master and nearby
+    // elements (position, id, version), so edits elsewhere leave it valid
+    private contentKey(slide: Slide): string {
+        const elements = store.elements;
+        let key = '';
+        const add = (positions: readonly number[]) => {
+            for (const i of positions) {
+                const el = elements[i];
+                if (el) key += `${i}:${el.id}:${getElementVersion(el.id)},`;
+            }
+            key += '|';
+        };
+        add(slideMembership.masterElements());
+        add(slideMembership.membersOf(slide.id));
+        add(slideMembership.nearbyOf(slide.id));
+        return key;
+    }
+
+    private keyFor(slide: Slide, index: number): string {
+        const { scale } = calculateSlideViewState(slide);
+        let layers = '';
+        for (const l of store.layers) {
+            layers += `${l.id}:${l.visible}:${l.opacity}:${l.order}:${l.backgroundColor}:${l.parentId};`;
+        }
+        return [
+            this.contentKey(slide), shapeRegistry.revision, index, store.slides.length, scale.toFixed(4), store.theme,
+            layers, store.layerGroupingModeEnabled,
+            slide.fillStyle, slide.backgroundColor, slide.backgroundImage, slide.backgroundOpacity,
+            slide.gradientDirection, JSON.stringify(slide.gradientStops ?? []),
+            slide.spatialPosition.x, slide.spatialPosition.y, slide.dimensions.width, slide.dimensions.height
+        ].join('|');
+    }
+
+    private render(index: number) {
+        const slide = store.slides[index];
+        if (!slide) return;
+
+        slideMembership.sync(store.elements, store.slides, store.layers);
+        const key = this.keyFor(slide, index);
+        if (this.cache.get(slide.id)?.key === key) return;
+
+        const elements = store.elements;
+        const positions = [...slideMembership.masterElements(), ...slideMembership.membersOf(slide.id)]
+            .sort((a, b) => a - b);
+
+        // Incomplete content would be composited as if final; retry once the
+        // load settles (failed families are not pending, so this ends)
+        if (positions.some(i => shapeRegistry.isPending(elements[i].type))) {
+            shapeRegistry.preloadAll().then(() => this.schedule(store.activeSlideIndex));
+            return;
+        }
+        if (slide.fillStyle === 'image' && slide.backgroundImage && !getImage(slide.backgroundImage)) return;
+
+        // Elements that may animate onto the slide count for paint order too
+        const onSlide = new Set(positions);
+        const byLayer = new Map<string, number[]>();
+        for (const i of [...positions, ...slideMembership.nearbyOf(slide.id)].sort((a, b) => a - b)) {
+            const layerId = elements[i].layerId;
+            const list = byLayer.get(layerId);
+            if (!list) byLayer.set(layerId, [i]);
+            else if (list[list.length - 1] !== i) list.push(i);
+        }
+
+        // Bake the bottom run of static content; stop at the first live element
+        const staticElements: DrawingElement[] = [];
+        const baked = new Set<string>();
+        const bakedLayers = new Set<string>();
+        const layers = [...store.layers].sort((a, b) => a.order - b.order);
+        bake: for (const layer of layers) {
+            if (!isLayerVisible(layer.id)) continue;
+            bakedLayers.add(layer.id);
+            for (const i of byLayer.get(layer.id) ?? []) {
+                const el = elements[i];
+                if (!isStatic(el)) break bake;
+                if (!onSlide.has(i)) continue;
+                staticElements.push(el);
+                baked.add(el.id);
+            }
+        }
+        const liveBackgrounds = new Set(store.layers.filter(l => !bakedLayers.has(l.id)).map(l => l.id));
+
+        const { scale } = calculateSlideViewState(slide);
+        const { x: sX, y: sY } = slide.spatialPosition;
+        const { width: sW, height: sH } = slide.dimensions;
+        const canvas = document.createElement('canvas');
+        canvas.width = Math.ceil(sW * scale);
+        canvas.height = Math.ceil(sH * scale);
+        const ctx = canvas.getContext('2d');
+        if (!ctx) return;
+
+        const rc = rough.canvas(canvas);
+        const isDarkMode = store.theme === 'dark';
+        ctx.scale(scale, scale);
+        ctx.translate(-sX, -sY);
+        renderSlideBackground(ctx, rc, slide, sX, sY, sW, sH, isDarkMode);
+        renderLayersAndElements(ctx, rc, {
+            elements: staticElements, layers: store.layers, slides: store.slides,
+            docType: 'slides', activeSlideIndex: index,
+            selection: [], selectedTool: store.selectedTool, activeLayerId: store.activeLayerId,
+            animatedStates: new Map(),
+            viewportBounds: { minX: sX, maxX: sX + sW, minY: sY, maxY: sY + sH, bufferX: 0, bufferY: 0 },
+            scale, isDarkMode,
+            currentDrawingId: null, hoveredConnector: null, editingId: null,
+            canInteractWithElement: () => false,
+            skipLayerBackgrounds: liveBackgrounds,
+        });
+
+        this.cache.set(slide.id, {
+            key,
+            bitmap: { canvas, x: sX, y: sY, width: sW, height: sH, baked, bakedLayers }
+        });
+    }
+}
+
+export const slidePrerender = new SlidePrerenderer();
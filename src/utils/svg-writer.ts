@@ -0,0 +1,129 @@
+/**
+ * SVG Writer
+ * Builds an SVG document as string chunks (no DOM) and hands them to a Blob.
+ * Repeated content is written once as a <symbol> in <defs> and instanced with
+ * <use>; all coordinates are quantized to a fixed number of decimals.
+ */
+
+import type { Drawable, OpSet } from 'roughjs/bin/core';
+import type { RoughGenerator } from 'roughjs/bin/generator';
+
+const CHUNK_SIZE = 64 * 1024;
+const NUMBER_PATTERN = /-?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?/gi;
+
+export function escapeXml(value: string): string {
+    return value
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
+
+/**
+ * Append-only string buffer flushed into Blob parts in fixed-size chunks
+ */
+class ChunkBuffer {
+    readonly parts: string[] = [];
+    private current = '';
+
+    write(text: string): void {
+        this.current += text;
+        if (this.current.length >= CHUNK_SIZE) this.flush();
+    }
+
+    flush(): void {
+        if (this.current) {
+            this.parts.push(this.current);
+            this.current = '';
+        }
+    }
+}
+
+export class SvgWriter {
+    private readonly factor: number;
+    private readonly defs = new ChunkBuffer();
+    private readonly body = new ChunkBuffer();
+    private readonly symbols = new Map<string, string>();
+    private nextSymbol = 0;
+
+    /**
+     * @param precision decimals kept in coordinates (0-6)
+     */
+    constructor(private readonly generator: RoughGenerator, precision = 2) {
+        this.factor = Math.pow(10, Math.max(0, Math.min(6, Math.round(precision))));
+    }
+
+    /** Quantize a number */
+    num(value: number): string {
+        return String(Math.round(value * this.factor) / this.factor);
+    }
+
+    /** Quantize every number in a path string */
+    private path(d: string): string {
+        return d.replace(NUMBER_PATTERN, (n) => this.num(parseFloat(n)));
+    }
+
+    write(markup: string): void {
+        this.body.write(markup);
+    }
+
+    /**
+     * Serialize RoughJS drawables as <path> elements (mirrors RoughSVG.draw)
+     */
+    drawables(drawables: Drawable[]): string {
+        let out = '';
+        for (const drawable of drawables) {
+            const o = drawable.options;
+            for (const set of drawable.sets) {
+                const d = this.path(this.generator.opsToPath(set as OpSet));
+                if (set.type === 'path') {
+                    const dash = o.strokeLineDash ? ` stroke-dasharray="${o.strokeLineDash.join(' ')}"` : '';
+                    out += `<path d="${d}" stroke="${escapeXml(o.stroke)}" stroke-width="${this.num(o.strokeWidth)}" fill="none"${dash}/>`;
+                } else if (set.type === 'fillPath') {
+                    const rule = drawable.shape === 'curve' || drawable.shape === 'polygon' || drawable.shape === 'path' ? ' fill-rule="evenodd"' : '';
+                    out += `<path d="${d}" stroke="none" fill="${escapeXml(o.fill || 'none')}"${rule}/>`;
+                } else if (set.type === 'fillSketch') {
+                    const weight = o.fillWeight < 0 ? o.strokeWidth / 2 : o.fillWeight;
+                    const dash = o.fillLineDash ? ` stroke-dasharray="${o.fillLineDash.join(' ')}"` : '';
+                    out += `<path d="${d}" stroke="${escapeXml(o.fill || 'none')}" stroke-width="${this.num(weight)}" fill="none"${dash}/>`;
+                }
+            }
+        }
+        return out;
+    }
+
+    /**
+     * Write content that may repeat. Keys seen more than once (per `counts`)
+     * become a <symbol>, rendered on first use; the rest is written inline.
+     */
+    instance(key: string | null, counts: Map<string, number>, render: () => string): void {
+        if (!key || (counts.get(key) ?? 0) < 2) {
+            this.body.write(render());
+            return;
+        }
+        let id = this.symbols.get(key);
+        if (!id) {
+            id = `s${this.nextSymbol++}`;
+            this.symbols.set(key, id);
+            this.defs.write(`<symbol id="${id}" overflow="visible">${render()}</symbol>`);
+        }
+        this.body.write(`<use xlink:href="#${id}"/>`);
+    }
+
+    /**
+     * Assemble the document; nothing is concatenated beyond the chunk size
+     */
+    toBlob(width: number, height: number, background?: string): Blob {
+        this.defs.flush();
+        this.body.flush();
+        const w = this.num(width);
+        const h = this.num(height);
+        const style = background ? ` style="background-color: ${escapeXml(background)}"` : '';
+        const parts: string[] = [
+            `<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="${w}" height="${h}" viewBox="0 0 ${w} ${h}"${style}>`
+        ];
+        if (this.defs.parts.length > 0) parts.push('<defs>', ...this.defs.parts, '</defs>');
+        parts.push(...this.body.parts, '</svg>');
+        return new Blob(parts, { type: 'image/svg+xml' });
+    }
+}
@@ -5,9 +5,8 @@
  */
 
 import type { DrawingElement } from '../../types';
-import { store, setViewState, updateElement, pushToHistory, updateSlideBackground, isLayerVisible } from '../../store/app-store';
-import { calculateAllAnimatedStates } from '../animation-utils';
-import { hitTestElement } from '../hit-testing';
+import { store, setViewState, updateElement, pushToHistory, updateSlideBackground } from '../../store/app-store';
+import { findTopmostHit } from './selection-handler';
 
 /**
  * Context needed by drop handler from canvas component closures.
@@ -51,31 +50,7 @@ export async function handleDrop(e: DragEvent, ctx: CanvasEventContext): Promise
     const { x, y } = ctx.getWorldCoordinates(e.clientX, e.clientY);
     const threshold = 10 / store.viewState.scale;
 
-    const elementMap = new Map<string, DrawingElement>();
-    for (const el of store.elements) elementMap.set(el.id, el);
-
-    const sortedElements = store.elements.map((el, index) => {
-        const layer = store.layers.find(l => l.id === el.layerId);
-        return { el, index, layerOrder: layer?.order ?? 999, layerVisible: isLayerVisible(el.layerId) };
-    }).sort((a, b) => {
-        if (a.layerOrder !== b.layerOrder) return b.layerOrder - a.layerOrder;
-        return b.index - a.index;
-    });
-
-    const currentTime = (window as any).yappyGlobalTime || 0;
-    const shouldAnimate = store.appMode === 'presentation' || store.isPreviewing;
-    const animatedStates = calculateAllAnimatedStates(store.elements, currentTime, shouldAnimate);
-
-    let hitId: string | null = null;
-    for (const { el, layerVisible } of sortedElements) {
-        if (!layerVisible || !ctx.canInteractWithElement(el)) continue;
-        const animState = animatedStates.get(el.id);
-        const testEl = ctx.applyMasterProjection(animState ? { ...el, x: animState.x, y: animState.y, angle: animState.angle } : el);
-        if (hitTestElement(testEl, x, y, threshold, store.elements, elementMap)) {
-            hitId = el.id;
-            break;
-        }
-    }
+    const hitId = findTopmostHit(x, y, threshold, ctx);
 
     if (hitId) {
         pushToHistory();
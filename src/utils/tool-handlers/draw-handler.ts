@@ -225,8 +225,8 @@ export function drawOnUp(
                 updateElement(pState.currentId, { y: el.y + el.height, height: Math.abs(el.height) });
             }
         } else if (el.type === 'fineliner' || el.type === 'inkbrush' || el.type === 'marker' || el.type === 'ink') {
-            // Flush buffered pen points and normalize
-            helpers.flushPenPoints();
+            // Commit the wet-ink stroke (or flush buffered points) and normalize
+            helpers.commitPenStroke();
             const updatedEl = store.elements.find(e => e.id === pState.currentId);
             if (updatedEl && updatedEl.points && updatedEl.points.length > 2) {
                 const updates = helpers.normalizePencil({ ...updatedEl, points: updatedEl.points });
@@ -4,7 +4,7 @@
  * Extracted from canvas.tsx handlePointerDown/Move/Up.
  */
 
-import type { DrawingElement } from '../../types';
+import type { DrawingElement, Point } from '../../types';
 import type { PointerState } from '../pointer-state';
 import type { PointerHelpers, PointerSignals } from '../pointer-helpers';
 import { store, setViewState, addElement, updateElement, setStore, deleteElements, advancePresentation, isLayerVisible } from '../../store/app-store';
@@ -56,7 +56,9 @@ export function presentationOnDown(
  */
 export function presentationOnMove(
     e: PointerEvent,
-    pState: PointerState
+    pState: PointerState,
+    movementX: number = e.movementX,
+    movementY: number = e.movementY
 ): boolean {
     if (store.appMode !== 'presentation') return false;
 
@@ -68,8 +70,8 @@ export function presentationOnMove(
         return false;
     } else if (pState.isDragging && isNavTool) {
         setViewState({
-            panX: store.viewState.panX + e.movementX,
-            panY: store.viewState.panY + e.movementY
+            panX: store.viewState.panX + movementX,
+            panY: store.viewState.panY + movementY
         });
         return true;
     }
@@ -112,13 +114,15 @@ export function panOnDown(
 export function panOnMove(
     e: PointerEvent,
     pState: PointerState,
-    helpers: PointerHelpers
+    helpers: PointerHelpers,
+    movementX: number = e.movementX,
+    movementY: number = e.movementY
 ): void {
     helpers.setCursor(pState.isDragging ? 'grabbing' : 'grab');
     if (pState.isDragging) {
         setViewState({
-            panX: store.viewState.panX + e.movementX,
-            panY: store.viewState.panY + e.movementY
+            panX: store.viewState.panX + movementX,
+            panY: store.viewState.panY + movementY
         });
     }
 }
@@ -148,24 +152,31 @@ export function laserOnMove(
     pState: PointerState,
     helpers: PointerHelpers,
     LASER_THROTTLE_MS: number,
-    LASER_MAX_POINTS: number
+    LASER_MAX_POINTS: number,
+    samples: readonly PointerEvent[] = [e]
 ): void {
     if (!pState.isDrawing) return;
     const now = Date.now();
-    if (now - pState.lastLaserUpdateTime >= LASER_THROTTLE_MS) {
-        pState.lastLaserUpdateTime = now;
-        const { x, y } = helpers.getWorldCoordinates(e.clientX, e.clientY);
+    const perfNow = performance.now();
+    let added = false;
+    for (const sample of samples) {
+        // Sample time on the Date.now() clock the trail decays against
+        const time = now - Math.max(0, perfNow - sample.timeStamp);
+        if (time - pState.lastLaserUpdateTime < LASER_THROTTLE_MS) continue;
+        pState.lastLaserUpdateTime = time;
+        const { x, y } = helpers.getWorldCoordinates(sample.clientX, sample.clientY);
         if (pState.laserTrailData.length >= LASER_MAX_POINTS) {
             pState.laserTrailData.shift();
         }
-        pState.laserTrailData.push({ x, y, timestamp: now });
-        if (!pState.laserRafPending) {
-            pState.laserRafPending = true;
-            requestAnimationFrame(() => {
-                pState.laserRafPending = false;
-                helpers.draw();
-            });
-        }
+        pState.laserTrailData.push({ x, y, timestamp: time });
+        added = true;
+    }
+    if (added && !pState.laserRafPending) {
+        pState.laserRafPending = true;
+        requestAnimationFrame(() => {
+            pState.laserRafPending = false;
+            helpers.draw();
+        });
     }
 }
 
@@ -241,44 +252,59 @@ export function inkOnDown(
 
 // ─── Eraser Tool ─────────────────────────────────────────────────────
 
-export function eraserOnDown(
-    x: number,
-    y: number,
-    pState: PointerState,
-    helpers: PointerHelpers
-): void {
-    pState.isDrawing = true;
-    const threshold = 10 / store.viewState.scale;
+/** Eraser hit radius in screen pixels, also the spacing of hit tests along a drag */
+export const ERASER_RADIUS = 10;
+
+// Deletes every element under any of the points (one map, one delete)
+function eraseAt(points: readonly Point[], helpers: PointerHelpers): void {
+    if (points.length === 0) return;
+    const threshold = ERASER_RADIUS / store.viewState.scale;
     const elementMap = new Map<string, DrawingElement>();
     for (const el of store.elements) elementMap.set(el.id, el);
 
+    const hits: string[] = [];
     for (let i = store.elements.length - 1; i >= 0; i--) {
         const el = store.elements[i];
         if (!helpers.canInteractWithElement(el)) continue;
         if (!isLayerVisible(el.layerId)) continue;
-        if (hitTestElement(helpers.applyMasterProjection(el), x, y, threshold, store.elements, elementMap)) {
-            deleteElements([el.id]);
+        const testEl = helpers.applyMasterProjection(el);
+        if (points.some(p => hitTestElement(testEl, p.x, p.y, threshold, store.elements, elementMap))) {
+            hits.push(el.id);
         }
     }
+    deleteElements(hits);
 }
 
-export function eraserOnMove(
+export function eraserOnDown(
     x: number,
     y: number,
+    pState: PointerState,
     helpers: PointerHelpers
 ): void {
-    const threshold = 10 / store.viewState.scale;
-    const elementMap = new Map<string, DrawingElement>();
-    for (const el of store.elements) elementMap.set(el.id, el);
+    pState.isDrawing = true;
+    eraseAt([{ x, y }], helpers);
+}
 
-    for (let i = store.elements.length - 1; i >= 0; i--) {
-        const el = store.elements[i];
-        if (!helpers.canInteractWithElement(el)) continue;
-        if (!isLayerVisible(el.layerId)) continue;
-        if (hitTestElement(helpers.applyMasterProjection(el), x, y, threshold, store.elements, elementMap)) {
-            deleteElements([el.id]);
-        }
+/**
+ * Erases along the path since the last frame (world points, oldest first),
+ * one hit test per eraser radius moved
+ */
+export function eraserOnMove(
+    path: readonly Point[],
+    helpers: PointerHelpers
+): void {
+    const step = ERASER_RADIUS / store.viewState.scale;
+    const points: Point[] = [];
+    let last: Point | undefined;
+    for (const p of path) {
+        if (last && Math.abs(p.x - last.x) < step && Math.abs(p.y - last.y) < step) continue;
+        points.push(p);
+        last = p;
     }
+    // Always reach the pointer's current position
+    const end = path[path.length - 1];
+    if (end && last && (end.x !== last.x || end.y !== last.y)) points.push(end);
+    eraseAt(points, helpers);
 }
 
 // ─── Connector Handle (Start arrow from connector) ──────────────────
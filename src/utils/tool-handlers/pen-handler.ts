@@ -13,10 +13,12 @@ export function penOnMove(
     e: PointerEvent,
     pState: PointerState,
     helpers: PointerHelpers,
-    PEN_UPDATE_THROTTLE_MS: number
+    PEN_UPDATE_THROTTLE_MS: number,
+    samples?: readonly PointerEvent[]
 ): void {
     // Use coalesced events for higher point density during fast strokes
-    const coalescedEvents = e.getCoalescedEvents?.() ?? [];
+    // (or every sample since the last frame, when moves are scheduled)
+    const coalescedEvents = samples ?? e.getCoalescedEvents?.() ?? [];
     const events = coalescedEvents.length > 0 ? coalescedEvents : [e];
 
     for (const ce of events) {
@@ -10,12 +10,13 @@ import type { PointerState } from '../pointer-state';
 import type { PointerHelpers, PointerSignals } from '../pointer-helpers';
 import { store, updateElement, setStore, pushToHistory, isLayerVisible, toggleCollapse, setShowCanvasProperties } from '../../store/app-store';
 import { hitTestElement } from '../hit-testing';
+import { pickBuffer } from '../pick-buffer';
 import { getHandleAtPosition, getSelectionBoundingBox } from '../handle-detection';
 import { getDescendants } from '../hierarchy';
 import { snapPoint } from '../snap-helpers';
 import { getSnappingGuides } from '../object-snapping';
 import { getSpacingGuides } from '../spacing';
-import { calculateAllAnimatedStates } from '../animation-utils';
+import { calculateAnimatedState, type AnimatedTransform } from '../animation-utils';
 import { getGroupsSortedByPriority, isPointInGroupBounds } from '../group-utils';
 import { normalizePoints } from '../render-element';
 import { connectorHandleOnDown } from './minor-handlers';
@@ -64,6 +65,66 @@ function initMoveState(
     captureInitialPositions(pState, idsToMove);
 }
 
+// ─── Helper: Topmost hit (pick buffer, then full layer-ordered scan) ─
+
+/** The canvas helpers hit testing needs (also provided by the drop handler) */
+export type HitTestHelpers = Pick<PointerHelpers, 'canInteractWithElement' | 'applyMasterProjection'>;
+
+/**
+ * Finds the topmost interactive element under a point. The pick buffer answers
+ * when it is current; otherwise every element is tested in layer order.
+ * Either way the element is tested where it is drawn: animated (orbit, spin)
+ * and projected onto the active slide if it sits on a master layer.
+ */
+export function findTopmostHit(
+    x: number,
+    y: number,
+    threshold: number,
+    helpers: HitTestHelpers
+): string | null {
+    const elementMap = new Map<string, DrawingElement>();
+    for (const el of store.elements) elementMap.set(el.id, el);
+
+    // Hit Testing must respect Animation
+    const currentTime = (window as any).yappyGlobalTime || 0;
+    const shouldAnimate = store.appMode === 'presentation' || store.isPreviewing;
+    const animCache = new Map<string, AnimatedTransform>();
+
+    const hits = (el: DrawingElement): boolean => {
+        if (!helpers.canInteractWithElement(el)) return false;
+        const animState = calculateAnimatedState(el, currentTime, elementMap, animCache, new Set(), shouldAnimate);
+        const testEl = helpers.applyMasterProjection({
+            ...el,
+            x: animState.x,
+            y: animState.y,
+            angle: animState.angle
+        });
+        return hitTestElement(testEl, x, y, threshold, store.elements, elementMap);
+    };
+
+    // Fast path: one ID-buffer read + exact confirmation on a single candidate.
+    // The buffer holds the element as drawn last frame - confirm against the stored one.
+    const picked = pickBuffer.pick(x, y, threshold, drawn => {
+        const el = elementMap.get(drawn.id);
+        return !!el && hits(el);
+    }, store.elements);
+    if (picked !== undefined) return picked;
+
+    const sortedElements = store.elements.map((el, index) => {
+        const layer = store.layers.find(l => l.id === el.layerId);
+        return { el, index, layerOrder: layer?.order ?? 999, layerVisible: isLayerVisible(el.layerId) };
+    }).sort((a, b) => {
+        if (a.layerOrder !== b.layerOrder) return b.layerOrder - a.layerOrder;
+        return b.index - a.index;
+    });
+
+    for (const { el, layerVisible } of sortedElements) {
+        if (layerVisible && hits(el)) return el.id;
+    }
+
+    return null;
+}
+
 // ─── Pointer Down: Selection ────────────────────────────────────────
 
 export function selectionOnDown(
@@ -190,39 +251,7 @@ export function selectionOnDown(
         }
     }
 
-    const elementMap = new Map<string, DrawingElement>();
-    for (const el of store.elements) elementMap.set(el.id, el);
-
-    const sortedElements = store.elements.map((el, index) => {
-        const layer = store.layers.find(l => l.id === el.layerId);
-        return { el, index, layerOrder: layer?.order ?? 999, layerVisible: isLayerVisible(el.layerId) };
-    }).sort((a, b) => {
-        if (a.layerOrder !== b.layerOrder) return b.layerOrder - a.layerOrder;
-        return b.index - a.index;
-    });
-
-    // Hit Testing must respect Animation
-    const currentTime = (window as any).yappyGlobalTime || 0;
-    const shouldAnimate = store.appMode === 'presentation' || store.isPreviewing;
-    const animatedStates = calculateAllAnimatedStates(store.elements, currentTime, shouldAnimate);
-
-    for (const { el, layerVisible } of sortedElements) {
-        if (!layerVisible) continue;
-        if (!helpers.canInteractWithElement(el)) continue;
-
-        const animState = animatedStates.get(el.id);
-        const testEl = helpers.applyMasterProjection(animState ? {
-            ...el,
-            x: animState.x,
-            y: animState.y,
-            angle: animState.angle
-        } : el);
-
-        if (hitTestElement(testEl, x, y, threshold, store.elements, elementMap)) {
-            hitId = el.id;
-            break;
-        }
-    }
+    hitId = findTopmostHit(x, y, threshold, helpers);
 
     if (hitId) {
         const hitEl = store.elements.find(e => e.id === hitId);
@@ -1,10 +1,48 @@
 /**
  * Video Recorder Utility
- * Handles capturing the canvas stream and saving it as a video file
+ * Handles capturing the canvas stream and saving it as a video file.
+ * Also supports deterministic offline export: the animation clock is frozen
+ * and stepped frame by frame, each frame is rendered to an OffscreenCanvas
+ * and encoded with WebCodecs into a WebM file as fast as the machine allows.
  */
 
+import { animationEngine } from './animation/animation-engine';
+import { WebMMuxer, type WebMVideoCodec } from './webm-muxer';
+
 export type VideoFormat = 'webm' | 'mp4';
 
+export interface OfflineExportOptions {
+    /** Length of the export in ms */
+    duration: number;
+    fps?: number;
+    /** Output size (defaults to the canvas size) */
+    width?: number;
+    height?: number;
+    bitrate?: number;
+    /** Render the scene at the current (frozen) engine time */
+    renderFrame: (canvas: OffscreenCanvas) => void;
+    /** Called once the clock is frozen, before the first frame (e.g. to start builds) */
+    onStart?: () => void;
+    /** Progress 0-1 */
+    onProgress?: (progress: number) => void;
+    signal?: AbortSignal;
+}
+
+// Candidate encoders, best first
+const OFFLINE_CODECS: { codec: string; muxerCodec: WebMVideoCodec }[] = [
+    { codec: 'vp09.00.10.08', muxerCodec: 'V_VP9' },
+    { codec: 'vp8', muxerCodec: 'V_VP8' }
+];
+
+// Frames allowed in the encoder queue before rendering waits for it
+const MAX_ENCODE_QUEUE = 8;
+// Keyframe interval in seconds
+const KEYFRAME_INTERVAL = 2;
+// Frames rendered between yields to the event loop (progress / cancel)
+const YIELD_INTERVAL = 10;
+
+const nextTask = () => new Promise<void>(resolve => setTimeout(resolve, 0));
+
 export class VideoRecorder {
     private mediaRecorder: MediaRecorder | null = null;
     private chunks: Blob[] = [];
@@ -60,6 +98,97 @@ export class VideoRecorder {
         }
     }
 
+    /**
+     * Whether this browser can do offline (WebCodecs) export
+     */
+    public static isOfflineExportSupported(): boolean {
+        return typeof VideoEncoder !== 'undefined' &&
+            typeof VideoFrame !== 'undefined' &&
+            typeof OffscreenCanvas !== 'undefined';
+    }
+
+    /**
+     * Export frame-exact WebM video faster than real time.
+     * The AnimationEngine clock is frozen for the duration of the export and
+     * stepped by exactly one frame interval per frame.
+     *
+     * @returns the video, or null when cancelled through `signal`
+     */
+    public async exportOffline(options: OfflineExportOptions): Promise<Blob | null> {
+        const fps = options.fps ?? 60;
+        // VP8/VP9 encoders want even dimensions
+        const width = Math.max(2, (options.width ?? this.canvas.width) & ~1);
+        const height = Math.max(2, (options.height ?? this.canvas.height) & ~1);
+        const bitrate = options.bitrate ?? Math.round(width * height * fps * 0.1);
+
+        let selected: { config: VideoEncoderConfig; muxerCodec: WebMVideoCodec } | null = null;
+        for (const candidate of OFFLINE_CODECS) {
+            const config: VideoEncoderConfig = { codec: candidate.codec, width, height, bitrate, framerate: fps };
+            const support = await VideoEncoder.isConfigSupported(config);
+            if (support.supported) {
+                selected = { config, muxerCodec: candidate.muxerCodec };
+                break;
+            }
+        }
+        if (!selected) {
+            throw new Error('No WebM (VP8/VP9) encoder available');
+        }
+
+        const muxer = new WebMMuxer({ width, height, codec: selected.muxerCodec });
+        let encoderError: unknown = null;
+        const encoder = new VideoEncoder({
+            output: (chunk) => muxer.addChunk(chunk),
+            error: (e) => { encoderError = e; }
+        });
+        encoder.configure(selected.config);
+
+        const canvas = new OffscreenCanvas(width, height);
+        const totalFrames = Math.max(1, Math.round(options.duration / 1000 * fps));
+        const frameInterval = 1000 / fps;
+
+        animationEngine.freezeClock();
+        try {
+            options.onStart?.();
+
+            for (let i = 0; i < totalFrames; i++) {
+                if (options.signal?.aborted) {
+                    encoder.close();
+                    return null;
+                }
+                if (encoderError) throw encoderError;
+
+                if (i > 0) animationEngine.step(frameInterval);
+                options.renderFrame(canvas);
+
+                // Timestamps come from the frame index, not the wall clock
+                const frame = new VideoFrame(canvas, {
+                    timestamp: Math.round(i * 1e6 / fps),
+                    duration: Math.round(1e6 / fps)
+                });
+                encoder.encode(frame, { keyFrame: i % (fps * KEYFRAME_INTERVAL) === 0 });
+                frame.close();
+
+                options.onProgress?.((i + 1) / totalFrames);
+
+                // Let the encoder drain, and yield to the UI now and then
+                while (encoder.encodeQueueSize > MAX_ENCODE_QUEUE && !encoderError) {
+                    await nextTask();
+                }
+                if (i % YIELD_INTERVAL === 0) await nextTask();
+            }
+
+            await encoder.flush();
+            if (encoderError) throw encoderError;
+            encoder.close();
+            return muxer.finalize();
+        } catch (err) {
+            if (encoder.state !== 'closed') encoder.close();
+            throw err;
+        } finally {
+            animationEngine.releaseClock();
+        }
+    }
+
     public stop(callback?: () => void) {
         if (this.mediaRecorder && this.mediaRecorder.state !== 'inactive') {
             this.onStopCallback = callback || null;
@@ -73,7 +202,13 @@ export class VideoRecorder {
         const blob = new Blob(this.chunks, {
             type: this.mediaRecorder?.mimeType || 'video/webm'
         });
+        this.download(blob);
+    }
 
+    /**
+     * Save a video blob as a download
+     */
+    public download(blob: Blob) {
         const url = URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.style.display = 'none';
@@ -0,0 +1,197 @@
+/**
+ * WebM Muxer
+ * Minimal Matroska/WebM writer for a single VP8/VP9 video track fed with
+ * WebCodecs `EncodedVideoChunk`s. Clusters start on every keyframe; the file
+ * is assembled in memory and returned as a Blob by `finalize()`.
+ */
+
+export type WebMVideoCodec = 'V_VP8' | 'V_VP9';
+
+export interface WebMMuxerOptions {
+    width: number;
+    height: number;
+    codec: WebMVideoCodec;
+}
+
+// EBML element IDs
+const EBML = 0x1a45dfa3;
+const EBML_VERSION = 0x4286;
+const EBML_READ_VERSION = 0x42f7;
+const EBML_MAX_ID_LENGTH = 0x42f2;
+const EBML_MAX_SIZE_LENGTH = 0x42f3;
+const DOC_TYPE = 0x4282;
+const DOC_TYPE_VERSION = 0x4287;
+const DOC_TYPE_READ_VERSION = 0x4285;
+const SEGMENT = 0x18538067;
+const INFO = 0x1549a966;
+const TIMECODE_SCALE = 0x2ad7b1;
+const DURATION = 0x4489;
+const MUXING_APP = 0x4d80;
+const WRITING_APP = 0x5741;
+const TRACKS = 0x1654ae6b;
+const TRACK_ENTRY = 0xae;
+const TRACK_NUMBER = 0xd7;
+const TRACK_UID = 0x73c5;
+const TRACK_TYPE = 0x83;
+const FLAG_LACING = 0x9c;
+const CODEC_ID = 0x86;
+const VIDEO = 0xe0;
+const PIXEL_WIDTH = 0xb0;
+const PIXEL_HEIGHT = 0xba;
+const CLUSTER = 0x1f43b675;
+const CLUSTER_TIMECODE = 0xe7;
+const SIMPLE_BLOCK = 0xa3;
+
+// SimpleBlock timecodes are signed 16-bit offsets from the cluster timecode
+const MAX_CLUSTER_SPAN_MS = 30000;
+
+function concat(parts: Uint8Array[]): Uint8Array {
+    let length = 0;
+    for (const part of parts) length += part.length;
+    const out = new Uint8Array(length);
+    let offset = 0;
+    for (const part of parts) {
+        out.set(part, offset);
+        offset += part.length;
+    }
+    return out;
+}
+
+function idBytes(id: number): Uint8Array {
+    const length = id > 0xffffff ? 4 : id > 0xffff ? 3 : id > 0xff ? 2 : 1;
+    const out = new Uint8Array(length);
+    for (let i = length - 1, v = id; i >= 0; i--, v = Math.floor(v / 256)) out[i] = v & 0xff;
+    return out;
+}
+
+/**
+ * Encode an element size as an EBML variable-length integer
+ */
+function sizeBytes(size: number): Uint8Array {
+    let length = 1;
+    while (length < 8 && size >= Math.pow(2, 7 * length) - 1) length++;
+    const out = new Uint8Array(length);
+    let v = size;
+    for (let i = length - 1; i >= 0; i--) {
+        out[i] = v % 256;
+        v = Math.floor(v / 256);
+    }
+    out[0] |= 1 << (8 - length);
+    return out;
+}
+
+function element(id: number, payload: Uint8Array): Uint8Array {
+    return concat([idBytes(id), sizeBytes(payload.length), payload]);
+}
+
+function uintElement(id: number, value: number): Uint8Array {
+    const bytes: number[] = [];
+    let v = Math.max(0, Math.floor(value));
+    do {
+        bytes.unshift(v % 256);
+        v = Math.floor(v / 256);
+    } while (v > 0);
+    return element(id, new Uint8Array(bytes));
+}
+
+function floatElement(id: number, value: number): Uint8Array {
+    const payload = new Uint8Array(8);
+    new DataView(payload.buffer).setFloat64(0, value);
+    return element(id, payload);
+}
+
+function stringElement(id: number, value: string): Uint8Array {
+    return element(id, new TextEncoder().encode(value));
+}
+
+export class WebMMuxer {
+    private options: WebMMuxerOptions;
+    private clusters: Uint8Array[] = [];
+    private blocks: Uint8Array[] = [];
+    private clusterTimecode = -1;
+    private durationMs = 0;
+
+    constructor(options: WebMMuxerOptions) {
+        this.options = options;
+    }
+
+    /**
+     * Add an encoded frame (chunks must arrive in presentation order)
+     */
+    addChunk(chunk: EncodedVideoChunk): void {
+        const data = new Uint8Array(chunk.byteLength);
+        chunk.copyTo(data);
+
+        const timestampMs = Math.round(chunk.timestamp / 1000);
+        const isKey = chunk.type === 'key';
+
+        if (this.clusterTimecode < 0 || isKey || timestampMs - this.clusterTimecode > MAX_CLUSTER_SPAN_MS) {
+            this.flushCluster();
+            this.clusterTimecode = timestampMs;
+        }
+
+        const relative = timestampMs - this.clusterTimecode;
+        const header = new Uint8Array([
+            0x81, // track number 1 (as a vint)
+            (relative >> 8) & 0xff,
+            relative & 0xff,
+            isKey ? 0x80 : 0x00
+        ]);
+        this.blocks.push(element(SIMPLE_BLOCK, concat([header, data])));
+
+        const endMs = timestampMs + Math.round((chunk.duration ?? 0) / 1000);
+        if (endMs > this.durationMs) this.durationMs = endMs;
+    }
+
+    private flushCluster(): void {
+        if (this.blocks.length === 0) return;
+        this.clusters.push(element(CLUSTER, concat([
+            uintElement(CLUSTER_TIMECODE, this.clusterTimecode),
+            ...this.blocks
+        ])));
+        this.blocks = [];
+    }
+
+    /**
+     * Finish the file
+     */
+    finalize(): Blob {
+        this.flushCluster();
+
+        const header = element(EBML, concat([
+            uintElement(EBML_VERSION, 1),
+            uintElement(EBML_READ_VERSION, 1),
+            uintElement(EBML_MAX_ID_LENGTH, 4),
+            uintElement(EBML_MAX_SIZE_LENGTH, 8),
+            stringElement(DOC_TYPE, 'webm'),
+            uintElement(DOC_TYPE_VERSION, 4),
+            uintElement(DOC_TYPE_READ_VERSION, 2)
+        ]));
+
+        const info = element(INFO, concat([
+            uintElement(TIMECODE_SCALE, 1000000), // 1ms
+            floatElement(DURATION, this.durationMs),
+            stringElement(MUXING_APP, 'yappy'),
+            stringElement(WRITING_APP, 'yappy')
+        ]));
+
+        const tracks = element(TRACKS, element(TRACK_ENTRY, concat([
+            uintElement(TRACK_NUMBER, 1),
+            uintElement(TRACK_UID, 1),
+            uintElement(TRACK_TYPE, 1), // video
+            uintElement(FLAG_LACING, 0),
+            stringElement(CODEC_ID, this.options.codec),
+            element(VIDEO, concat([
+                uintElement(PIXEL_WIDTH, this.options.width),
+                uintElement(PIXEL_HEIGHT, this.options.height)
+            ]))
+        ])));
+
+        let segmentSize = info.length + tracks.length;
+        for (const cluster of this.clusters) segmentSize += cluster.length;
+
+        const parts = [header, idBytes(SEGMENT), sizeBytes(segmentSize), info, tracks, ...this.clusters] as BlobPart[];
+        this.clusters = [];
+        return new Blob(parts, { type: 'video/webm' });
+    }
+}
@@ -0,0 +1,199 @@
+/**
+ * Wet Ink
+ * Overlay canvas for the pen stroke currently being drawn (fineliner,
+ * marker). Each pointer move strokes only the newly appended segments on top
+ * of what is already there, so the cost per event is constant no matter how
+ * long the stroke gets. The store - and with it the main scene render -
+ * receives the stroke once, at pointer-up.
+ *
+ * The ink brush is not drawn here: its width comes from the velocity
+ * normalised over the whole stroke and from the end taper, so an incremental
+ * overlay would visibly jump when the committed stroke replaces it.
+ */
+
+import type { DrawingElement } from '../types';
+import { adjustColor } from './render-element';
+
+interface ViewTransform {
+    scale: number;
+    panX: number;
+    panY: number;
+}
+
+export const WET_INK_TOOLS: readonly string[] = ['fineliner', 'marker'];
+
+export class WetInkLayer {
+    private canvas: HTMLCanvasElement | null = null;
+    private ctx: CanvasRenderingContext2D | null = null;
+    private active = false;
+    private generation = 0;
+    private element: DrawingElement | null = null;
+    private view: ViewTransform = { scale: 1, panX: 0, panY: 0 };
+    private points: number[] = [];
+    private color = '#000000';
+    // Moving-average window of el.smoothing (same as the freehand renderer);
+    // a point is drawn once the samples after it in its window have arrived
+    private window = 0;
+    private emitted = 0;
+    // Midpoint-quadratic smoothing state (same curve as the fineliner renderer)
+    private prevX = 0;
+    private prevY = 0;
+    private midX = 0;
+    private midY = 0;
+
+    attach(canvas: HTMLCanvasElement | null) {
+        this.canvas = canvas;
+        this.ctx = canvas ? canvas.getContext('2d') : null;
+    }
+
+    resize(width: number, height: number) {
+        if (!this.canvas) return;
+        this.canvas.width = width;
+        this.canvas.height = height;
+        if (this.active) this.replay();
+    }
+
+    /**
+     * Keep the overlay aligned with the main canvas (fixed positioning)
+     */
+    setOffset(left: number, top: number) {
+        if (!this.canvas) return;
+        this.canvas.style.left = `${left}px`;
+        this.canvas.style.top = `${top}px`;
+    }
+
+    isActive() {
+        return this.active;
+    }
+
+    /**
+     * Start a stroke for a freshly created pen element (points relative to el.x/el.y)
+     */
+    begin(el: DrawingElement, view: ViewTransform, isDarkMode: boolean) {
+        if (!this.ctx || !this.canvas) return;
+        this.generation++;
+        this.active = true;
+        this.element = el;
+        this.points = Array.isArray(el.points) && typeof el.points[0] === 'number'
+            ? [...(el.points as number[])]
+            : [0, 0];
+
+        // Marker translucency is applied to the whole layer, so overlapping
+        // segments don't darken where they join
+        const opacity = (el.opacity ?? 100) / 100;
+        const style = this.canvas.style;
+        style.opacity = String(el.type === 'marker' ? opacity * 0.5 : opacity);
+        style.mixBlendMode = el.type === 'marker' ? 'multiply' : 'normal';
+
+        this.window = el.smoothing && el.smoothing > 0 ? Math.floor(el.smoothing / 2) || 1 : 0;
+        this.color = adjustColor(el.strokeColor, isDarkMode);
+        this.setView(view);
+    }
+
+    /**
+     * Draw only the new points (flat x, y pairs relative to the element origin)
+     */
+    append(points: number[], view: ViewTransform) {
+        if (!this.active || !this.ctx) return;
+        for (let i = 0; i < points.length; i++) this.points.push(points[i]);
+
+        if (view.scale !== this.view.scale || view.panX !== this.view.panX || view.panY !== this.view.panY) {
+            // Auto-scroll/zoom mid-stroke: redraw everything in the new transform
+            this.setView(view);
+            return;
+        }
+        this.strokeSegments();
+    }
+
+    /**
+     * Finish the stroke and hand back all of its points. The overlay is cleared
+     * on the next frame, after the main canvas has drawn the committed stroke.
+     */
+    end(): number[] {
+        const points = this.points;
+        this.active = false;
+        this.element = null;
+        this.points = [];
+        const generation = this.generation;
+        requestAnimationFrame(() => {
+            if (generation === this.generation && !this.active) this.clear();
+        });
+        return points;
+    }
+
+    private setView(view: ViewTransform) {
+        this.view = { scale: view.scale, panX: view.panX, panY: view.panY };
+        this.replay();
+    }
+
+    private replay() {
+        const ctx = this.ctx;
+        const el = this.element;
+        if (!ctx || !el) return;
+        this.clear();
+
+        const { scale, panX, panY } = this.view;
+        // Resizing the canvas resets its state, so everything is set here
+        ctx.setTransform(scale, 0, 0, scale, panX + el.x * scale, panY + el.y * scale);
+        ctx.strokeStyle = this.color;
+        ctx.fillStyle = this.color;
+        ctx.lineWidth = el.type === 'marker' ? el.strokeWidth * 4 : el.strokeWidth;
+        ctx.lineCap = 'round';
+        ctx.lineJoin = 'round';
+
+        // Start dot, so a tap is visible before the pointer moves
+        this.prevX = this.midX = this.points[0];
+        this.prevY = this.midY = this.points[1];
+        ctx.beginPath();
+        ctx.arc(this.prevX, this.prevY, ctx.lineWidth / 2, 0, Math.PI * 2);
+        ctx.fill();
+
+        this.emitted = 1;
+        this.strokeSegments();
+    }
+
+    private strokeSegments() {
+        const ctx = this.ctx!;
+        const pts = this.points;
+        const count = pts.length >> 1;
+        const w = this.window;
+        // Points whose smoothing window is complete
+        const ready = count - w;
+        if (this.emitted >= ready) return;
+
+        ctx.beginPath();
+        ctx.moveTo(this.midX, this.midY);
+        for (let i = this.emitted; i < ready; i++) {
+            let x = pts[i * 2];
+            let y = pts[i * 2 + 1];
+            if (w > 0) {
+                const lo = Math.max(0, i - w);
+                x = 0;
+                y = 0;
+                for (let j = lo; j <= i + w; j++) {
+                    x += pts[j * 2];
+                    y += pts[j * 2 + 1];
+                }
+                x /= i + w - lo + 1;
+                y /= i + w - lo + 1;
+            }
+            const midX = (this.prevX + x) / 2;
+            const midY = (this.prevY + y) / 2;
+            ctx.quadraticCurveTo(this.prevX, this.prevY, midX, midY);
+            this.prevX = x;
+            this.prevY = y;
+            this.midX = midX;
+            this.midY = midY;
+        }
+        this.emitted = ready;
+        ctx.stroke();
+    }
+
+    private clear() {
+        if (!this.ctx || !this.canvas) return;
+        this.ctx.setTransform(1, 0, 0, 1, 0, 0);
+        this.ctx.clearRect(0, 0, this.canvas.width, this.canvas.height);
+    }
+}
+
+export const wetInk = new WetInkLayer();
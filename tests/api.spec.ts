@@ -152,4 +152,70 @@ test.describe('Yappy API', () => {
         });
         expect(count).toBe(0);
     });
+
+    test('should toggle the performance features', async ({ page }) => {
+        const toggles = await page.evaluate(() => {
+            const Y = window.Yappy;
+            const read = () => ({
+                picking: Y.isPickingEnabled(),
+                draft: Y.isDraftRenderingEnabled(),
+                prerender: Y.isSlidePrerenderEnabled()
+            });
+            const initial = read();
+            Y.setPickingEnabled(false);
+            Y.setDraftRenderingEnabled(false);
+            Y.setSlidePrerenderEnabled(false);
+            const disabled = read();
+            Y.setPickingEnabled(true);
+            Y.setDraftRenderingEnabled(true);
+            Y.setSlidePrerenderEnabled(true);
+            return { initial, disabled, restored: read() };
+        });
+        expect(toggles.initial).toEqual({ picking: true, draft: true, prerender: true });
+        expect(toggles.disabled).toEqual({ picking: false, draft: false, prerender: false });
+        expect(toggles.restored).toEqual(toggles.initial);
+    });
+
+    test('should select through the pick buffer and without it', async ({ page }) => {
+        const id = await page.evaluate(() => window.Yappy.createRectangle(200, 200, 200, 150, {
+            backgroundColor: '#00ff00',
+            fillStyle: 'solid'
+        }));
+
+        for (const enabled of [true, false]) {
+            await page.evaluate((on) => {
+                window.Yappy.setPickingEnabled(on);
+                window.Yappy.setSelectedTool('selection');
+                window.Yappy.setSelected([]);
+                window.Yappy.setView(1, 0, 0);
+            }, enabled);
+            await page.mouse.click(300, 275);
+            const selected = await page.evaluate(() => window.Yappy.state.selection);
+            expect(selected).toEqual([id]);
+        }
+    });
+
+    test('should coalesce pointer moves when enabled', async ({ page }) => {
+        const moves = async (enabled: boolean) => {
+            await page.evaluate((on) => {
+                window.Yappy.setSelectedTool('selection');
+                window.Yappy.setPointerCoalescingEnabled(on);
+                window.Yappy.resetPointerInputStats();
+            }, enabled);
+            await page.mouse.move(100, 100);
+            // Many steps dispatch several pointermoves per animation frame
+            await page.mouse.move(600, 400, { steps: 60 });
+            await page.evaluate(() => new Promise(requestAnimationFrame));
+            return page.evaluate(() => window.Yappy.getPointerInputStats());
+        };
+
+        const off = await moves(false);
+        expect(off.updates).toBe(off.events);
+        expect(off.dropped).toBe(0);
+
+        const on = await moves(true);
+        expect(on.events).toBeGreaterThan(0);
+        expect(on.updates).toBeLessThanOrEqual(on.events);
+        expect(on.dropped).toBe(on.events - on.updates);
+    });
 });
@@ -0,0 +1,47 @@
+import { test, expect } from '@playwright/test';
+
+test.describe('Bound lines during animations', () => {
+    test.beforeEach(async ({ page }) => {
+        await page.goto('http://localhost:5173');
+        await page.waitForFunction(() => window.Yappy !== undefined);
+        await page.evaluate(() => window.Yappy.clear());
+    });
+
+    test('connectors follow an animating shape every frame', async ({ page }) => {
+        const ids = await page.evaluate(() => {
+            const Y = window.Yappy;
+            const a = Y.createRectangle(0, 0, 100, 100);
+            const b = Y.createRectangle(400, 0, 100, 100);
+            const line = Y.connect(a, b, { type: 'arrow' });
+            Y.animateElement(b, { y: 400 }, { duration: 1000 });
+            return { b, line };
+        });
+
+        await page.waitForTimeout(500);
+
+        // The frame the canvas draws: store plus the animation overlay
+        const midway = await page.evaluate(async ({ b, line }) => {
+            const { applyAnimationOverlay } = await import('/src/utils/animation/animation-overlay.ts');
+            const frame = applyAnimationOverlay(window.Yappy.state.elements);
+            const stored = window.Yappy.getElement(line);
+            const drawn = frame.find((el: any) => el.id === line);
+            const shape = frame.find((el: any) => el.id === b);
+            return {
+                storedEndY: stored.y + stored.height,
+                drawnEndY: drawn.y + drawn.height,
+                shapeY: shape.y
+            };
+        }, ids);
+        // The store is untouched mid-animation; the drawn line follows the shape
+        expect(midway.shapeY).toBeGreaterThan(0);
+        expect(midway.storedEndY).toBeLessThan(100);
+        expect(midway.drawnEndY).toBeGreaterThan(midway.storedEndY);
+
+        await page.waitForTimeout(700);
+        const committed = await page.evaluate(({ line }) => {
+            const stored = window.Yappy.getElement(line);
+            return stored.y + stored.height;
+        }, ids);
+        expect(committed).toBeGreaterThan(midway.storedEndY);
+    });
+});
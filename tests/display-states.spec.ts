@@ -0,0 +1,113 @@
+import { test, expect } from '@playwright/test';
+
+test.describe('Display states', () => {
+    test.beforeEach(async ({ page }) => {
+        await page.goto('http://localhost:5173');
+        await page.waitForFunction(() => window.Yappy !== undefined);
+        await page.evaluate(() => window.Yappy.clear());
+    });
+
+    test('captured states are stored as deltas and apply in full', async ({ page }) => {
+        const result = await page.evaluate(() => {
+            const Y = window.Yappy;
+            const id = Y.createRectangle(0, 0, 100, 100);
+            Y.addDisplayState('A');
+            Y.updateElement(id, { x: 300 });
+            Y.addDisplayState('B');
+
+            const [a, b] = Y.state.states;
+            const delta = { baseId: b.baseId === a.id, keys: Object.keys(b.overrides[id] || {}) };
+
+            Y.applyDisplayState(a.id, false);
+            const atA = Y.getElement(id).x;
+            Y.applyDisplayState(b.id, false);
+            return { delta, atA, atB: Y.getElement(id).x };
+        });
+        expect(result.delta).toEqual({ baseId: true, keys: ['x'] });
+        expect(result.atA).toBe(0);
+        expect(result.atB).toBe(300);
+    });
+
+    test('updating a state re-captures it', async ({ page }) => {
+        const result = await page.evaluate(() => {
+            const Y = window.Yappy;
+            const id = Y.createRectangle(0, 0, 100, 100);
+            Y.addDisplayState('A');
+            Y.updateElement(id, { y: 200 });
+            Y.addDisplayState('B');
+
+            const [a, b] = Y.state.states;
+            Y.applyDisplayState(a.id, false);
+            Y.updateElement(id, { strokeColor: '#ff0000' });
+            Y.updateDisplayState(a.id);
+
+            Y.applyDisplayState(b.id, false);
+            Y.applyDisplayState(a.id, false);
+            const el = Y.getElement(id);
+            return { y: el.y, strokeColor: el.strokeColor };
+        });
+        expect(result).toEqual({ y: 0, strokeColor: '#ff0000' });
+    });
+
+    test('deleting the base state keeps the other states intact', async ({ page }) => {
+        const result = await page.evaluate(() => {
+            const Y = window.Yappy;
+            const id = Y.createRectangle(0, 0, 100, 100);
+            Y.addDisplayState('A');
+            Y.updateElement(id, { x: 300, y: 50 });
+            Y.addDisplayState('B');
+
+            const [a, b] = Y.state.states;
+            Y.deleteDisplayState(a.id);
+
+            // Move the element away, then bring it back through B alone
+            Y.updateElement(id, { x: 999, y: 999, width: 10 });
+            Y.applyDisplayState(b.id, false);
+            const el = Y.getElement(id);
+            const [only] = Y.state.states;
+            return {
+                count: Y.state.states.length,
+                isBase: only.id === b.id && !only.baseId,
+                el: { x: el.x, y: el.y, width: el.width, height: el.height }
+            };
+        });
+        expect(result.count).toBe(1);
+        expect(result.isBase).toBe(true);
+        expect(result.el).toEqual({ x: 300, y: 50, width: 100, height: 100 });
+    });
+
+    test('legacy full-snapshot states are compacted on load', async ({ page }) => {
+        const result = await page.evaluate(() => {
+            const Y = window.Yappy;
+            const id = Y.createRectangle(0, 0, 100, 100);
+            const snapshot = (x: number) => ({
+                [id]: { x, y: 0, width: 100, height: 100, opacity: 100, angle: 0, backgroundColor: 'transparent', strokeColor: '#000000' }
+            });
+            Y.loadDocument({
+                version: 4,
+                elements: JSON.parse(JSON.stringify(Y.state.elements)),
+                slides: JSON.parse(JSON.stringify(Y.state.slides)),
+                layers: JSON.parse(JSON.stringify(Y.state.layers)),
+                states: [
+                    { id: 's1', name: 'One', overrides: snapshot(0) },
+                    { id: 's2', name: 'Two', overrides: snapshot(250) }
+                ]
+            });
+
+            const [s1, s2] = Y.state.states;
+            Y.applyDisplayState('s2', false);
+            const atS2 = Y.getElement(id).x;
+            Y.applyDisplayState('s1', false);
+            return {
+                base: !s1.baseId,
+                delta: s2.baseId === 's1' ? Object.keys(s2.overrides[id]) : null,
+                atS2,
+                atS1: Y.getElement(id).x
+            };
+        });
+        expect(result.base).toBe(true);
+        expect(result.delta).toEqual(['x']);
+        expect(result.atS2).toBe(250);
+        expect(result.atS1).toBe(0);
+    });
+});
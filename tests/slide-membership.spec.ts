@@ -0,0 +1,78 @@
+import { test, expect } from '@playwright/test';
+
+// duplicateSlide copies the elements whose centre is on the slide, read from
+// the slide membership index, so the copy count shows what the index holds.
+test.describe('Slide membership', () => {
+    test.beforeEach(async ({ page }) => {
+        await page.goto('http://localhost:5173');
+        await page.waitForFunction(() => window.Yappy !== undefined);
+        await page.evaluate(() => {
+            window.Yappy.resetToNewDocument('slides');
+            window.Yappy.addSlide();
+        });
+    });
+
+    test('elements moved between slides change slide', async ({ page }) => {
+        const copies = await page.evaluate(() => {
+            const Y = window.Yappy;
+            const [s0, s1] = Y.state.slides;
+            const id = Y.createRectangle(s0.spatialPosition.x + 100, s0.spatialPosition.y + 100, 100, 100);
+            const copiesOf = (index: number) => {
+                const before = Y.state.elements.length;
+                Y.duplicateSlide(index);
+                const count = Y.state.elements.length - before;
+                Y.undo();
+                return count;
+            };
+
+            const before = [copiesOf(0), copiesOf(1)];
+            Y.updateElement(id, { x: s1.spatialPosition.x + 100 });
+            const afterUpdate = [copiesOf(0), copiesOf(1)];
+            Y.setSelected([id]);
+            Y.moveSelectedElements(s0.spatialPosition.x - s1.spatialPosition.x, 0);
+            const afterMove = [copiesOf(0), copiesOf(1)];
+            return { before, afterUpdate, afterMove };
+        });
+        expect(copies.before).toEqual([1, 0]);
+        expect(copies.afterUpdate).toEqual([0, 1]);
+        expect(copies.afterMove).toEqual([1, 0]);
+    });
+
+    test('layer and master moves keep elements on their slide', async ({ page }) => {
+        const result = await page.evaluate(() => {
+            const Y = window.Yappy;
+            const [s0, s1] = Y.state.slides;
+            const a = Y.createRectangle(s0.spatialPosition.x + 100, s0.spatialPosition.y + 100, 100, 100);
+            const b = Y.createRectangle(s1.spatialPosition.x + 100, s1.spatialPosition.y + 100, 100, 100);
+            const copiedIds = (index: number) => {
+                const before = new Set(Y.state.elements.map((el: any) => el.id));
+                Y.duplicateSlide(index);
+                const layers = Y.state.elements
+                    .filter((el: any) => !before.has(el.id))
+                    .map((el: any) => el.layerId);
+                Y.undo();
+                return layers;
+            };
+
+            const baseLayer = Y.state.layers[0].id;
+            const master = Y.addLayer('Master');
+            Y.moveElementsToLayer([a], master);
+            Y.updateLayer(master, { isMaster: true });
+            const onMaster = [copiedIds(0), copiedIds(1)];
+
+            Y.updateLayer(master, { isMaster: false });
+            Y.mergeLayerDown(master);
+            const merged = [copiedIds(0), copiedIds(1)];
+
+            const extra = Y.addLayer('Extra');
+            Y.moveElementsToLayer([b], extra);
+            Y.flattenLayers();
+            const flattened = [copiedIds(0), copiedIds(1)];
+            return { master, baseLayer, onMaster, merged, flattened };
+        });
+        // Master elements show on every slide; duplicating a slide doesn't copy them
+        expect(result.onMaster).toEqual([[], [result.baseLayer]]);
+        expect(result.merged).toEqual([[result.baseLayer], [result.baseLayer]]);
+        expect(result.flattened).toEqual([[result.baseLayer], [result.baseLayer]]);
+    });
+});
@@ -0,0 +1,73 @@
+import { test, expect } from '@playwright/test';
+
+test.describe('Timeline compilation', () => {
+    test.beforeEach(async ({ page }) => {
+        await page.goto('http://localhost:5173');
+        await page.waitForFunction(() => window.Yappy !== undefined);
+        await page.evaluate(() => window.Yappy.clear());
+    });
+
+    test('plain tweens compile and end where step play ends', async ({ page }) => {
+        const result = await page.evaluate(async () => {
+            const id = window.Yappy.createRectangle(0, 0, 100, 100);
+            const timeline = window.Yappy.createTimeline()
+                .to(id, { x: 200 }, { duration: 100 })
+                .to(id, { y: 50 }, { duration: 100 });
+            const compiled = timeline.compile() !== null;
+            await timeline.play();
+            const el = window.Yappy.getElement(id);
+            return { compiled, duration: timeline.duration, x: el.x, y: el.y };
+        });
+        expect(result).toEqual({ compiled: true, duration: 200, x: 200, y: 50 });
+    });
+
+    test('tweens with callbacks fall back to step play and fire them', async ({ page }) => {
+        const result = await page.evaluate(async () => {
+            const id = window.Yappy.createRectangle(0, 0, 100, 100);
+            const calls: string[] = [];
+            const timeline = window.Yappy.createTimeline()
+                .to(id, { x: 100 }, {
+                    duration: 50,
+                    onStart: () => calls.push('start'),
+                    onComplete: () => calls.push('complete')
+                });
+            const compiled = timeline.compile() !== null;
+            await timeline.play();
+            return { compiled, calls, x: window.Yappy.getElement(id).x };
+        });
+        expect(result.compiled).toBe(false);
+        expect(result.calls).toEqual(['start', 'complete']);
+        expect(result.x).toBe(100);
+    });
+
+    test('alternating and counted loops do not compile', async ({ page }) => {
+        const compiled = await page.evaluate(() => {
+            const id = window.Yappy.createRectangle(0, 0, 100, 100);
+            return [
+                window.Yappy.createTimeline().to(id, { x: 100 }, { duration: 50, alternate: true, loopCount: 2 }).compile() !== null,
+                window.Yappy.createTimeline().to(id, { x: 100 }, { duration: 50, loopCount: 3 }).compile() !== null
+            ];
+        });
+        expect(compiled).toEqual([false, false]);
+    });
+
+    test('a second play starts from the current values', async ({ page }) => {
+        const result = await page.evaluate(async () => {
+            const id = window.Yappy.createRectangle(0, 0, 100, 100);
+            const timeline = window.Yappy.createTimeline().to(id, { opacity: 20 }, { duration: 50 });
+            await timeline.play();
+
+            // Move the element away from where the first run started
+            window.Yappy.updateElement(id, { x: 300, opacity: 80 });
+            timeline.seek(0);
+            const atStart = window.Yappy.getElement(id).opacity;
+            await timeline.play();
+            timeline.seek(0);
+            return { atStart, afterReplay: window.Yappy.getElement(id).opacity, x: window.Yappy.getElement(id).x };
+        });
+        // seek() scrubs the table of the last play(); the replay captured 80
+        expect(result.atStart).toBe(100);
+        expect(result.afterReplay).toBe(80);
+        expect(result.x).toBe(300);
+    });
+});
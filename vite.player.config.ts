@@ -14,6 +14,8 @@ export default defineConfig({
                 player: path.resolve(__dirname, 'src/player.tsx')
             },
             output: {
+                // The player is embedded as a single script: keep lazy renderers/exporters inline
+                inlineDynamicImports: true,
                 entryFileNames: 'assets/[name].js',
                 chunkFileNames: 'assets/[name].js',
                 assetFileNames: 'assets/[name].[ext]'